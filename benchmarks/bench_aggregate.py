@@ -0,0 +1,57 @@
+"""
+Compare `aggregate` with pandas' groupby, for low and high cardinality keys, on
+unsorted (hash aggregation) and sorted (run length) input.
+
+    python benchmarks/bench_aggregate.py [rows]
+"""
+
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from rithm.functions.aggregate import aggregate, aggregate_chunks
+
+AGGREGATIONS = {"fare": "sum", "mean_fare": "mean:fare", "n": "count:fare"}
+
+
+def frame(rows: int, cardinality: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {"key": rng.integers(0, cardinality, rows), "fare": rng.random(rows)}
+    )
+
+
+def best_of(function, repeat: int = 5) -> float:
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def main(rows: int = 1_000_000):
+    print(f"{'cardinality':>12} {'input':>8} {'rithm':>9} {'chunked':>9} {'pandas':>9}")
+    for cardinality in (10, 1_000, rows // 10):
+        for presorted in (False, True):
+            data = frame(rows, cardinality)
+            if presorted:
+                data = data.sort_values("key", ignore_index=True)
+            chunks = [
+                data.iloc[start : start + 100_000] for start in range(0, rows, 100_000)
+            ]
+
+            rithm = best_of(lambda: aggregate(data, "key", **AGGREGATIONS))
+            chunked = best_of(lambda: aggregate_chunks(chunks, "key", **AGGREGATIONS))
+            pandas = best_of(
+                lambda: data.groupby("key").agg(
+                    fare=("fare", "sum"),
+                    mean_fare=("fare", "mean"),
+                    n=("fare", "count"),
+                )
+            )
+            print(
+                f"{cardinality:>12,} {'sorted' if presorted else 'unsorted':>8} "
+                f"{rithm:>8.3f}s {chunked:>8.3f}s {pandas:>8.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,63 @@
+"""
+Compare a script run by the interpreter, the same script exported to a pandas
+module, and the equivalent hand-written pandas (calling the same rolling mean),
+on short and long frames, where the interpreter's overhead matters most and least.
+
+    python benchmarks/bench_export.py [rows]
+"""
+
+from dataclasses import replace
+import logging
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from rithm.export import export_module
+from rithm.functions import rolling_mean
+from rithm.functions.memo import MemoCache
+from rithm.rithm import Rithm
+
+SCRIPT = """
+fare = trips@fare * rate
+tip = fare / 10
+total = fare + tip - trips@discount
+rolling_mean(total, 3, min_periods=1)
+"""
+
+
+def hand_written(trips: pd.DataFrame, rate: float) -> pd.Series:
+    fare = trips["fare"] * rate
+    tip = fare / 10
+    total = fare + tip - trips["discount"]
+    return rolling_mean(total, 3, min_periods=1)
+
+
+def best_of(function, number: int, repeat: int = 5) -> float:
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def main(rows: int = 1_000_000):
+    # The interpreter logs every statement at debug level
+    logging.disable(logging.CRITICAL)
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>10} {'interpreted':>12} {'exported':>10} {'pandas':>10}")
+    for size in (100, rows):
+        trips = pd.DataFrame({"fare": rng.random(size), "discount": rng.random(size)})
+        # Without memoization, so repeated runs aren't just cache hits
+        script = replace(Rithm()().compile(SCRIPT), memo=MemoCache(max_entries=0))
+        module = export_module(script, "bench_export_script")
+        number = 1000 if size < 10_000 else 5
+
+        interpreted = best_of(lambda: script.run(trips=trips, rate=1.2), number)
+        exported = best_of(lambda: module.run(trips=trips, rate=1.2), number)
+        pandas = best_of(lambda: hand_written(trips, 1.2), number)
+        print(
+            f"{size:>10,} {interpreted * 1e3:>10.3f}ms {exported * 1e3:>8.3f}ms "
+            f"{pandas * 1e3:>8.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
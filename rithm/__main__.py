@@ -1,33 +1,103 @@
 # import fire
 import click
-from rithm.rithm import Rithm
+
+# Only the client is imported up front: rithm itself (and pandas and numpy) is only
+# imported when evaluating locally or serving, so forwarding to a server is fast
+from rithm.client import DEFAULT_SOCKET_PATH, RithmClient
 
 
 @click.command()
 @click.option("-f", "--file", "file", type=click.File(), help="Rithm file to process")
 @click.option("-i", "--input", "input", type=str, help="Literal input to evaluate")
+@click.option(
+    "--serve",
+    "serve_",
+    is_flag=True,
+    help="Run a server that keeps sessions warm between invocations",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=str,
+    default=DEFAULT_SOCKET_PATH,
+    help="Unix socket of the rithm server",
+)
+@click.option(
+    "--session",
+    "session",
+    type=str,
+    default=None,
+    help=(
+        "Server session to evaluate input in, shared by every invocation that "
+        "names it (by default, each invocation gets its own session)"
+    ),
+)
 # @click.option('-d', '--debug', 'debug', type=bool, default=True, help="Whether to turn on debug logging")
-def rithm(file, input, debug: bool = True):
-    rtm = Rithm()
+def rithm(file, input, serve_, socket_path, session, debug: bool = True):
+    if serve_:
+        from rithm.server import serve
+
+        serve(socket_path)
+        exit(0)
+
+    # Use the server if it's running, so rithm is already imported, and a named
+    # session (and the data loaded into it) is reused
+    client = RithmClient.connect(socket_path, session)
+    if client is not None:
+
+        def rtm(input):
+            return client.evaluate(input, debug=debug)
+
+        def show(res):
+            # The server has already rendered the result
+            return res
+
+        pager_for = None
+    else:
+        from rithm.render import ResultPager, render
+        from rithm.rithm import Rithm
+
+        local_rtm = Rithm()
+
+        def rtm(input):
+            return local_rtm(input=input, debug=debug, result=True)
+
+        show = render
+        pager_for = ResultPager
+
     if file is not None:
         pass
     elif input is not None:
         try:
-            res = rtm(input=input, debug=debug, result=True)
-            click.echo(res)
+            res = rtm(input)
+            click.echo(show(res))
             exit(0)
         except Exception:
             exit(65)
     else:
         # REPL
+        pager = None
         while True:
             try:
                 input = click.prompt("> ", prompt_suffix="")
                 if input == "exit()":
                     click.echo("Exiting")
                     exit(0)
-                res = rtm(input=input, debug=debug, result=True)
-                click.echo(res)
+                if input == "more()":
+                    # The next page of rows of the last result
+                    if pager_for is None:
+                        # The server only sends the rendered result
+                        click.echo("Paging isn't available over --socket")
+                    elif pager is not None:
+                        click.echo(pager.next_page())
+                    continue
+                res = rtm(input)
+                click.echo(show(res))
+                if pager_for is None:
+                    continue
+                pager = pager_for(res)
+                if pager.has_more:
+                    click.echo(f"(Enter more() for the next {pager.rows} rows)")
                 # self.error_handler.had_error = False
             except KeyboardInterrupt:
                 click.echo("\nKeyboardInterrupt")
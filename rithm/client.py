@@ -0,0 +1,77 @@
+import json
+import os
+import socket
+import tempfile
+from typing import Optional
+
+# The client only needs the standard library, so a CLI call that forwards its input
+# to a running server doesn't pay for importing pandas and numpy
+DEFAULT_SOCKET_PATH = os.path.join(tempfile.gettempdir(), f"rithm-{os.getuid()}.sock")
+
+
+class RithmServerError(Exception):
+    """An error raised by the server while evaluating a request"""
+
+    def __init__(self, error_type: str, msg: str):
+        self.error_type = error_type
+        super().__init__(f"{error_type}: {msg}")
+
+
+def is_server_running(socket_path: str = DEFAULT_SOCKET_PATH) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+class RithmClient:
+    """
+    A connection to a running RithmServer. Without a `session` name, input is
+    evaluated in a session of the connection's own, which ends when it's closed.
+    Naming a session opts in to sharing it: every connection that names it uses
+    the same namespace, which stays warm between connections.
+    """
+
+    def __init__(
+        self, socket_path: str = DEFAULT_SOCKET_PATH, session: Optional[str] = None
+    ):
+        self.session = session
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(socket_path)
+        self.file = self.socket.makefile("rwb")
+
+    @classmethod
+    def connect(
+        cls, socket_path: str = DEFAULT_SOCKET_PATH, session: Optional[str] = None
+    ) -> Optional["RithmClient"]:
+        """Connect to the server, or return None if it isn't running"""
+        try:
+            return cls(socket_path, session)
+        except OSError:
+            return None
+
+    def __enter__(self) -> "RithmClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+    def evaluate(self, input: str, debug: bool = False) -> Optional[str]:
+        """Evaluate `input` in the session, returning the rendered result"""
+        request = {"session": self.session, "input": input, "debug": debug}
+        self.file.write(json.dumps(request).encode() + b"\n")
+        self.file.flush()
+
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("Rithm server closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise RithmServerError(response["type"], response["error"])
+        return response["result"]
@@ -0,0 +1,86 @@
+from collections import ChainMap
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, MutableMapping, Optional, Tuple
+
+from rithm.functions.memo import MemoCache
+from rithm.inference import RithmType, TypeInferrer, type_of
+from rithm.interpreter import Interpreter
+from rithm.parser import ParseErrors, Parser
+from rithm.scanner import Scanner
+from rithm.stmt import Stmt
+from rithm.symbol import SymbolTable
+
+Signature = Tuple[Tuple[str, RithmType], ...]
+
+
+@dataclass(frozen=True)
+class CompiledScript:
+    """
+    The immutable result of scanning and parsing a script once: its statements and
+    the symbols its names are interned in, with caches of its specialized statements
+    and pure function results. None of it belongs to a session, so any number of
+    threads can run the same CompiledScript at once, each against its own namespace.
+
+    Runs only ever read the statements. The caches are filled by whichever run gets
+    there first (a race just means the same entry is computed twice), so running
+    takes no locks, except for storing and looking up memoized results.
+    """
+
+    source: str
+    stmts: Tuple[Stmt, ...]
+    symbols: SymbolTable = field(compare=False)
+    # Statements specialized by type inference, per signature of parameter types
+    specialized: Dict[Signature, List[Stmt]] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+    # Results of pure function calls, shared by every run
+    memo: MemoCache = field(default_factory=MemoCache, compare=False, repr=False)
+
+    def bind(
+        self, namespace: Mapping[str, Any], params: Mapping[str, Any]
+    ) -> MutableMapping[str, Any]:
+        """
+        A new namespace for a run, with the parameters bound (by reference). It's an
+        overlay of `namespace`, which takes the run's assignments and only looks up
+        the names the run uses, so e.g. a ValueStore only loads back the spilled
+        values the script needs.
+        """
+        bound = {
+            self.symbols.intern(name).name: value for name, value in params.items()
+        }
+        return ChainMap(bound, namespace)
+
+    def specialize(
+        self, params: Mapping[str, Any], namespace: Mapping[str, Any]
+    ) -> List[Stmt]:
+        """The statements specialized for the types of the parameters"""
+        signature = tuple(
+            sorted((name, type_of(value)) for name, value in params.items())
+        )
+        specialized = self.specialized.get(signature)
+        if specialized is None:
+            specialized = TypeInferrer(namespace).infer(list(self.stmts))
+            self.specialized[signature] = specialized
+        return specialized
+
+    def run(self, namespace: Optional[Mapping[str, Any]] = None, **params: Any) -> Any:
+        """
+        Run the script in an overlay of `namespace` with `params` bound, returning
+        the value of its last statement
+        """
+        bound = self.bind(namespace or {}, params)
+        interpreter = Interpreter.bound(bound, self.symbols)
+        interpreter.memo = self.memo
+        return interpreter.interpret(self.specialize(params, bound))
+
+
+def compile_script(
+    source: str, symbols: Optional[SymbolTable] = None, iterative: bool = False
+) -> CompiledScript:
+    """Scan and parse `source`, interning its names in `symbols` (or a new table)"""
+    symbols = SymbolTable() if symbols is None else symbols
+    parser = Parser(Scanner(source, symbols=symbols).scan_tokens(), iterative=iterative)
+    stmts = parser.parse()
+    if parser.errors:
+        raise ParseErrors(parser.errors)
+    return CompiledScript(source=source, stmts=tuple(stmts), symbols=symbols)
@@ -0,0 +1,134 @@
+from dataclasses import dataclass, field
+from typing import Hashable, List, Set
+
+import pandas as pd
+
+from rithm.logging import get_logger
+
+try:
+    import pyarrow  # noqa: F401
+
+    COMPACT_STRING_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:
+    # Without pyarrow, high cardinality strings are left as they are
+    COMPACT_STRING_DTYPE = None
+
+compaction_logger = get_logger(__name__)
+
+
+@dataclass
+class ColumnCompaction:
+    """
+    The conversion of a single column to a more compact dtype
+    """
+
+    column: Hashable
+    old_dtype: str
+    new_dtype: str
+    bytes_before: int
+    bytes_after: int
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+
+@dataclass
+class CompactionReport:
+    """
+    The columns compacted after a single step, and the bytes saved
+    """
+
+    step: str
+    bytes_before: int
+    bytes_after: int
+    columns: List[ColumnCompaction] = field(default_factory=list)
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    def __str__(self) -> str:
+        return (
+            f"Compacted {len(self.columns)} column(s) after {self.step!r}: "
+            f"{self.bytes_before:,} -> {self.bytes_after:,} bytes "
+            f"({self.bytes_saved:,} saved)"
+        )
+
+
+def _is_string_column(column: pd.Series) -> bool:
+    if isinstance(column.dtype, pd.StringDtype):
+        return column.dtype != COMPACT_STRING_DTYPE
+    if column.dtype != object:
+        return False
+    values = column.dropna()
+    return len(values) > 0 and values.map(type).eq(str).all()
+
+
+@dataclass
+class Compactor:
+    """
+    Converts the string columns of frames to more compact dtypes, leaving any pinned
+    columns alone:
+
+    - strings with few distinct values become categoricals
+    - other strings are stored in Arrow-backed strings (if pyarrow is installed)
+
+    Numbers are left as they are: a downcast column (e.g. int8) would overflow, or
+    lose precision, in later arithmetic.
+    """
+
+    pinned: Set[Hashable] = field(default_factory=set)
+    # Strings with at most this fraction of distinct values become categoricals
+    max_category_ratio: float = 0.5
+    reports: List[CompactionReport] = field(default_factory=list)
+
+    def compact_column(self, column: pd.Series) -> pd.Series:
+        if _is_string_column(column):
+            if (
+                len(column)
+                and column.nunique() / len(column) <= self.max_category_ratio
+            ):
+                return column.astype("category")
+            if COMPACT_STRING_DTYPE is not None:
+                return column.astype(COMPACT_STRING_DTYPE)
+        return column
+
+    def compact(self, frame: pd.DataFrame, step: str) -> pd.DataFrame:
+        """Return a compacted copy of the frame, and record a report for the step"""
+        columns = {}
+        report = CompactionReport(step=step, bytes_before=0, bytes_after=0)
+
+        for position, name in enumerate(frame.columns):
+            column = frame.iloc[:, position]
+            compacted = column if name in self.pinned else self.compact_column(column)
+            bytes_before = int(column.memory_usage(index=False, deep=True))
+            bytes_after = bytes_before
+            if compacted is not column:
+                bytes_after = int(compacted.memory_usage(index=False, deep=True))
+
+            if bytes_after < bytes_before:
+                report.columns.append(
+                    ColumnCompaction(
+                        column=name,
+                        old_dtype=str(column.dtype),
+                        new_dtype=str(compacted.dtype),
+                        bytes_before=bytes_before,
+                        bytes_after=bytes_after,
+                    )
+                )
+            else:
+                compacted, bytes_after = column, bytes_before
+            columns[position] = compacted
+
+            report.bytes_before += bytes_before
+            report.bytes_after += bytes_after
+
+        self.reports.append(report)
+        compaction_logger.info(report)
+
+        if not report.columns:
+            return frame
+        compacted_frame = pd.concat(columns, axis=1)
+        compacted_frame.columns = frame.columns
+        return compacted_frame
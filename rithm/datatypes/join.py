@@ -0,0 +1,223 @@
+import math
+from typing import Dict, Hashable, Optional, Tuple
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from rithm.functions.memo import fingerprint
+
+JOIN_HOWS = ("inner", "left")
+
+# Suffix for columns of the right frame whose names are already in the left frame
+RIGHT_SUFFIX = "_right"
+
+
+def _is_sorted(keys: pd.Index) -> bool:
+    return bool(keys.is_monotonic_increasing)
+
+
+class JoinIndex:
+    """
+    The rows of a frame grouped by the values of a key column, to look up the rows
+    matching each key of another frame. Rows with the same key are stored as runs of
+    `order`, so duplicated keys (one to many joins) are supported.
+
+    The index is valid for as long as the key column's values are the same, which
+    is checked against a fingerprint of them. So writing keys in place, replacing
+    the key column or reordering the rows rebuilds the index. Fingerprinting the keys
+    is a single hashing pass, much cheaper than grouping them again.
+    """
+
+    __slots__ = (
+        "keys",
+        "uniques",
+        "order",
+        "starts",
+        "sizes",
+        "is_sorted",
+        "hashed",
+    )
+
+    def __init__(self, frame: pd.DataFrame, on: Hashable):
+        # A fingerprint of the key column, or None if its values can't be hashed
+        self.keys = fingerprint(frame[on])
+        # Whether a hash join has built the hash table of the unique keys
+        self.hashed = False
+        keys = pd.Index(frame[on])
+        self.is_sorted = _is_sorted(keys)
+        if self.is_sorted:
+            # The rows are already grouped into runs of equal keys, so no hashing
+            values = keys.to_numpy()
+            starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]][: len(keys)])
+            self.uniques = keys[starts]
+            self.order = np.arange(len(keys))
+            self.starts = starts
+            self.sizes = np.diff(np.r_[starts, len(keys)])
+        else:
+            codes, self.uniques = pd.factorize(keys)
+            present = codes >= 0
+            self.order = np.flatnonzero(present)[
+                np.argsort(codes[present], kind="stable")
+            ]
+            self.sizes = np.bincount(codes[present], minlength=len(self.uniques))
+            self.starts = np.r_[0, np.cumsum(self.sizes)[:-1]].astype(np.intp)
+
+    def is_valid_for(self, frame: pd.DataFrame, on: Hashable) -> bool:
+        return self.keys is not None and fingerprint(frame[on]) == self.keys
+
+    def probe(self, keys: pd.Index, strategy: str) -> np.ndarray:
+        """The position in `uniques` of each key, or -1 when it has no match"""
+        if strategy == "hash":
+            # pandas builds the hash table of an Index once, and keeps it with the Index
+            self.hashed = True
+            return self.uniques.get_indexer(keys)
+
+        if len(self.uniques) == 0:
+            return np.full(len(keys), -1, dtype=np.intp)
+        # Sort-merge: binary search each key in the sorted unique keys
+        positions = self.uniques.searchsorted(keys)
+        clipped = np.minimum(positions, len(self.uniques) - 1)
+        found = (positions < len(self.uniques)) & (
+            self.uniques.to_numpy()[clipped] == keys.to_numpy()
+        )
+        return np.where(found, positions, -1)
+
+    def matches(
+        self, keys: pd.Index, strategy: str, how: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """The left and right row positions of each matching pair (-1 for no match)"""
+        groups = self.probe(keys, strategy)
+        found = groups >= 0
+        counts = np.zeros(len(keys), dtype=np.intp)
+        counts[found] = self.sizes[groups[found]]
+        if how == "left":
+            # Unmatched rows of the left frame are kept, with a single missing match
+            counts[~found] = 1
+
+        left_rows = np.repeat(np.arange(len(keys)), counts)
+        # The position of each pair within the matches of its left row
+        offsets = np.arange(len(left_rows)) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        pair_groups = groups[left_rows]
+        matched = pair_groups >= 0
+        right_rows = np.full(len(left_rows), -1, dtype=np.intp)
+        right_rows[matched] = self.order[
+            self.starts[pair_groups[matched]] + offsets[matched]
+        ]
+        return left_rows, right_rows
+
+
+def choose_strategy(left_keys: pd.Index, index: JoinIndex) -> str:
+    """
+    Sort-merge when the right keys are sorted and either the left keys are too, or
+    there are so few left keys that binary searching each is cheaper than hashing the
+    right keys. Otherwise (or if the right keys are already hashed) hash join.
+    """
+    if index.hashed or not index.is_sorted:
+        return "hash"
+    if _is_sorted(left_keys):
+        return "merge"
+    search_cost = len(left_keys) * math.log2(max(len(index.uniques), 2))
+    return "merge" if search_cost < len(index.uniques) else "hash"
+
+
+class JoinIndexCache:
+    """
+    Caches a JoinIndex per frame and key column, so a lookup frame that is joined
+    again (e.g. in a later step) reuses its grouped keys and hash table, as long as
+    its keys haven't changed.
+    """
+
+    def __init__(self):
+        self.indexes: Dict[int, Dict[Hashable, JoinIndex]] = {}
+        # The number of indexes built, rather than reused
+        self.builds = 0
+
+    def __len__(self) -> int:
+        return sum(len(indexes) for indexes in self.indexes.values())
+
+    def index(self, frame: pd.DataFrame, on: Hashable) -> JoinIndex:
+        key = id(frame)
+        indexes = self.indexes.get(key)
+        if indexes is None:
+            # DataFrames aren't hashable, so key on id, and evict when the frame dies
+            weakref.finalize(frame, self.indexes.pop, key, None)
+            indexes = self.indexes[key] = {}
+
+        index = indexes.get(on)
+        if index is None or not index.is_valid_for(frame, on):
+            self.builds += 1
+            index = indexes[on] = JoinIndex(frame, on)
+        return index
+
+    def join(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        on: Optional[Hashable] = None,
+        how: str = "inner",
+        strategy: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Join the rows of `left` and `right` with equal values of their `on` column
+        (by default, the only column they share). `how` is inner or left. The strategy
+        (hash or merge) is chosen from the sizes and sortedness of the keys if not given.
+        """
+        if how not in JOIN_HOWS:
+            raise ValueError(f"Join must be one of {JOIN_HOWS}, not {how!r}")
+        on = _join_column(left, right, on)
+
+        index = self.index(right, on)
+        left_keys = pd.Index(left[on])
+        if strategy is None:
+            strategy = choose_strategy(left_keys, index)
+
+        left_rows, right_rows = index.matches(left_keys, strategy, how)
+        return _combine(left, right, on, left_rows, right_rows)
+
+
+def _join_column(left: pd.DataFrame, right: pd.DataFrame, on: Optional[Hashable]):
+    if on is not None:
+        for frame, side in ((left, "Left"), (right, "Right")):
+            if on not in frame.columns:
+                raise KeyError(f"{side} frame has no column {on!r} to join on")
+        return on
+
+    shared = [name for name in left.columns if name in right.columns]
+    if len(shared) != 1:
+        raise ValueError(
+            f"Frames share {len(shared)} columns ({shared}), "
+            "so give the column to join on"
+        )
+    return shared[0]
+
+
+def _combine(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    on: Hashable,
+    left_rows: np.ndarray,
+    right_rows: np.ndarray,
+) -> pd.DataFrame:
+    result = left.take(left_rows).reset_index(drop=True)
+    # Unmatched rows of a left join get missing values
+    allow_fill = bool((right_rows < 0).any())
+    for name in right.columns:
+        if name == on:
+            continue
+        values = right[name].array.take(right_rows, allow_fill=allow_fill)
+        output_name = f"{name}{RIGHT_SUFFIX}" if name in left.columns else name
+        result[output_name] = values
+    return result
+
+
+def join(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    on: Optional[Hashable] = None,
+    how: str = "inner",
+) -> pd.DataFrame:
+    """Join two frames, without caching the index of the right frame"""
+    return JoinIndexCache().join(left, right, on=on, how=how)
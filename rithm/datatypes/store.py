@@ -0,0 +1,304 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from typing import Any, Dict, Iterator, MutableMapping, Optional
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from rithm.datatypes.zones import ZoneMap, ZoneMapCache
+
+try:
+    import pyarrow as pa
+except ImportError:
+    # Without pyarrow, frames are spilled as pickles, which can't be memory mapped
+    pa = None
+
+# Values smaller than this aren't worth the disk round trip
+MIN_SPILL_BYTES = 1 << 20
+# The Arrow schema metadata key of a spilled frame's zone maps
+ZONES_METADATA_KEY = b"rithm.zones"
+# Errors writing a value, which leave it in memory rather than spilled
+SPILL_ERRORS = (OSError, ValueError, TypeError, AttributeError, pickle.PicklingError)
+
+
+def value_nbytes(value: Any) -> int:
+    """The bytes held by a frame, column or array (0 for other values)"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return 0
+
+
+@dataclass
+class StoreMetrics:
+    spills: int = 0
+    restores: int = 0
+    bytes_spilled: int = 0
+    bytes_restored: int = 0
+
+
+@dataclass
+class SpilledValue:
+    path: str
+    nbytes: int
+    # How the value was written: "array", "frame", "series" or "pickle"
+    format: str
+    # The name of a spilled Series
+    name: Any = None
+
+
+def _is_arrow_compatible(frame: pd.DataFrame) -> bool:
+    """
+    Whether a frame round trips through Arrow: Arrow needs unique column names, and
+    turns other names into strings
+    """
+    return frame.columns.is_unique and all(
+        isinstance(name, str) for name in frame.columns
+    )
+
+
+class ValueStore(MutableMapping):
+    """
+    A namespace that keeps the bytes held by its frames, columns and arrays within a
+    memory budget. When a value is stored or loaded and the budget is exceeded, the
+    least recently used large values are spilled to files in `directory` (Arrow IPC
+    files for frames and columns, .npy files for arrays). A spilled value is loaded
+    back when it is next accessed, and can be written to like the original: arrays
+    are memory mapped copy-on-write, and frames and columns are converted from the
+    memory mapped Arrow file into new buffers. Values that can't be written, like
+    frames with duplicated or non-string column names, are kept in memory.
+
+    Without a `directory`, the store spills to a new temporary directory, which is
+    removed when the store is closed or garbage collected.
+
+    Given the `zone_maps` of the frames, a spilled frame's zone maps are written
+    into its Arrow file's metadata, and are used again once it is loaded back.
+    """
+
+    def __init__(
+        self,
+        budget: Optional[int] = None,
+        directory: Optional[str] = None,
+        min_spill_bytes: int = MIN_SPILL_BYTES,
+        zone_maps: Optional[ZoneMapCache] = None,
+    ):
+        # The budget in bytes, or None for no limit
+        self.budget = budget
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="rithm-spill-")
+            self._remove_directory = weakref.finalize(
+                self, shutil.rmtree, directory, ignore_errors=True
+            )
+        else:
+            self._remove_directory = None
+        self.directory = directory
+        self.min_spill_bytes = min_spill_bytes
+        self.zone_maps = zone_maps
+        # Values in memory, least recently used first
+        self.values: "OrderedDict[str, Any]" = OrderedDict()
+        self.sizes: Dict[str, int] = {}
+        self.spilled: Dict[str, SpilledValue] = {}
+        self.metrics = StoreMetrics()
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(self.sizes.values())
+
+    def __len__(self) -> int:
+        return len(self.values) + len(self.spilled)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from list(self.values)
+        yield from list(self.spilled)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.values or name in self.spilled
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            value = self.values[name]
+        except KeyError:
+            if name not in self.spilled:
+                raise
+            value = self.restore(name)
+        else:
+            self.values.move_to_end(name)
+        return value
+
+    def __setitem__(self, name: str, value: Any):
+        self._discard_spilled(name)
+        self.values[name] = value
+        self.values.move_to_end(name)
+        self.sizes[name] = value_nbytes(value)
+        self.enforce_budget(keep=name)
+
+    def __delitem__(self, name: str):
+        if name in self.values:
+            del self.values[name]
+            del self.sizes[name]
+        elif name in self.spilled:
+            self._discard_spilled(name)
+        else:
+            raise KeyError(name)
+
+    def enforce_budget(self, keep: Optional[str] = None):
+        """Spill the least recently used large values until within the budget"""
+        if self.budget is None:
+            return
+        for name in list(self.values):
+            if self.memory_bytes <= self.budget:
+                return
+            if name != keep and self.sizes[name] >= self.min_spill_bytes:
+                self.spill(name)
+
+    def spill(self, name: str) -> bool:
+        """
+        Write a value to disk and drop it from memory. If it can't be written, it's
+        kept in memory, and False is returned.
+        """
+        value = self.values[name]
+        nbytes = self.sizes[name]
+        path = os.path.join(self.directory, str(self.metrics.spills))
+        try:
+            spilled = self._write(value, path, nbytes)
+        except SPILL_ERRORS:
+            spilled = None
+        if spilled is None:
+            return False
+
+        # Only forget the value once it's safely on disk
+        del self.values[name]
+        del self.sizes[name]
+        self.spilled[name] = spilled
+        self.metrics.spills += 1
+        self.metrics.bytes_spilled += nbytes
+        return True
+
+    def _write(self, value: Any, path: str, nbytes: int) -> Optional[SpilledValue]:
+        """
+        Write a value to a file at `path` (plus its format's extension), or return
+        None if it can't be spilled. It's written to a temporary file that is only
+        renamed into place once complete, so a failed write leaves nothing behind.
+        """
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            spilled = SpilledValue(path + ".npy", nbytes, "array")
+
+            def write(file):
+                np.save(file, value)
+
+        elif pa is not None and isinstance(value, (pd.DataFrame, pd.Series)):
+            if isinstance(value, pd.Series):
+                spilled = SpilledValue(path + ".arrow", nbytes, "series", value.name)
+                value = value.to_frame("value")
+            else:
+                spilled = SpilledValue(path + ".arrow", nbytes, "frame")
+            if not _is_arrow_compatible(value):
+                return None
+            table = pa.Table.from_pandas(value, preserve_index=True)
+            if spilled.format == "frame" and self.zone_maps is not None:
+                table = self._with_zone_maps(table, value)
+
+            def write(file):
+                with pa.ipc.new_file(file, table.schema) as writer:
+                    writer.write_table(table)
+
+        else:
+            spilled = SpilledValue(path + ".pickle", nbytes, "pickle")
+
+            def write(file):
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        partial = spilled.path + ".partial"
+        try:
+            with open(partial, "wb") as file:
+                write(file)
+            os.replace(partial, spilled.path)
+        except BaseException:
+            self._remove_file(partial)
+            raise
+        return spilled
+
+    def restore(self, name: str) -> Any:
+        spilled = self.spilled.pop(name)
+        if spilled.format == "array":
+            # Copy-on-write, so the array is writable, and writes don't touch the file
+            value = np.load(spilled.path, mmap_mode="c")
+        elif spilled.format == "pickle":
+            with open(spilled.path, "rb") as file:
+                value = pickle.load(file)
+        else:
+            with pa.memory_map(spilled.path) as source:
+                table = pa.ipc.open_file(source).read_all()
+            # Converted into (writable) pandas blocks, rather than sharing the
+            # read-only Arrow buffers
+            value = table.to_pandas()
+            if spilled.format == "series":
+                value = value["value"].rename(spilled.name)
+            elif self.zone_maps is not None:
+                self._restore_zone_maps(table, value)
+        self._remove_file(spilled.path)
+
+        self.metrics.restores += 1
+        self.metrics.bytes_restored += spilled.nbytes
+        self.values[name] = value
+        self.sizes[name] = spilled.nbytes
+        self.enforce_budget(keep=name)
+        return value
+
+    def _with_zone_maps(self, table: "pa.Table", frame: pd.DataFrame) -> "pa.Table":
+        """The table, with the frame's zone maps (by column position) in its metadata"""
+        zone_maps = self.zone_maps.zone_maps(frame)
+        positions = {name: position for position, name in enumerate(frame.columns)}
+        zones = {
+            positions[name]: zone_map.to_dict()
+            for name, zone_map in zone_maps.items()
+            if zone_map is not None
+        }
+        if not zones:
+            return table
+        return table.replace_schema_metadata(
+            {**table.schema.metadata, ZONES_METADATA_KEY: json.dumps(zones)}
+        )
+
+    def _restore_zone_maps(self, table: "pa.Table", frame: pd.DataFrame):
+        zones = (table.schema.metadata or {}).get(ZONES_METADATA_KEY)
+        if zones is not None:
+            self.zone_maps.register(
+                frame,
+                {
+                    frame.columns[int(position)]: ZoneMap.from_dict(zone_map)
+                    for position, zone_map in json.loads(zones).items()
+                },
+            )
+
+    def close(self):
+        """
+        Forget the spilled values, removing their files (and the directory, if the
+        store created it)
+        """
+        for name in list(self.spilled):
+            self._discard_spilled(name)
+        if self._remove_directory is not None:
+            self._remove_directory()
+
+    def _discard_spilled(self, name: str):
+        spilled = self.spilled.pop(name, None)
+        if spilled is not None:
+            self._remove_file(spilled.path)
+
+    @staticmethod
+    def _remove_file(path: str):
+        # A memory mapped file can be removed while mapped, except on Windows
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,251 @@
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+
+Column = Union[np.ndarray, pd.api.extensions.ExtensionArray]
+
+
+def _copy_on_write() -> bool:
+    """
+    Whether pandas copies a buffer before writing to it while another Series or
+    DataFrame still references it (always, from pandas 3)
+    """
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return pd.get_option("mode.copy_on_write") is True
+
+
+def _read_only(values: Any) -> Column:
+    """A column's values, as a read-only view when they are a numpy array"""
+    if isinstance(values, (pd.Series, pd.Index)):
+        values = (
+            values.to_numpy() if isinstance(values.dtype, np.dtype) else values.array
+        )
+    if isinstance(values, np.ndarray):
+        values = values.view()
+        values.flags.writeable = False
+    return values
+
+
+def _take(values: Any) -> Tuple[Column, Optional[pd.Series]]:
+    """
+    A column's values, which nothing else can write to, and the Series they're
+    shared with, if any. With copy-on-write, a Series' values are shared, as long as
+    the Series is kept alive (see Frame). Any other values the caller could still
+    write to are copied.
+    """
+    if isinstance(values, pd.Series):
+        if not _copy_on_write():
+            values = values.copy()
+        return _read_only(values), values
+    if isinstance(values, pd.Index):
+        # Indexes are immutable
+        return _read_only(values), None
+    if isinstance(values, pd.api.extensions.ExtensionArray):
+        return values.copy(), None
+    return _read_only(np.array(values)), None
+
+
+def _shared(values: Column) -> Column:
+    """
+    A column's values to hand out: numpy arrays are read-only views, but extension
+    arrays can't be made read-only, so they're copied
+    """
+    return values if isinstance(values, np.ndarray) else values.copy()
+
+
+def _buffer(values: Column) -> Tuple[int, int]:
+    """An id and size for the memory holding a column, shared by views of it"""
+    if isinstance(values, np.ndarray):
+        root = values
+        while isinstance(root.base, np.ndarray):
+            root = root.base
+        return id(root), root.nbytes
+    return id(values), values.nbytes
+
+
+class Frame:
+    """
+    An immutable frame, whose columns are shared by the frames derived from it.
+    Deriving a new version (`with_column`, `rename`, `drop`, `select`) only creates
+    the columns it writes; every other column is the very same (read-only) array in
+    both versions. So keeping many versions costs about the size of the columns
+    that changed between them, rather than a copy of the frame per version.
+
+    A Frame keeps the Series its columns were taken from (`owners`) alive, so that
+    with copy-on-write, writing to the original DataFrame in place makes pandas copy
+    the buffer first, rather than changing every version. Without copy-on-write, the
+    columns are copied when they're taken, as are arrays given by the caller, who
+    could otherwise still write to them. Columns of extension arrays (e.g. Int64,
+    categoricals), which can't be made read-only, are copied when they're handed out.
+    """
+
+    __slots__ = ("columns", "index", "zones", "owners")
+
+    def __init__(self, columns: Mapping[Hashable, Any], index: pd.Index):
+        self.columns: Dict[Hashable, Column] = {}
+        self.owners: Dict[Hashable, pd.Series] = {}
+        for name, values in columns.items():
+            if len(values) != len(index):
+                raise ValueError(
+                    f"Column {name!r} has {len(values)} rows, not {len(index)}"
+                )
+            self.columns[name], owner = _take(values)
+            if owner is not None:
+                self.owners[name] = owner
+        self.index = index
+        # The zone maps of columns (see rithm.datatypes.zones), built on demand
+        self.zones: Dict[Hashable, Any] = {}
+
+    @classmethod
+    def from_pandas(cls, frame: pd.DataFrame) -> "Frame":
+        """
+        A Frame sharing (with copy-on-write, not copying) the DataFrame's column
+        buffers, which stays unchanged however the DataFrame is written to afterwards
+        """
+        if not frame.columns.is_unique:
+            raise ValueError("Frame column names must be unique")
+        return cls({name: frame[name] for name in frame.columns}, frame.index)
+
+    def to_pandas(self) -> pd.DataFrame:
+        """
+        A DataFrame of the frame's columns, without copying them. The columns are
+        read-only, so copy the DataFrame before writing to it in place.
+        """
+        return pd.DataFrame(
+            {
+                name: pd.Series(_shared(values), index=self.index, copy=False)
+                for name, values in self.columns.items()
+            },
+            index=self.index,
+            copy=False,
+        )
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __repr__(self) -> str:
+        return f"Frame({len(self)} rows, columns={list(self.columns)})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Frame):
+            return self.to_pandas().equals(other.to_pandas())
+        return NotImplemented
+
+    def __getitem__(self, name: Hashable) -> pd.Series:
+        return self.column(name)
+
+    def column(self, name: Hashable) -> pd.Series:
+        try:
+            values = self.columns[name]
+        except KeyError:
+            raise KeyError(f"Frame has no column {name!r}") from None
+        return pd.Series(_shared(values), index=self.index, name=name, copy=False)
+
+    def _derive(
+        self,
+        columns: Dict[Hashable, Column],
+        names: Optional[Mapping[Hashable, Hashable]] = None,
+        owners: Optional[Dict[Hashable, pd.Series]] = None,
+    ) -> "Frame":
+        # The columns are already read-only, so skip re-checking them
+        frame = Frame.__new__(Frame)
+        frame.columns = columns
+        frame.index = self.index
+        # Unchanged columns (renamed to `names`) keep their zone maps and owners
+        frame.zones = {}
+        frame.owners = {}
+        for kept, previous in ((frame.zones, self.zones), (frame.owners, self.owners)):
+            for name, value in previous.items():
+                new_name = names.get(name, name) if names else name
+                if columns.get(new_name) is self.columns[name]:
+                    kept[new_name] = value
+        frame.owners.update(owners or {})
+        return frame
+
+    def with_column(self, name: Hashable, values: Any) -> "Frame":
+        """A new version with the column `name` added or replaced by `values`"""
+        if len(values) != len(self):
+            raise ValueError(f"Column {name!r} has {len(values)} rows, not {len(self)}")
+        values, owner = _take(values)
+        owners = {} if owner is None else {name: owner}
+        return self._derive({**self.columns, name: values}, owners=owners)
+
+    def rename(self, names: Mapping[Hashable, Hashable]) -> "Frame":
+        return self._derive(
+            {names.get(name, name): values for name, values in self.columns.items()},
+            names,
+        )
+
+    def drop(self, *names: Hashable) -> "Frame":
+        return self._derive(
+            {name: values for name, values in self.columns.items() if name not in names}
+        )
+
+    def select(self, *names: Hashable) -> "Frame":
+        return self._derive({name: self.columns[name] for name in names})
+
+    @property
+    def nbytes(self) -> int:
+        return shared_nbytes([self])
+
+
+def as_pandas(value: Any) -> Any:
+    """Frames as DataFrames (sharing their columns), for functions that need pandas"""
+    return value.to_pandas() if isinstance(value, Frame) else value
+
+
+def shared_nbytes(frames: Iterable[Frame]) -> int:
+    """The bytes held by the frames' columns, counting shared buffers once"""
+    buffers = dict(
+        _buffer(values) for frame in frames for values in frame.columns.values()
+    )
+    return sum(buffers.values())
+
+
+class FrameHistory:
+    """
+    The version of each frame assigned at each step, e.g. to inspect a frame as it
+    was several steps ago. Versions share their unchanged columns, so `nbytes` is
+    the memory held by the whole history.
+    """
+
+    def __init__(self):
+        self.steps: List[Tuple[str, Frame]] = []
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __iter__(self) -> Iterator[Tuple[str, Frame]]:
+        return iter(self.steps)
+
+    def __getitem__(self, step: Union[int, str]) -> Frame:
+        """The version recorded at a step, by position or (the latest) step name"""
+        if isinstance(step, int):
+            return self.steps[step][1]
+        for name, frame in reversed(self.steps):
+            if name == step:
+                return frame
+        raise KeyError(f"No step {step!r} in the history")
+
+    def record(self, step: str, frame: Union[Frame, pd.DataFrame]) -> Frame:
+        if isinstance(frame, pd.DataFrame):
+            frame = Frame.from_pandas(frame)
+        self.steps.append((step, frame))
+        return frame
+
+    @property
+    def nbytes(self) -> int:
+        return shared_nbytes(frame for _, frame in self.steps)
@@ -0,0 +1,241 @@
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from rithm.datatypes.frame import column
+from rithm.datatypes.versions import Frame
+
+# Rows summarized by each zone
+ZONE_ROWS = 1 << 16
+# Distinct values are estimated from this many of the smallest hashes in a zone
+DISTINCT_SAMPLE = 256
+
+COMPARISONS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "==": np.equal,
+}
+# The comparison with its operands swapped, e.g. `1 < x` is `x > 1`
+FLIPPED = {"<": ">", "<=": ">=", ">": "<", ">=": "<=", "==": "=="}
+
+
+def _distinct_estimate(values: np.ndarray) -> int:
+    """
+    The number of distinct values, estimated from the k smallest distinct hashes
+    (a KMV sketch), so it costs one hashing pass rather than a sort
+    """
+    hashes = pd.util.hash_array(values)
+    if len(hashes) > DISTINCT_SAMPLE:
+        smallest = np.unique(np.partition(hashes, DISTINCT_SAMPLE)[:DISTINCT_SAMPLE])
+        if len(smallest) == DISTINCT_SAMPLE:
+            fraction = (float(smallest[-1]) + 1) / 2.0**64
+            return min(len(hashes), round((DISTINCT_SAMPLE - 1) / fraction))
+    return len(np.unique(hashes))
+
+
+class ZoneMap:
+    """
+    The minimum, maximum, number of missing values and (estimated) number of distinct
+    values of each zone of `zone_rows` consecutive rows of a numeric column. A
+    comparison with a constant skips the zones whose range can't match, and fills
+    in the zones whose whole range matches, only comparing the rows of the rest.
+    Comparisons don't need the distinct counts, which cost a hashing pass, so they're
+    only estimated when first used.
+    """
+
+    __slots__ = ("rows", "zone_rows", "mins", "maxs", "nulls", "_distinct", "_values")
+
+    def __init__(self, values: np.ndarray, zone_rows: int = ZONE_ROWS):
+        self.rows = len(values)
+        self.zone_rows = zone_rows
+        starts = np.arange(0, len(values), zone_rows)
+        missing = np.isnan(values) if values.dtype.kind == "f" else None
+        # fmin and fmax ignore NaN, so a zone is NaN only if all of it is missing
+        self.mins = np.fmin.reduceat(values, starts) if len(values) else values[:0]
+        self.maxs = np.fmax.reduceat(values, starts) if len(values) else values[:0]
+        self.nulls = (
+            np.add.reduceat(missing, starts, dtype=np.int64)
+            if missing is not None and len(values)
+            else np.zeros(len(starts), dtype=np.int64)
+        )
+        self._distinct = None
+        self._values = values
+
+    @classmethod
+    def for_column(cls, values: Any, zone_rows: int = ZONE_ROWS) -> Optional["ZoneMap"]:
+        """The zone map of a column, or None if its values aren't numeric"""
+        if isinstance(values, (pd.Series, pd.Index)):
+            if not isinstance(values.dtype, np.dtype):
+                return None
+            values = values.to_numpy()
+        if not isinstance(values, np.ndarray) or values.dtype.kind not in "iuf":
+            return None
+        return cls(values, zone_rows)
+
+    @property
+    def distinct(self) -> np.ndarray:
+        if self._distinct is None:
+            starts = range(0, self.rows, self.zone_rows)
+            self._distinct = np.array(
+                [
+                    _distinct_estimate(self._values[start : start + self.zone_rows])
+                    for start in starts
+                ],
+                dtype=np.int64,
+            )
+            self._values = None
+        return self._distinct
+
+    def __len__(self) -> int:
+        return len(self.mins)
+
+    def __repr__(self) -> str:
+        return f"ZoneMap({self.rows} rows in {len(self)} zones)"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "zone_rows": self.zone_rows,
+            "dtype": self.mins.dtype.str,
+            "mins": self.mins.tolist(),
+            "maxs": self.maxs.tolist(),
+            "nulls": self.nulls.tolist(),
+            "distinct": self.distinct.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, zones: Dict[str, Any]) -> "ZoneMap":
+        zone_map = cls.__new__(cls)
+        zone_map.rows = zones["rows"]
+        zone_map.zone_rows = zones["zone_rows"]
+        zone_map.mins = np.array(zones["mins"], dtype=zones["dtype"])
+        zone_map.maxs = np.array(zones["maxs"], dtype=zones["dtype"])
+        zone_map.nulls = np.array(zones["nulls"], dtype=np.int64)
+        zone_map._distinct = np.array(zones["distinct"], dtype=np.int64)
+        zone_map._values = None
+        return zone_map
+
+    def zones_matching(self, operator: str, value: Any):
+        """Whether each zone may have any rows that match, and whether all of them do"""
+        compare = COMPARISONS[operator]
+        with np.errstate(invalid="ignore"):
+            if operator == "==":
+                some = (self.mins <= value) & (value <= self.maxs)
+                every = (self.mins == value) & (self.maxs == value)
+            elif operator in ("<", "<="):
+                some, every = compare(self.mins, value), compare(self.maxs, value)
+            else:
+                some, every = compare(self.maxs, value), compare(self.mins, value)
+        return some, every & (self.nulls == 0)
+
+    def compare(self, column: pd.Series, operator: str, value: Any) -> pd.Series:
+        """`column <operator> value`, comparing only the zones that may match"""
+        values = column.to_numpy()
+        some, every = self.zones_matching(operator, value)
+        matches = np.zeros(len(values), dtype=bool)
+        compare = COMPARISONS[operator]
+        for zone in np.flatnonzero(some):
+            start = zone * self.zone_rows
+            stop = start + self.zone_rows
+            if every[zone]:
+                matches[start:stop] = True
+            else:
+                compare(values[start:stop], value, out=matches[start:stop])
+        return pd.Series(matches, index=column.index, name=column.name)
+
+
+def _same_values(values: pd.Series, owner: pd.Series) -> bool:
+    """Whether a column still holds the very values (the same buffer) of `owner`"""
+    if not isinstance(values.dtype, np.dtype):
+        return values.array is owner.array
+    values, owned = values.to_numpy(), owner.to_numpy()
+    return (
+        values.__array_interface__["data"] == owned.__array_interface__["data"]
+        and values.strides == owned.strides
+        and values.shape == owned.shape
+        and values.dtype == owned.dtype
+    )
+
+
+class ZoneMapCache:
+    """
+    The zone maps of the numeric columns of frames, each built the first time the
+    column is compared with a constant. A Frame keeps its own zone maps, which the
+    versions derived from it share for their unchanged columns.
+
+    The zone maps of a DataFrame are kept per frame, with the column each was built
+    from. A zone map is only used while the frame's column has the very same values:
+    replacing the column or reordering the rows rebuilds it. Keeping the column
+    means that, with copy-on-write, writing to it in place makes pandas copy its
+    values first, so that's noticed too. (Without copy-on-write, before pandas 3,
+    writes into a column's values in place aren't noticed.)
+    """
+
+    def __init__(self, zone_rows: int = ZONE_ROWS):
+        self.zone_rows = zone_rows
+        # The zone map (None if not numeric) of each column compared, and the column
+        self.frames: Dict[int, Dict[Hashable, Tuple[Optional[ZoneMap], pd.Series]]] = {}
+        # The number of zone maps built
+        self.builds = 0
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def _columns(
+        self, frame: pd.DataFrame
+    ) -> Dict[Hashable, Tuple[Optional[ZoneMap], pd.Series]]:
+        key = id(frame)
+        columns = self.frames.get(key)
+        if columns is None:
+            # DataFrames aren't hashable, so key on id, and evict when the frame dies
+            columns = self.frames[key] = {}
+            weakref.finalize(frame, self.frames.pop, key, None)
+        return columns
+
+    def zone_maps(
+        self, frame: Union[Frame, pd.DataFrame]
+    ) -> Dict[Hashable, Optional[ZoneMap]]:
+        """The zone maps built so far for each column of `frame` (None if not numeric)"""
+        if isinstance(frame, Frame):
+            return frame.zones
+        return {
+            name: zone_map
+            for name, (zone_map, owner) in self._columns(frame).items()
+            if name in frame.columns and _same_values(column(frame, name), owner)
+        }
+
+    def zone_map(
+        self, frame: Union[Frame, pd.DataFrame], name: Hashable
+    ) -> Optional[ZoneMap]:
+        if isinstance(frame, Frame):
+            if name not in frame.zones:
+                frame.zones[name] = self._build(frame.column(name))
+            return frame.zones[name]
+
+        columns = self._columns(frame)
+        values = column(frame, name)
+        if name in columns and _same_values(values, columns[name][1]):
+            return columns[name][0]
+        zone_map = self._build(values)
+        columns[name] = (zone_map, values)
+        return zone_map
+
+    def _build(self, values: pd.Series) -> Optional[ZoneMap]:
+        zone_map = ZoneMap.for_column(values, self.zone_rows)
+        self.builds += zone_map is not None
+        return zone_map
+
+    def build(self, frame: Union[Frame, pd.DataFrame]):
+        """Build the zone maps of every column of `frame` that doesn't have one yet"""
+        for name in frame.columns:
+            self.zone_map(frame, name)
+
+    def register(self, frame: pd.DataFrame, zone_maps: Dict[Hashable, ZoneMap]):
+        """Use zone maps that were built earlier, e.g. before the frame was spilled"""
+        columns = self._columns(frame)
+        for name, zone_map in zone_maps.items():
+            columns[name] = (zone_map, column(frame, name))
@@ -0,0 +1,293 @@
+from collections import defaultdict
+import importlib.util
+import sys
+import textwrap
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from rithm.compiled import CompiledScript, compile_script
+from rithm.expr import (
+    Assignment,
+    Binary,
+    Call,
+    ColumnAccess,
+    Expr,
+    Grouping,
+    Identifier,
+    Join,
+    Literal,
+    Table,
+    Unary,
+    fold_operations,
+)
+from rithm.functions import BUILTINS
+from rithm.preview import step_name
+from rithm.stmt import ExpressionStmt, Stmt
+from rithm.token import TokenType as TT
+from rithm.visitor import Visitor
+
+# The precedence of generated Python expressions, loosest first
+NOT, COMPARISON, ADDITIVE, MULTIPLICATIVE, NEGATION, ATOM = range(6)
+
+BINARY_OPERATORS = {
+    TT.PLUS: ("+", ADDITIVE),
+    TT.MINUS: ("-", ADDITIVE),
+    TT.STAR: ("*", MULTIPLICATIVE),
+    TT.SLASH: ("/", MULTIPLICATIVE),
+    TT.EQUAL_EQUAL: ("==", COMPARISON),
+    TT.LESS_THAN: ("<", COMPARISON),
+    TT.LESS_EQUAL: ("<=", COMPARISON),
+    TT.GREATER_THAN: (">", COMPARISON),
+    TT.GREATER_EQUAL: (">=", COMPARISON),
+}
+
+UNARY_OPERATORS = {TT.MINUS: ("-", NEGATION), TT.BANG: ("not ", NOT)}
+
+# Generated Python code, and its precedence
+Code = Tuple[str, int]
+
+
+def _literal(value: Any) -> str:
+    """A value's repr, with strings double quoted where possible (as black would)"""
+    text = repr(value)
+    if isinstance(value, str) and text.startswith("'") and '"' not in value:
+        text = f'"{text[1:-1]}"'
+    return text
+
+
+MODULE_FOOTER = '''
+
+
+def run(**params):
+    """Run every step, returning the value of the last"""
+    ns = dict(params)
+{run_body}
+
+
+def run_until(step, **params):
+    """
+    Run the steps up to and including `step`: a step number (from 1), a step name,
+    or `name#n` for the nth step with that name. Returns the value of that step.
+    """
+    if isinstance(step, int):
+        last = step
+    else:
+        name, _, occurrence = step.partition("#")
+        positions = [i for i, (n, _) in enumerate(STEPS) if n == name]
+        if not name:
+            positions = [int(occurrence) - 1]
+        elif occurrence:
+            positions = positions[int(occurrence) - 1 :]
+        if not positions:
+            raise KeyError(f"No step {{step!r}}")
+        last = positions[0] + 1
+    ns = dict(params)
+    result = None
+    for _, function in STEPS[:last]:
+        result = function(ns)
+    return result
+'''
+
+
+class PandasExporter(Visitor):
+    """
+    Translates a script into the source of a Python module of straight-line pandas
+    code: a function per step, taking the namespace (a dict) the steps share, a
+    `run(**params)` that runs every step, and a `run_until(step, **params)` that
+    runs the steps up to a given one. The module has none of the interpreter's
+    dispatch, so it runs as fast as the equivalent hand-written pandas.
+
+    Builtins are imported from rithm (so they can't be shadowed by parameters, as
+    they can when interpreting), and values are returned without being memoized.
+    A step's own assignment is a plain assignment statement, while assignments
+    within an expression call `assign`, so they happen in the interpreter's order.
+    """
+
+    def __init__(self, unwrap_frames: bool = False):
+        # Whether to convert Frames to DataFrames before passing them to functions
+        # that only take pandas, which is only needed if frame functions are called
+        self.unwrap_frames = unwrap_frames
+        self.calls_frame_functions = False
+        # The names imported from each module
+        self.imports: Dict[str, Set[str]] = defaultdict(set)
+        # Table literals, read once when the module is imported
+        self.tables: List[str] = []
+        self.assigned: Set[str] = set()
+
+    def export(self, script: CompiledScript) -> str:
+        steps = [self.step(stmt, index) for index, stmt in enumerate(script.stmts)]
+        if self.calls_frame_functions and not self.unwrap_frames:
+            return PandasExporter(unwrap_frames=True).export(script)
+
+        source = script.source.strip().replace("\\", "\\\\").replace('"""', '\\"""')
+        header = (
+            '"""\nGenerated by rithm from the script below; edit the script, not this '
+            f'module.\n\n{textwrap.indent(source, "    ")}\n"""\n'
+        )
+        parts = []
+        if self.imports:
+            parts.append(
+                "\n".join(
+                    f"from {module} import {', '.join(sorted(names))}"
+                    for module, names in sorted(self.imports.items())
+                )
+            )
+        if self.tables:
+            parts.append("\n".join(self.tables))
+        parts.extend(code for _, code in steps)
+        parts.append(
+            "# Each step's name (the name it assigns, or its number) and function\n"
+            "STEPS = (\n"
+            + "".join(
+                f"    ({_literal(name)}, step_{index + 1}),\n"
+                for index, (name, _) in enumerate(steps)
+            )
+            + ")"
+        )
+        calls = [f"step_{index + 1}(ns)" for index in range(len(steps))]
+        run_body = [f"    {call}" for call in calls[:-1]]
+        run_body.append(f"    return {calls[-1]}" if calls else "    return None")
+        return (
+            header
+            + "\n"
+            + "\n\n\n".join(parts)
+            + MODULE_FOOTER.format(run_body="\n".join(run_body))
+        )
+
+    def step(self, stmt: Stmt, index: int) -> Tuple[str, str]:
+        """A step's name, and the source of its function"""
+        if not isinstance(stmt, ExpressionStmt):
+            raise ValueError(f"Can't export a {type(stmt).__name__}")
+        if isinstance(stmt.expr, Assignment):
+            name = stmt.expr.name.literal.name
+            value = self.value(stmt.expr.value)
+            self.assigned.add(name)
+            target = f"ns[{_literal(name)}]"
+            body = f"    {target} = {value}\n    return {target}"
+        else:
+            code, _ = self.expression(stmt.expr)
+            body = f"    return {code}"
+        return step_name(stmt, index), f"def step_{index + 1}(ns):\n{body}"
+
+    def expression(self, expr: Expr) -> Code:
+        return fold_operations(expr, self.leaf, self.operation)
+
+    def leaf(self, expr: Expr) -> Code:
+        return expr.accept(self)
+
+    def operation(self, expr: Expr, operands: List[Code]) -> Code:
+        match expr:
+            case Grouping():
+                return operands[0]
+            case Unary():
+                symbol, precedence = UNARY_OPERATORS[expr.operator.token_type]
+                return f"{symbol}{self.operand(operands[0], precedence)}", precedence
+            case Binary():
+                symbol, precedence = BINARY_OPERATORS[expr.operator.token_type]
+                left, right = operands
+                # Python chains comparisons, so compared operands always need brackets
+                left = self.operand(left, precedence + (precedence == COMPARISON))
+                right = self.operand(right, precedence + 1)
+                return f"{left} {symbol} {right}", precedence
+        raise ValueError(f"Can't export a {type(expr).__name__}")
+
+    @staticmethod
+    def operand(code: Code, precedence: int) -> str:
+        text, operand_precedence = code
+        return text if operand_precedence >= precedence else f"({text})"
+
+    def value(self, expr: Expr, unwrap: bool = False) -> str:
+        code, _ = self.expression(expr)
+        # Anything but a literal may be a Frame, e.g. a name, call, or grouping
+        if unwrap and self.unwrap_frames and not isinstance(expr, (Literal, Table)):
+            self.imports["rithm.datatypes.versions"].add("as_pandas")
+            return f"as_pandas({code})"
+        return code
+
+    def visit_literal_expr(self, expr: Literal) -> Code:
+        return _literal(expr.value), ATOM
+
+    def visit_table_expr(self, expr: Table) -> Code:
+        self.imports["rithm.datatypes.frame"].add("read_table")
+        name = f"TABLE_{len(self.tables) + 1}"
+        self.tables.append(f"{name} = read_table({_literal(expr.rows)})")
+        # Copy, so changes to the result don't change the table
+        return f"{name}.copy()", ATOM
+
+    def visit_identifier_expr(self, expr: Identifier) -> Code:
+        name = expr.token.literal.name
+        if name in BUILTINS and name not in self.assigned:
+            self.imports["rithm.functions"].add(name)
+            return name, ATOM
+        return f"ns[{_literal(name)}]", ATOM
+
+    def visit_columnaccess_expr(self, expr: ColumnAccess) -> Code:
+        frame = self.operand(self.expression(expr.frame), ATOM)
+        return f"{frame}[{_literal(expr.name.literal.name)}]", ATOM
+
+    def visit_call_expr(self, expr: Call) -> Code:
+        callee = self.operand(self.expression(expr.callee), ATOM)
+        function = (
+            BUILTINS.get(expr.callee.token.literal.name)
+            if isinstance(expr.callee, Identifier)
+            else None
+        )
+        accepts_frames = getattr(function, "accepts_frames", False)
+        self.calls_frame_functions |= accepts_frames
+        arguments = [
+            self.value(argument, unwrap=not accepts_frames)
+            for argument in expr.arguments
+        ]
+        arguments.extend(
+            f"{name}={self.value(value, unwrap=not accepts_frames)}"
+            for name, value in expr.keywords.items()
+        )
+        return f"{callee}({', '.join(arguments)})", ATOM
+
+    def visit_join_expr(self, expr: Join) -> Code:
+        self.imports["rithm.datatypes.join"].add("join")
+        left = self.value(expr.left, unwrap=True)
+        right = self.value(expr.right, unwrap=True)
+        on = "None" if expr.on is None else self.value(expr.on)
+        return f"join({left}, {right}, on={on})", ATOM
+
+    def visit_assignment_expr(self, expr: Assignment) -> Code:
+        self.imports["rithm.export"].add("assign")
+        name = expr.name.literal.name
+        value = self.value(expr.value)
+        self.assigned.add(name)
+        return f"assign(ns, {_literal(name)}, {value})", ATOM
+
+
+def assign(namespace: Dict[str, Any], name: str, value: Any) -> Any:
+    """Assign `value` to `name` within an expression of an exported module"""
+    namespace[name] = value
+    return value
+
+
+def export_script(script: Union[str, CompiledScript]) -> str:
+    """The source of a Python module of pandas code equivalent to `script`"""
+    if isinstance(script, str):
+        script = compile_script(script)
+    return PandasExporter().export(script)
+
+
+def export_module(
+    script: Union[str, CompiledScript], name: str, path: Optional[str] = None
+) -> ModuleType:
+    """
+    Export `script`, and import the generated module as `name`. The module's source
+    is written to `path` if given, so it can be imported from there later.
+    """
+    source = export_script(script)
+    if path is not None:
+        with open(path, "w") as file:
+            file.write(source)
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    else:
+        module = ModuleType(name)
+        exec(compile(source, f"<rithm export {name}>", "exec"), module.__dict__)
+    sys.modules[name] = module
+    return module
@@ -1,51 +1,140 @@
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 from rithm.token import Token, TokenType as TT
 from abc import ABC
 
 from rithm.visitor import Visitor
 
 
-@dataclass
 class Expr:
+    # Expressions are slotted, so nodes of large trees don't each carry a __dict__
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        # Work out the visitor method name once per class, rather than on every accept
+        cls.visit_method_name = f"visit_{cls.__name__.lower()}_expr"
+
     def accept(self, visitor: Visitor):
-        method_name = f"visit_{self.__class__.__name__.lower()}_expr"
-        method = getattr(visitor, method_name)
-        return method(self)
+        return getattr(visitor, self.visit_method_name)(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class Literal(Expr):
     value: Any
     token_type: TT
 
 
-@dataclass
+@dataclass(slots=True)
+class Table(Expr):
+    """A table literal, already read into the columns of a frame"""
+
+    rows: str
+    frame: Any = field(compare=False, repr=False)
+
+
+@dataclass(slots=True)
 class Identifier(Expr):
     token: Token
 
 
-@dataclass
+@dataclass(slots=True)
+class ColumnAccess(Expr):
+    frame: Expr
+    name: Token
+
+
+@dataclass(slots=True)
+class Call(Expr):
+    callee: Expr
+    arguments: List[Expr]
+    # Keyword arguments, given as `name = value`
+    keywords: Dict[str, Expr] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class Join(Expr):
+    left: Expr
+    right: Expr
+    # The column to join on, or None to join on the only column the frames share
+    on: Optional[Expr] = None
+
+
+@dataclass(slots=True)
 class Assignment(Expr):
     name: Token
     value: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class Binary(Expr):
     left: Expr
     operator: Token
     right: Expr
 
 
-@dataclass
+@dataclass(slots=True)
+class SpecializedBinary(Binary):
+    """
+    A Binary whose operand types were inferred statically, so its operation could
+    be chosen ahead of time instead of being dispatched on every evaluation
+    """
+
+    operation: Callable[[Any, Any], Any]
+
+
+@dataclass(slots=True)
 class Unary(Expr):
     operator: Token
     expr: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class Grouping(Expr):
     expr: Expr
     open_token_type: TT
     close_token_type: TT
+
+
+T = TypeVar("T")
+
+OPERATIONS = (Binary, Unary, Grouping)
+
+
+def operands(expr: Expr) -> Tuple[Expr, ...]:
+    """The operands of a Binary, Unary or Grouping"""
+    if isinstance(expr, Binary):
+        return (expr.left, expr.right)
+    return (expr.expr,)
+
+
+def fold_operations(
+    expr: Expr,
+    leaf: Callable[[Expr], T],
+    combine: Callable[[Expr, List[T]], T],
+    is_leaf: Optional[Callable[[Expr], bool]] = None,
+) -> T:
+    """
+    Fold a tree of Binary, Unary and Grouping nodes bottom up, using an explicit
+    stack rather than recursion, so arbitrarily deep trees can be visited.
+
+    `leaf` is called on every other kind of node (and on operations for which
+    `is_leaf` is true), and `combine` on each operation, with the results for its
+    operands.
+    """
+    results: List[T] = []
+    stack: List[Tuple[Expr, bool]] = [(expr, False)]
+    while stack:
+        node, operands_done = stack.pop()
+        if not isinstance(node, OPERATIONS) or (
+            is_leaf is not None and node is not expr and is_leaf(node)
+        ):
+            results.append(leaf(node))
+        elif operands_done:
+            count = 2 if isinstance(node, Binary) else 1
+            node_results = results[-count:]
+            del results[-count:]
+            results.append(combine(node, node_results))
+        else:
+            stack.append((node, True))
+            stack.extend((operand, False) for operand in reversed(operands(node)))
+    return results[0]
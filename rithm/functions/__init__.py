@@ -0,0 +1,32 @@
+from rithm.functions.aggregate import aggregate, aggregate_chunks
+from rithm.functions.frames import drop, filter, rename, with_column
+from rithm.functions.strings import (
+    lower,
+    split,
+    strip,
+    to_camel_case,
+    to_columns,
+    upper,
+)
+from rithm.functions.window import lag, lead, rolling_mean, rolling_rank, rolling_sum
+
+# Functions available in every namespace
+BUILTINS = {
+    "aggregate": aggregate,
+    "aggregate_chunks": aggregate_chunks,
+    "drop": drop,
+    "filter": filter,
+    "lag": lag,
+    "lead": lead,
+    "lower": lower,
+    "rename": rename,
+    "rolling_mean": rolling_mean,
+    "rolling_rank": rolling_rank,
+    "rolling_sum": rolling_sum,
+    "split": split,
+    "strip": strip,
+    "to_camel_case": to_camel_case,
+    "to_columns": to_columns,
+    "upper": upper,
+    "with_column": with_column,
+}
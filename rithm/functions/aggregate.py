@@ -0,0 +1,231 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from rithm.functions.memo import pure
+
+# The state kept per group for each aggregation function, and how to combine
+# the states of the same group from different partial aggregates
+STATES = {
+    "sum": ("sum",),
+    "count": ("count",),
+    "mean": ("sum", "count"),
+    "min": ("min",),
+    "max": ("max",),
+}
+MERGE_STATES = {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+# Ignore missing values when finding minimums and maximums
+REDUCERS = {"sum": np.add, "min": np.fmin, "max": np.fmax}
+
+# A (state, column) pair
+StateKey = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class AggregationSpec:
+    """Aggregate `column` with `function`, into an output column called `name`"""
+
+    name: str
+    function: str
+    column: str
+
+    @classmethod
+    def parse(cls, name: str, spec: str) -> "AggregationSpec":
+        """Parse `"function"` (aggregating the column called `name`) or `"function:column"`"""
+        function, _, column = spec.partition(":")
+        if function not in STATES:
+            raise ValueError(
+                f"Unknown aggregation {function!r}, must be one of {list(STATES)}"
+            )
+        return cls(name=name, function=function, column=column or name)
+
+
+def _is_sorted(keys: np.ndarray) -> bool:
+    return len(keys) < 2 or bool(pd.Index(keys).is_monotonic_increasing)
+
+
+def _identity(operation: str, dtype: np.dtype):
+    """The initial state of a group, before any of its values are reduced into it"""
+    if operation == "sum":
+        return 0
+    if dtype.kind == "f":
+        return np.nan
+    if dtype.kind == "b":
+        return operation == "min"
+    info = np.iinfo(dtype)
+    return info.max if operation == "min" else info.min
+
+
+def _reduce_objects(
+    operation: str, array: np.ndarray, codes: np.ndarray, groups: int
+) -> np.ndarray:
+    """
+    Reduce an object array (e.g. strings, or integers too large for int64) per group
+    code, skipping missing values, which numpy's reductions can't
+    """
+    reduced = pd.Series(array, dtype=object).groupby(codes).agg(operation)
+    return reduced.reindex(range(groups)).to_numpy(dtype=object)
+
+
+def _reduce_groups(
+    keys: np.ndarray, values: Dict[StateKey, Tuple[str, np.ndarray]]
+) -> Tuple[np.ndarray, Dict[StateKey, np.ndarray]]:
+    """
+    Reduce each array of `values` per distinct key, with its operation (sum, min or
+    max), keeping the array's dtype. Uses a run length fast path when the keys are
+    already sorted, and hash aggregation otherwise. The distinct keys are returned in
+    sorted order.
+    """
+    if _is_sorted(keys):
+        # Each run of equal keys is a group, so reduce each run in place
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]][: len(keys)])
+        uniques = keys[starts]
+
+        def reduce(operation: str, array: np.ndarray) -> np.ndarray:
+            if len(starts) == 0:
+                return array[:0]
+            if array.dtype == object:
+                sizes = np.diff(np.r_[starts, len(keys)])
+                runs = np.repeat(np.arange(len(starts)), sizes)
+                return _reduce_objects(operation, array, runs, len(starts))
+            return REDUCERS[operation].reduceat(array, starts)
+
+    else:
+        codes, uniques = pd.factorize(keys, sort=True)
+        uniques = np.asarray(uniques)
+
+        def reduce(operation: str, array: np.ndarray) -> np.ndarray:
+            if array.dtype == object:
+                return _reduce_objects(operation, array, codes, len(uniques))
+            if operation == "sum" and array.dtype.kind == "f":
+                return np.bincount(codes, weights=array, minlength=len(uniques))
+            result = np.full(
+                len(uniques), _identity(operation, array.dtype), dtype=array.dtype
+            )
+            REDUCERS[operation].at(result, codes, array)
+            return result
+
+    return uniques, {
+        key: reduce(operation, array) for key, (operation, array) in values.items()
+    }
+
+
+def _state_values(state: str, column: np.ndarray) -> np.ndarray:
+    """
+    The values of a column to reduce into a state. Sums of integers stay integers
+    (so they're exact beyond 2**53), and minimums and maximums keep the column's
+    type. Anything that isn't a number is reduced as Python objects.
+    """
+    if state == "count":
+        return pd.notna(column).astype(np.int64)
+    kind = column.dtype.kind
+    if kind == "f":
+        column = column.astype(np.float64)
+        return np.nan_to_num(column) if state == "sum" else column
+    if kind in "iu":
+        return column.astype(np.uint64 if kind == "u" else np.int64)
+    if kind == "b":
+        return column.astype(np.int64) if state == "sum" else column
+    return column.astype(object)
+
+
+@dataclass
+class PartialAggregate:
+    """
+    The per-group states (sums, counts, minimums and maximums) of aggregating part of
+    a frame. Partial aggregates of different chunks can be merged, then finalized into
+    the same result as aggregating the whole frame at once.
+    """
+
+    by: str
+    specs: Tuple[AggregationSpec, ...]
+    keys: np.ndarray
+    # The state of each group, per (state, column)
+    states: Dict[StateKey, np.ndarray]
+
+    @classmethod
+    def from_frame(
+        cls, frame: pd.DataFrame, by: str, specs: Iterable[AggregationSpec]
+    ) -> "PartialAggregate":
+        specs = tuple(specs)
+        keys = frame[by]
+        # Rows with a missing key don't belong to any group
+        present = keys.notna().to_numpy()
+        keys = keys.to_numpy()[present]
+
+        values = {}
+        for spec in specs:
+            column = frame[spec.column].to_numpy()[present]
+            for state in STATES[spec.function]:
+                if (state, spec.column) not in values:
+                    values[(state, spec.column)] = _state_values(state, column)
+
+        keys, states = _reduce_groups(
+            keys, {key: (MERGE_STATES[key[0]], array) for key, array in values.items()}
+        )
+        return cls(by=by, specs=specs, keys=keys, states=states)
+
+    def merge(self, *others: "PartialAggregate") -> "PartialAggregate":
+        partials = (self, *others)
+        keys = np.concatenate([partial.keys for partial in partials])
+        # Re-aggregate the states, e.g. summing the sums and counts of each part
+        values = {
+            key: (
+                MERGE_STATES[key[0]],
+                np.concatenate([partial.states[key] for partial in partials]),
+            )
+            for key in self.states
+        }
+        keys, states = _reduce_groups(keys, values)
+        return PartialAggregate(self.by, self.specs, keys, states)
+
+    def finalize(self) -> pd.DataFrame:
+        columns = {self.by: self.keys}
+        for spec in self.specs:
+            match spec.function:
+                case "mean":
+                    # Only means are floats; sums stay exact until they're divided
+                    sums = self.states[("sum", spec.column)].astype(np.float64)
+                    counts = self.states[("count", spec.column)]
+                    with np.errstate(invalid="ignore", divide="ignore"):
+                        result = sums / counts
+                    result[counts == 0] = np.nan
+                case "count":
+                    result = self.states[("count", spec.column)]
+                case function:
+                    result = self.states[(function, spec.column)]
+            columns[spec.name] = result
+        return pd.DataFrame(columns)
+
+
+def _specs(aggregations: Dict[str, str]) -> List[AggregationSpec]:
+    return [AggregationSpec.parse(name, spec) for name, spec in aggregations.items()]
+
+
+@pure
+def aggregate(frame: pd.DataFrame, by: str, **aggregations: str) -> pd.DataFrame:
+    """
+    Group the rows of `frame` by the `by` column, and aggregate other columns for
+    each group, e.g. `aggregate(titanic, "Pclass", Fare="mean", n="count:Fare")`.
+    Each aggregation is `"function"` (of the column with the same name as the output)
+    or `"function:column"`, where function is one of sum, count, mean, min or max.
+    Returns a frame with one row per group, sorted by key.
+    """
+    return PartialAggregate.from_frame(frame, by, _specs(aggregations)).finalize()
+
+
+@pure
+def aggregate_chunks(
+    chunks: Iterable[pd.DataFrame], by: str, **aggregations: str
+) -> pd.DataFrame:
+    """
+    Aggregate a frame given in chunks, by merging a partial aggregate of each chunk.
+    With no chunks, the result has no rows.
+    """
+    specs = _specs(aggregations)
+    partials = [PartialAggregate.from_frame(chunk, by, specs) for chunk in chunks]
+    if not partials:
+        return pd.DataFrame(columns=[by, *(spec.name for spec in specs)])
+    return partials[0].merge(*partials[1:]).finalize()
@@ -0,0 +1,39 @@
+from typing import Any, Callable, Hashable, Union
+
+import pandas as pd
+
+from rithm.datatypes.versions import Frame
+
+
+def frame_function(function: Callable) -> Callable:
+    """Mark a function as taking Frames, so they aren't converted to DataFrames first"""
+    function.accepts_frames = True
+    return function
+
+
+def _frame(frame: Union[Frame, pd.DataFrame]) -> Frame:
+    return frame if isinstance(frame, Frame) else Frame.from_pandas(frame)
+
+
+@frame_function
+def rename(frame: Union[Frame, pd.DataFrame], **names: Hashable) -> Frame:
+    """Rename columns, e.g. `rename(df, Pclass = "passenger_class")`"""
+    return _frame(frame).rename(names)
+
+
+@frame_function
+def drop(frame: Union[Frame, pd.DataFrame], *names: Hashable) -> Frame:
+    return _frame(frame).drop(*names)
+
+
+@frame_function
+def with_column(
+    frame: Union[Frame, pd.DataFrame], name: Hashable, values: Any
+) -> Frame:
+    """Add or replace the column `name`"""
+    return _frame(frame).with_column(name, values)
+
+
+def filter(frame: pd.DataFrame, matches: pd.Series) -> pd.DataFrame:
+    """The rows of `frame` that match, e.g. `filter(trips, trips@fare > 10)`"""
+    return frame[matches.to_numpy(dtype=bool)]
@@ -0,0 +1,228 @@
+from collections import OrderedDict
+import copy
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from rithm.datatypes.store import value_nbytes
+from rithm.datatypes.versions import _copy_on_write
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# The array backing numpy typed Series (called PandasArray before pandas 2.1)
+NumpyExtensionArray = getattr(pd.arrays, "NumpyExtensionArray", None) or getattr(
+    pd.arrays, "PandasArray"
+)
+
+# Results are only cached while their total bytes are within this
+MEMO_MAX_BYTES = 256 << 20
+MEMO_MAX_ENTRIES = 1024
+
+
+def pure(function: Callable) -> Callable:
+    """
+    Mark a function as pure: its result depends only on its arguments' contents, and
+    calling it has no side effects. Only pure functions' calls are memoized.
+    """
+    function.pure = True
+    return function
+
+
+def _digest(*buffers: Any) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    for buffer in buffers:
+        digest.update(buffer)
+    return digest.digest()
+
+
+def _fingerprint_values(values: Any) -> Optional[Hashable]:
+    """A fingerprint of the contents of an array, or None if it can't be hashed"""
+    if isinstance(values, NumpyExtensionArray):
+        # A Series' numpy backed array, whose buffer can be hashed without boxing
+        values = values.to_numpy()
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        contiguous = np.ascontiguousarray(values)
+        return (
+            str(values.dtype),
+            values.shape,
+            _digest(contiguous.reshape(-1).view(np.uint8)),
+        )
+
+    if pa is not None and isinstance(values, pd.arrays.ArrowExtensionArray):
+        # Hash the Arrow buffers themselves, rather than converting to Python objects
+        array = values.__arrow_array__()
+        parts = [str(array.type).encode()]
+        for chunk in array.chunks:
+            parts.append(f"{chunk.offset}:{len(chunk)}".encode())
+            parts.extend(buffer for buffer in chunk.buffers() if buffer is not None)
+        return ("arrow", _digest(*parts))
+
+    objects = np.asarray(values, dtype=object)
+    try:
+        hashes = pd.util.hash_array(objects)
+    except TypeError:
+        # e.g. lists, which aren't hashable
+        return None
+    # Values of different types can hash the same (1 and "1" do), so hash the type
+    # of each value too
+    types = np.array([type(value).__qualname__ for value in objects], dtype=object)
+    return (
+        str(values.dtype),
+        len(values),
+        _digest(hashes, pd.util.hash_array(types)),
+    )
+
+
+def _fingerprint_index(index: pd.Index) -> Optional[Hashable]:
+    if isinstance(index, pd.RangeIndex):
+        return ("range", index.start, index.stop, index.step, repr(index.name))
+    values = _fingerprint_values(index.to_numpy())
+    return None if values is None else ("index", repr(index.name), values)
+
+
+def fingerprint(value: Any) -> Optional[Hashable]:
+    """
+    A fast fingerprint of a value's contents (hashing the buffers of frames, columns
+    and arrays), equal for values with equal contents. None if the value can't be
+    fingerprinted, e.g. an arbitrary object, whose calls are then not cached.
+    """
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return (type(value).__name__, value)
+    if isinstance(value, (tuple, list)):
+        parts = tuple(fingerprint(item) for item in value)
+        return None if None in parts else (type(value).__name__, parts)
+
+    if isinstance(value, pd.Series):
+        parts = (_fingerprint_index(value.index), _fingerprint_values(value.array))
+        return None if None in parts else ("series", repr(value.name), *parts)
+    if isinstance(value, pd.Index):
+        return _fingerprint_index(value)
+    if isinstance(value, pd.DataFrame):
+        parts = (
+            _fingerprint_index(value.columns),
+            _fingerprint_index(value.index),
+            *(
+                _fingerprint_values(value.iloc[:, i].array)
+                for i in range(value.shape[1])
+            ),
+        )
+        return None if None in parts else ("frame", parts)
+    if isinstance(value, np.ndarray):
+        return _fingerprint_values(value)
+    return None
+
+
+def _protected(result: Any) -> Any:
+    """
+    A cached result, to return to a caller without letting it change the cached
+    result: a shallow copy of a frame or column (which copy-on-write copies before
+    writing to), a read-only view of an array, or a shallow copy of a container
+    """
+    if isinstance(result, (pd.DataFrame, pd.Series, pd.Index)):
+        return result.copy(deep=not _copy_on_write())
+    if isinstance(result, np.ndarray):
+        view = result.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(result, (list, dict, set)):
+        return copy.copy(result)
+    # Frames and scalars are immutable
+    return result
+
+
+class MemoCache:
+    """
+    Caches the results of pure function calls, keyed on the function and the
+    fingerprints of its arguments. The least recently used results are evicted to
+    keep within `max_bytes` (of frames, columns and arrays) and `max_entries`.
+    Callers get protected versions of the cached results (see `_protected`), so a
+    caller writing to its result doesn't change what later calls get.
+
+    A cache can be shared by runs in many threads. The cached results are only
+    locked while being looked up or stored, not while a function is being called,
+    so two threads missing on the same call may both call the function.
+    """
+
+    def __init__(
+        self, max_bytes: int = MEMO_MAX_BYTES, max_entries: int = MEMO_MAX_ENTRIES
+    ):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.results: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.hits} hits, {self.misses} misses ({self.hit_rate:.0%} hit rate), "
+            f"{len(self)} results cached ({self.nbytes:,} bytes)"
+        )
+
+    def key(
+        self, function: Callable, arguments: List[Any], keywords: Dict[str, Any]
+    ) -> Optional[Hashable]:
+        positional = tuple(fingerprint(argument) for argument in arguments)
+        named = tuple(
+            (name, fingerprint(value)) for name, value in sorted(keywords.items())
+        )
+        if None in positional or any(part is None for _, part in named):
+            return None
+        return (function, positional, named)
+
+    def call(
+        self, function: Callable, arguments: List[Any], keywords: Dict[str, Any]
+    ) -> Any:
+        """
+        Call `function`, or return (a protected version of) the cached result of
+        calling it before with arguments of the same contents, if it is pure
+        """
+        if not getattr(function, "pure", False):
+            return function(*arguments, **keywords)
+
+        key = self.key(function, arguments, keywords)
+        if key is None:
+            return function(*arguments, **keywords)
+        with self.lock:
+            try:
+                result, _ = self.results[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.results.move_to_end(key)
+                return _protected(result)
+
+        result = function(*arguments, **keywords)
+        self.store(key, result)
+        return _protected(result)
+
+    def store(self, key: Hashable, result: Any):
+        nbytes = value_nbytes(result)
+        if nbytes > self.max_bytes:
+            return
+        with self.lock:
+            previous = self.results.pop(key, None)
+            if previous is not None:
+                # Another thread stored the same call meanwhile
+                self.nbytes -= previous[1]
+            self.results[key] = (result, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes or len(self.results) > self.max_entries:
+                _, (_, evicted) = self.results.popitem(last=False)
+                self.nbytes -= evicted
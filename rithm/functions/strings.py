@@ -0,0 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+from typing import Any, Callable, List, Union
+
+import numpy as np
+import pandas as pd
+
+from rithm.functions.memo import pure
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    # Without pyarrow, the (single threaded) pandas string methods are used instead
+    pa = None
+    pc = None
+
+Strings = Union[pd.Series, pd.Index]
+
+# Large columns are processed in chunks of this many rows, in parallel threads
+# (Arrow compute functions release the GIL)
+CHUNK_SIZE = 1 << 16
+MAX_WORKERS = os.cpu_count() or 1
+
+
+def _arrow(values: Any) -> "pa.ChunkedArray":
+    array = pa.array(values, from_pandas=True)
+    if isinstance(array, pa.ChunkedArray):
+        return array
+    return pa.chunked_array([array])
+
+
+def _map_chunks(kernel: Callable, values: Any) -> "pa.ChunkedArray":
+    """Apply an Arrow kernel to the values, in parallel over chunks of CHUNK_SIZE"""
+    chunks = [
+        chunk.slice(offset, CHUNK_SIZE)
+        for chunk in _arrow(values).chunks
+        for offset in range(0, len(chunk), CHUNK_SIZE)
+    ]
+    if len(chunks) == 1:
+        return pa.chunked_array([kernel(chunks[0])])
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        return pa.chunked_array(list(pool.map(kernel, chunks)))
+
+
+def _like(strings: Strings, array: "pa.ChunkedArray") -> Strings:
+    """Wrap an Arrow result like the input: as a Series with its index and name, or an Index"""
+    values = pd.arrays.ArrowExtensionArray(array)
+    if isinstance(strings, pd.Index):
+        return pd.Index(values, name=strings.name)
+    return pd.Series(values, index=strings.index, name=strings.name)
+
+
+def _apply(
+    strings: Strings,
+    kernel: Callable[["pa.Array"], "pa.Array"],
+    fallback: Callable[[Strings], Strings],
+) -> Strings:
+    if pc is None or len(strings) == 0:
+        return fallback(strings)
+    return _like(strings, _map_chunks(kernel, strings))
+
+
+@pure
+def lower(strings: Strings) -> Strings:
+    return _apply(strings, lambda chunk: pc.utf8_lower(chunk), lambda s: s.str.lower())
+
+
+@pure
+def upper(strings: Strings) -> Strings:
+    return _apply(strings, lambda chunk: pc.utf8_upper(chunk), lambda s: s.str.upper())
+
+
+@pure
+def strip(strings: Strings) -> Strings:
+    return _apply(
+        strings, lambda chunk: pc.utf8_trim_whitespace(chunk), lambda s: s.str.strip()
+    )
+
+
+@pure
+def split(strings: Strings, sep: str) -> Strings:
+    """Split each string on `sep`, into a list of strings"""
+    return _apply(
+        strings,
+        lambda chunk: pc.split_pattern(chunk, pattern=sep),
+        lambda s: s.str.split(sep, regex=False),
+    )
+
+
+def _camel_case_kernel(chunk: "pa.Array") -> "pa.Array":
+    words = pc.utf8_title(pc.replace_substring_regex(chunk, r"[\W_]+", " "))
+    joined = pc.replace_substring(words, " ", "")
+    first = pc.utf8_lower(pc.utf8_slice_codeunits(joined, 0, 1))
+    rest = pc.utf8_slice_codeunits(joined, 1)
+    return pc.binary_join_element_wise(first, rest, pa.scalar("", type=joined.type))
+
+
+def _camel_case_fallback(strings: Strings) -> Strings:
+    words = strings.str.replace(r"[\W_]+", " ", regex=True).str.title()
+    joined = words.str.replace(" ", "", regex=False)
+    return joined.str[:1].str.lower() + joined.str[1:]
+
+
+@pure
+def to_camel_case(strings: Strings) -> Strings:
+    """Convert strings (e.g. column names) like `passenger_class` to `passengerClass`"""
+    return _apply(strings, _camel_case_kernel, _camel_case_fallback)
+
+
+@pure
+def to_columns(parts: pd.Series, *names: str) -> pd.DataFrame:
+    """
+    Spread a column of lists (e.g. from `split`) into a frame with a column per name,
+    holding the first, second, etc. element of each list (missing if it is too short)
+    """
+    if _is_arrow_list(parts):
+        array = _arrow(parts)
+
+        def element(position: int) -> "pa.ChunkedArray":
+            # Slicing to a fixed size list pads short lists with nulls
+            sliced = pc.list_slice(
+                array, position, position + 1, return_fixed_size_list=True
+            )
+            return pc.list_element(sliced, 0)
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            columns = list(pool.map(element, range(len(names))))
+        return pd.DataFrame(
+            {name: _like(parts, column) for name, column in zip(names, columns)},
+            index=parts.index,
+        )
+
+    # Write each element straight into its preallocated output column
+    columns: List[np.ndarray] = [np.full(len(parts), None, dtype=object) for _ in names]
+    for row, values in enumerate(parts):
+        if isinstance(values, (list, tuple, np.ndarray)):
+            for column, value in zip(columns, values):
+                column[row] = value
+    return pd.DataFrame(dict(zip(names, columns)), index=parts.index)
+
+
+def _is_arrow_list(values: pd.Series) -> bool:
+    return (
+        pc is not None
+        and isinstance(values.dtype, pd.ArrowDtype)
+        and (
+            pa.types.is_list(values.dtype.pyarrow_dtype)
+            or pa.types.is_large_list(values.dtype.pyarrow_dtype)
+        )
+    )
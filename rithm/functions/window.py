@@ -0,0 +1,266 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from rithm.functions.memo import pure
+
+# Window functions assume the rows are already in time order (within each partition)
+
+
+def _partitions(
+    by: Optional[pd.Series], rows: int
+) -> Tuple[Optional[np.ndarray], np.ndarray, np.ndarray]:
+    """
+    The stable order that groups the rows by partition (None if there is only one),
+    and the positions (in that order) of the first row of each row's partition and
+    of the row after its last
+    """
+    if by is None:
+        return None, np.zeros(rows, dtype=np.intp), np.full(rows, rows, dtype=np.intp)
+    codes, _ = pd.factorize(np.asarray(by), use_na_sentinel=False)
+    order = np.argsort(codes, kind="stable")
+    grouped = codes[order]
+    starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]][:rows])
+    sizes = np.diff(np.r_[starts, rows])
+    return order, np.repeat(starts, sizes), np.repeat(starts + sizes, sizes)
+
+
+def _window_aggregate(
+    values: pd.Series,
+    window: int,
+    by: Optional[pd.Series],
+    min_periods: Optional[int],
+    kernel: Callable[[np.ndarray, np.ndarray, int, int], np.ndarray],
+) -> pd.Series:
+    if window < 1:
+        raise ValueError(f"Window must be at least 1 row, not {window}")
+    x = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    order, group_starts, _ = _partitions(by, len(x))
+    if order is not None:
+        x = x[order]
+
+    result = kernel(
+        x, group_starts, window, window if min_periods is None else min_periods
+    )
+    if order is not None:
+        unsorted = np.empty_like(result)
+        unsorted[order] = result
+        result = unsorted
+    return pd.Series(result, index=values.index, name=values.name)
+
+
+# Running sums restart every this many rows (or every window, if that is wider), so
+# their rounding errors stay proportional to a block's total, not the whole column's
+SUM_BLOCK_SIZE = 1 << 12
+
+
+def _block_sums(x: np.ndarray, block_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """The sum of the values before each position in its block, and each block's total"""
+    blocks = -(-len(x) // block_size)
+    padded = np.zeros(blocks * block_size + 1)
+    padded[: len(x)] = x
+    local = np.cumsum(padded[:-1].reshape(blocks, block_size), axis=1)
+    totals = local[:, -1].copy()
+    # Shift to exclusive sums, so each block starts at 0
+    local = np.c_[np.zeros(blocks), local[:, :-1]].ravel()
+    return np.r_[local, 0.0][: len(x) + 1], totals
+
+
+def _sums_and_counts(
+    x: np.ndarray, group_starts: np.ndarray, window: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The sum and number of non-missing values of each window. Each is the difference
+    of two running totals, so updating the window costs the same however wide it is.
+    """
+    valid = ~np.isnan(x)
+    counts = np.r_[0, np.cumsum(valid)]
+    ends = np.arange(1, len(x) + 1)
+    starts = np.maximum(ends - window, group_starts)
+
+    block_size = max(SUM_BLOCK_SIZE, window)
+    before, totals = _block_sums(np.where(valid, x, 0.0), block_size)
+    start_blocks = starts // block_size
+    # A window spans at most two blocks: the rest of the start's block, and the part
+    # of the end's block before the end
+    sums = np.where(
+        start_blocks == ends // block_size,
+        before[ends] - before[starts],
+        totals[np.minimum(start_blocks, len(totals) - 1)]
+        - before[starts]
+        + before[ends],
+    )
+    return sums, counts[ends] - counts[starts]
+
+
+def _sum_kernel(x, group_starts, window, min_periods):
+    sums, counts = _sums_and_counts(x, group_starts, window)
+    return np.where(counts >= min_periods, sums, np.nan)
+
+
+def _mean_kernel(x, group_starts, window, min_periods):
+    sums, counts = _sums_and_counts(x, group_starts, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where((counts >= min_periods) & (counts > 0), sums / counts, np.nan)
+
+
+def _rank_kernel(x, group_starts, window, min_periods):
+    """
+    The (average) rank of each value within its window. The window's values are kept
+    sorted, so each row inserts one value and removes one, by binary search.
+    """
+    result = np.full(len(x), np.nan)
+    in_window = []
+    for row, value in enumerate(x):
+        start = group_starts[row]
+        if row == start:
+            in_window = []
+        elif row - window >= start and not np.isnan(x[row - window]):
+            del in_window[bisect_left(in_window, x[row - window])]
+
+        if np.isnan(value):
+            continue
+        insort(in_window, value)
+        if len(in_window) >= min_periods:
+            lower = bisect_left(in_window, value)
+            upper = bisect_right(in_window, value)
+            result[row] = (lower + upper + 1) / 2
+    return result
+
+
+@pure
+def rolling_sum(
+    values: pd.Series,
+    window: int,
+    by: Optional[pd.Series] = None,
+    min_periods: Optional[int] = None,
+) -> pd.Series:
+    """
+    The sum of each row's value and the `window - 1` values before it (in the same
+    partition, if `by` is given). Windows with fewer than `min_periods` (by default,
+    `window`) non-missing values are missing.
+    """
+    return _window_aggregate(values, window, by, min_periods, _sum_kernel)
+
+
+@pure
+def rolling_mean(
+    values: pd.Series,
+    window: int,
+    by: Optional[pd.Series] = None,
+    min_periods: Optional[int] = None,
+) -> pd.Series:
+    """The mean of each row's value and the `window - 1` values before it"""
+    return _window_aggregate(values, window, by, min_periods, _mean_kernel)
+
+
+@pure
+def rolling_rank(
+    values: pd.Series,
+    window: int,
+    by: Optional[pd.Series] = None,
+    min_periods: Optional[int] = None,
+) -> pd.Series:
+    """The rank of each row's value among it and the `window - 1` values before it"""
+    return _window_aggregate(values, window, by, min_periods, _rank_kernel)
+
+
+def _shift(values: pd.Series, periods: int, by: Optional[pd.Series]) -> pd.Series:
+    rows = len(values)
+    order, group_starts, group_ends = _partitions(by, rows)
+    positions = np.arange(rows)
+    source = positions - periods
+    inside = (source >= group_starts) & (source < group_ends)
+    source = np.where(inside, source, -1)
+    if order is not None:
+        source = np.where(source >= 0, order[source], -1)
+        unsorted = np.empty_like(source)
+        unsorted[order] = source
+        source = unsorted
+    shifted = values.array.take(source, allow_fill=True)
+    return pd.Series(shifted, index=values.index, name=values.name)
+
+
+@pure
+def lag(
+    values: pd.Series, periods: int = 1, by: Optional[pd.Series] = None
+) -> pd.Series:
+    """Each row's value from `periods` rows before (in the same partition)"""
+    return _shift(values, periods, by)
+
+
+@pure
+def lead(
+    values: pd.Series, periods: int = 1, by: Optional[pd.Series] = None
+) -> pd.Series:
+    """Each row's value from `periods` rows after (in the same partition)"""
+    return _shift(values, -periods, by)
+
+
+ROLLING_FUNCTIONS = {"sum": rolling_sum, "mean": rolling_mean, "rank": rolling_rank}
+
+
+class StreamingWindow:
+    """
+    Applies a window function (a rolling sum, mean or rank, or lag) to a stream of
+    chunks of time ordered rows, with the same result as applying it to all of the
+    rows at once. The last rows of each partition are carried over to the next chunk,
+    so windows that straddle a chunk boundary still see the rows before it.
+
+    `size` is the window, or the number of periods to lag by. Lead isn't supported,
+    since it needs the rows after each chunk.
+    """
+
+    def __init__(self, function: str, size: int, min_periods: Optional[int] = None):
+        if function == "lag":
+            self.carry = size
+            self.apply = lambda values, by: lag(values, size, by=by)
+        elif function in ROLLING_FUNCTIONS:
+            self.carry = size - 1
+            self.apply = lambda values, by: ROLLING_FUNCTIONS[function](
+                values, size, by=by, min_periods=min_periods
+            )
+        else:
+            raise ValueError(
+                f"Streaming window function must be one of "
+                f"{[*ROLLING_FUNCTIONS, 'lag']}, not {function!r}"
+            )
+        # The carried over rows
+        self.values: Optional[pd.Series] = None
+        self.by: Optional[pd.Series] = None
+
+    def update(self, values: pd.Series, by: Optional[pd.Series] = None) -> pd.Series:
+        """The window function's result for the next chunk of rows"""
+        carried = 0 if self.values is None else len(self.values)
+        values = self._after_carried(self.values, values)
+        if by is not None:
+            by = self._after_carried(self.by, by)
+
+        result = self.apply(values, by)
+        self._carry_over(values, by)
+        # The carried over rows were only context for the new rows' windows
+        return result.iloc[carried:]
+
+    @staticmethod
+    def _after_carried(carried: Optional[pd.Series], values: pd.Series) -> pd.Series:
+        values = pd.Series(values)
+        if carried is None or len(carried) == 0:
+            return values
+        return pd.concat([carried, values])
+
+    def _carry_over(self, values: pd.Series, by: Optional[pd.Series]):
+        """Keep the last `carry` rows of each partition"""
+        positions = pd.RangeIndex(len(values))
+        if by is None:
+            kept = positions[len(values) - min(self.carry, len(values)) :]
+        else:
+            kept = (
+                pd.Series(positions)
+                .groupby(by.to_numpy(), dropna=False)
+                .tail(self.carry)
+                .to_numpy()
+            )
+        self.values = values.iloc[kept]
+        self.by = None if by is None else by.iloc[kept]
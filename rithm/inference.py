@@ -0,0 +1,263 @@
+from dataclasses import replace
+from enum import Enum, auto
+import operator
+from typing import Any, Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from rithm.datatypes.versions import Frame
+from rithm.expr import (
+    Assignment,
+    Binary,
+    Call,
+    ColumnAccess,
+    Expr,
+    Grouping,
+    Identifier,
+    Join,
+    Literal,
+    SpecializedBinary,
+    Table,
+    Unary,
+    fold_operations,
+)
+from rithm.stmt import ExpressionStmt, Stmt
+from rithm.token import TokenType as TT
+from rithm.visitor import Visitor
+
+
+class RithmType(Enum):
+    INTEGER = auto()
+    FLOAT = auto()
+    STRING = auto()
+    BOOLEAN = auto()
+    COLUMN = auto()
+    FRAME = auto()
+    UNKNOWN = auto()
+
+
+NUMERIC_TYPES = (RithmType.INTEGER, RithmType.FLOAT)
+
+LITERAL_TYPES = {
+    TT.INTEGER: RithmType.INTEGER,
+    TT.FLOAT: RithmType.FLOAT,
+    TT.STRING: RithmType.STRING,
+    TT.TRUE: RithmType.BOOLEAN,
+    TT.FALSE: RithmType.BOOLEAN,
+}
+
+ARITHMETIC_OPERATIONS = {
+    TT.PLUS: operator.add,
+    TT.MINUS: operator.sub,
+    TT.STAR: operator.mul,
+}
+
+COMPARISON_OPERATIONS = {
+    TT.EQUAL_EQUAL: operator.eq,
+    TT.LESS_THAN: operator.lt,
+    TT.LESS_EQUAL: operator.le,
+    TT.GREATER_THAN: operator.gt,
+    TT.GREATER_EQUAL: operator.ge,
+}
+
+
+def _specialized_operations() -> (
+    Dict[Tuple[TT, RithmType, RithmType], Tuple[Callable[[Any, Any], Any], RithmType]]
+):
+    operations = {}
+    for left in NUMERIC_TYPES:
+        for right in NUMERIC_TYPES:
+            result = (
+                RithmType.INTEGER
+                if left == right == RithmType.INTEGER
+                else RithmType.FLOAT
+            )
+            for token_type, operation in ARITHMETIC_OPERATIONS.items():
+                operations[(token_type, left, right)] = (operation, result)
+            operations[(TT.SLASH, left, right)] = (operator.truediv, RithmType.FLOAT)
+            for token_type, operation in COMPARISON_OPERATIONS.items():
+                operations[(token_type, left, right)] = (operation, RithmType.BOOLEAN)
+
+    operations[(TT.PLUS, RithmType.STRING, RithmType.STRING)] = (
+        operator.add,
+        RithmType.STRING,
+    )
+    for token_type, operation in COMPARISON_OPERATIONS.items():
+        operations[(token_type, RithmType.STRING, RithmType.STRING)] = (
+            operation,
+            RithmType.BOOLEAN,
+        )
+    return operations
+
+
+# (operator, left type, right type) -> (operation, result type)
+SPECIALIZED_OPERATIONS = _specialized_operations()
+
+
+def type_of(value: Any) -> RithmType:
+    """The RithmType of a runtime value"""
+    # bool is a subclass of int, so must be checked first
+    if isinstance(value, bool):
+        return RithmType.BOOLEAN
+    if isinstance(value, int):
+        return RithmType.INTEGER
+    if isinstance(value, float):
+        return RithmType.FLOAT
+    if isinstance(value, str):
+        return RithmType.STRING
+    if isinstance(value, pd.Series):
+        return RithmType.COLUMN
+    if isinstance(value, (pd.DataFrame, Frame)):
+        return RithmType.FRAME
+    return RithmType.UNKNOWN
+
+
+class TypeInferrer(Visitor):
+    """
+    Statically infers the types of expressions, rewriting any Binary whose operand
+    types are known into a SpecializedBinary, so the interpreter can skip the generic
+    operator dispatch. Anything that can't be inferred is left for generic dispatch.
+
+    The types of names come from the values already in the namespace, and from
+    assignments earlier in the same statements.
+    """
+
+    def __init__(self, namespace: Dict[str, Any]):
+        self.namespace = namespace
+        self.types: Dict[str, RithmType] = {}
+
+    def infer(self, stmts: List[Stmt]) -> List[Stmt]:
+        return [stmt.accept(self) for stmt in stmts]
+
+    def infer_expr(self, expr: Expr) -> Tuple[Expr, RithmType]:
+        return expr.accept(self)
+
+    def type_of_name(self, name: str) -> RithmType:
+        if name in self.types:
+            return self.types[name]
+        if name in self.namespace:
+            return type_of(self.namespace[name])
+        return RithmType.UNKNOWN
+
+    def visit_expression_stmt(self, stmt: ExpressionStmt) -> ExpressionStmt:
+        expr, _ = self.infer_expr(stmt.expr)
+        return ExpressionStmt(expr)
+
+    def visit_literal_expr(self, expr: Literal) -> Tuple[Expr, RithmType]:
+        return expr, LITERAL_TYPES.get(expr.token_type, RithmType.UNKNOWN)
+
+    def visit_table_expr(self, expr: Table) -> Tuple[Expr, RithmType]:
+        return expr, RithmType.FRAME
+
+    def visit_identifier_expr(self, expr: Identifier) -> Tuple[Expr, RithmType]:
+        return expr, self.type_of_name(expr.token.literal.name)
+
+    def visit_columnaccess_expr(self, expr: ColumnAccess) -> Tuple[Expr, RithmType]:
+        frame, frame_type = self.infer_expr(expr.frame)
+        column_type = (
+            RithmType.COLUMN if frame_type == RithmType.FRAME else RithmType.UNKNOWN
+        )
+        return replace(expr, frame=frame), column_type
+
+    def visit_call_expr(self, expr: Call) -> Tuple[Expr, RithmType]:
+        callee, _ = self.infer_expr(expr.callee)
+        arguments = [self.infer_expr(argument)[0] for argument in expr.arguments]
+        keywords = {
+            name: self.infer_expr(value)[0] for name, value in expr.keywords.items()
+        }
+        return Call(callee, arguments, keywords), RithmType.UNKNOWN
+
+    def visit_join_expr(self, expr: Join) -> Tuple[Expr, RithmType]:
+        left, _ = self.infer_expr(expr.left)
+        right, _ = self.infer_expr(expr.right)
+        on = None if expr.on is None else self.infer_expr(expr.on)[0]
+        return Join(left, right, on), RithmType.FRAME
+
+    def visit_assignment_expr(self, expr: Assignment) -> Tuple[Expr, RithmType]:
+        value, value_type = self.infer_expr(expr.value)
+        self.types[expr.name.literal.name] = value_type
+        return replace(expr, value=value), value_type
+
+    def visit_grouping_expr(self, expr: Grouping) -> Tuple[Expr, RithmType]:
+        return fold_operations(expr, self.infer_expr, self.infer_operation)
+
+    def visit_unary_expr(self, expr: Unary) -> Tuple[Expr, RithmType]:
+        return fold_operations(expr, self.infer_expr, self.infer_operation)
+
+    def visit_binary_expr(self, expr: Binary) -> Tuple[Expr, RithmType]:
+        return fold_operations(expr, self.infer_expr, self.infer_operation)
+
+    def visit_specializedbinary_expr(
+        self, expr: SpecializedBinary
+    ) -> Tuple[Expr, RithmType]:
+        return fold_operations(expr, self.infer_expr, self.infer_operation)
+
+    def infer_operation(
+        self, expr: Expr, operands: List[Tuple[Expr, RithmType]]
+    ) -> Tuple[Expr, RithmType]:
+        """Infer a Binary, Unary or Grouping from its already inferred operands"""
+        match expr:
+            case Binary():
+                return self.infer_binary(expr, *operands)
+            case Unary():
+                return self.infer_unary(expr, *operands)
+            case Grouping():
+                return self.infer_grouping(expr, *operands)
+
+    def infer_grouping(
+        self, expr: Grouping, inner: Tuple[Expr, RithmType]
+    ) -> Tuple[Expr, RithmType]:
+        inner_expr, inner_type = inner
+        if expr.open_token_type == TT.PAREN_OPEN:
+            # Parentheses only affect precedence, which is already encoded in the tree
+            return inner_expr, inner_type
+        return replace(expr, expr=inner_expr), RithmType.UNKNOWN
+
+    def infer_unary(
+        self, expr: Unary, inner: Tuple[Expr, RithmType]
+    ) -> Tuple[Expr, RithmType]:
+        inner_expr, inner_type = inner
+        match expr.operator.token_type:
+            case TT.MINUS if inner_type in (*NUMERIC_TYPES, RithmType.COLUMN):
+                result_type = inner_type
+            case TT.BANG:
+                result_type = RithmType.BOOLEAN
+            case _:
+                result_type = RithmType.UNKNOWN
+        return replace(expr, expr=inner_expr), result_type
+
+    def infer_binary(
+        self,
+        expr: Binary,
+        left: Tuple[Expr, RithmType],
+        right: Tuple[Expr, RithmType],
+    ) -> Tuple[Expr, RithmType]:
+        (left, left_type), (right, right_type) = left, right
+        token_type = expr.operator.token_type
+
+        specialized = SPECIALIZED_OPERATIONS.get((token_type, left_type, right_type))
+        if specialized is not None:
+            operation, result_type = specialized
+            return (
+                SpecializedBinary(
+                    left=left,
+                    operator=expr.operator,
+                    right=right,
+                    operation=operation,
+                ),
+                result_type,
+            )
+
+        result_type = self.vectorized_type(left_type, right_type)
+        return Binary(left=left, operator=expr.operator, right=right), result_type
+
+    def vectorized_type(self, left_type: RithmType, right_type: RithmType) -> RithmType:
+        """The type of a binary operation involving a column or frame"""
+        types = (left_type, right_type)
+        if RithmType.UNKNOWN in types:
+            return RithmType.UNKNOWN
+        if RithmType.FRAME in types:
+            return RithmType.FRAME
+        if RithmType.COLUMN in types:
+            return RithmType.COLUMN
+        return RithmType.UNKNOWN
@@ -1,14 +1,101 @@
+import logging
 from types import SimpleNamespace
-from typing import Any, List
-from rithm.expr import Expr, Literal, Binary
+from typing import Any, Dict, List, Optional, Tuple
+import pandas as pd
+from rithm.expr import (
+    Assignment,
+    Binary,
+    Call,
+    ColumnAccess,
+    Expr,
+    Grouping,
+    Identifier,
+    Join,
+    Literal,
+    SpecializedBinary,
+    Table,
+    Unary,
+    fold_operations,
+)
+from rithm.datatypes.compaction import Compactor
+from rithm.datatypes.frame import column
+from rithm.datatypes.join import JoinIndexCache
+from rithm.datatypes.versions import Frame, FrameHistory, as_pandas
+from rithm.datatypes.zones import FLIPPED, ZoneMapCache
+from rithm.functions import BUILTINS
+from rithm.functions.memo import MemoCache
 from rithm.stmt import ExpressionStmt, Stmt
+from rithm.symbol import SymbolTable
 from rithm.visitor import Visitor
+from rithm.logging import get_logger
+from rithm.render import debug_repr
 from rithm.token import TokenType as TT
 
+interpreter_logger = get_logger(__name__)
+
+ZONE_COMPARISONS = {
+    TT.LESS_THAN: "<",
+    TT.LESS_EQUAL: "<=",
+    TT.GREATER_THAN: ">",
+    TT.GREATER_EQUAL: ">=",
+    TT.EQUAL_EQUAL: "==",
+}
+
+
+def zone_filter(expr: Expr) -> Optional[Tuple[ColumnAccess, Expr, str]]:
+    """
+    The column, constant and operator (as if the column were on the left) of a
+    comparison of a column with a literal or a name, which zone maps can speed up
+    """
+    if not isinstance(expr, Binary):
+        return None
+    operator = ZONE_COMPARISONS.get(expr.operator.token_type)
+    if operator is None:
+        return None
+    if isinstance(expr.left, ColumnAccess) and isinstance(
+        expr.right, (Literal, Identifier)
+    ):
+        return expr.left, expr.right, operator
+    if isinstance(expr.right, ColumnAccess) and isinstance(
+        expr.left, (Literal, Identifier)
+    ):
+        return expr.right, expr.left, FLIPPED[operator]
+    return None
+
+
+def _is_zone_filter(expr: Expr) -> bool:
+    return zone_filter(expr) is not None
+
 
 class Interpreter(Visitor):
     def __init__(self, **namespace):
-        self.namespace = namespace
+        # Names are interned in the same SymbolTable used when scanning, so the
+        # namespace is keyed by the very same string objects that identifiers carry
+        self.symbols = SymbolTable()
+        self.namespace = {
+            self.symbols.intern(name).name: value for name, value in namespace.items()
+        }
+        # Lookup frames that are joined repeatedly reuse the index of their keys
+        self.join_indexes = JoinIndexCache()
+        # Results of calls to pure functions, by the contents of their arguments
+        self.memo = MemoCache()
+        # Set to a Compactor to compact every frame that is assigned to a name
+        self.compactor: Optional[Compactor] = None
+        # Set to a FrameHistory to keep the version of every frame that is assigned
+        self.history: Optional[FrameHistory] = None
+        # Set to a ZoneMapCache to skip the zones of rows that comparisons can't match
+        self.zone_maps: Optional[ZoneMapCache] = None
+
+    @classmethod
+    def bound(cls, namespace: Dict[str, Any], symbols: SymbolTable) -> "Interpreter":
+        """
+        An interpreter that uses `namespace` itself (rather than a copy) for its names,
+        which must already be interned in `symbols`
+        """
+        interpreter = cls()
+        interpreter.symbols = symbols
+        interpreter.namespace = namespace
+        return interpreter
 
     def __eq__(self, other) -> bool:
         if isinstance(other, type(self)):
@@ -33,17 +120,137 @@ class Interpreter(Visitor):
     def visit_literal_expr(self, expr: Literal):
         return expr.value
 
+    def visit_table_expr(self, expr: Table):
+        # Copy, so changes to the result don't change the literal
+        return expr.frame.copy()
+
+    def visit_identifier_expr(self, expr: Identifier):
+        name = expr.token.literal.name
+        try:
+            return self.namespace[name]
+        except KeyError:
+            pass
+        try:
+            return BUILTINS[name]
+        except KeyError:
+            raise NameError(f"name {name!r} is not defined") from None
+
+    def visit_columnaccess_expr(self, expr: ColumnAccess):
+        return self.column(self.evaluate(expr.frame), expr.name.literal.name)
+
+    def column(self, frame: Any, name: str):
+        if isinstance(frame, Frame):
+            return frame.column(name)
+        return column(frame, name)
+
+    def visit_call_expr(self, expr: Call):
+        function = self.evaluate(expr.callee)
+        arguments = [self.evaluate(argument) for argument in expr.arguments]
+        keywords = {name: self.evaluate(value) for name, value in expr.keywords.items()}
+        if not getattr(function, "accepts_frames", False):
+            arguments = [as_pandas(argument) for argument in arguments]
+            keywords = {name: as_pandas(value) for name, value in keywords.items()}
+        return self.memo.call(function, arguments, keywords)
+
+    def visit_join_expr(self, expr: Join):
+        left = as_pandas(self.evaluate(expr.left))
+        right = as_pandas(self.evaluate(expr.right))
+        on = None if expr.on is None else self.evaluate(expr.on)
+        return self.join_indexes.join(left, right, on=on)
+
+    def visit_assignment_expr(self, expr: Assignment):
+        value = self.evaluate(expr.value)
+        if self.compactor is not None and isinstance(value, pd.DataFrame):
+            value = self.compactor.compact(value, step=expr.name.lexeme)
+        if self.history is not None and isinstance(value, (pd.DataFrame, Frame)):
+            self.history.record(expr.name.lexeme, value)
+        self.namespace[expr.name.literal.name] = value
+        return value
+
     def visit_binary_expr(self, expr: Binary):
-        left = self.evaluate(expr.left)
-        right = self.evaluate(expr.right)
+        if self.zone_maps is not None and _is_zone_filter(expr):
+            return self.filter_zones(expr)
+        return self.fold(expr)
+
+    def visit_specializedbinary_expr(self, expr: SpecializedBinary):
+        return self.fold(expr)
+
+    def visit_unary_expr(self, expr: Unary):
+        return self.fold(expr)
 
+    def visit_grouping_expr(self, expr: Grouping):
+        return self.fold(expr)
+
+    def fold(self, expr: Expr):
+        # With zone maps, comparisons they can speed up are evaluated on their own
+        is_leaf = None if self.zone_maps is None else _is_zone_filter
+        return fold_operations(expr, self.evaluate, self.apply_operation, is_leaf)
+
+    def filter_zones(self, expr: Binary):
+        """
+        Compare a column with a constant, only comparing the rows of the zones that
+        the column's zone map can't rule in or out
+        """
+        column, constant, operator = zone_filter(expr)
+        frame = self.evaluate(column.frame)
+        value = self.evaluate(constant)
+        values = self.column(frame, column.name.literal.name)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            zone_map = self.zone_maps.zone_map(frame, column.name.literal.name)
+            if zone_map is not None:
+                return zone_map.compare(values, operator, value)
+        if expr.left is column:
+            return self.binary_operation(expr, values, value)
+        return self.binary_operation(expr, value, values)
+
+    def apply_operation(self, expr: Expr, operands: List[Any]):
+        """Apply a Binary, Unary or Grouping to its already evaluated operands"""
+        match expr:
+            case SpecializedBinary():
+                # Operand types were inferred ahead of time, so skip the operator dispatch
+                return expr.operation(*operands)
+            case Binary():
+                return self.binary_operation(expr, *operands)
+            case Unary():
+                return self.unary_operation(expr, *operands)
+            case Grouping():
+                return operands[0]
+
+    def binary_operation(self, expr: Binary, left: Any, right: Any):
         match expr.operator.token_type:
             case TT.PLUS:
                 return left + right
+            case TT.MINUS:
+                return left - right
+            case TT.STAR:
+                return left * right
+            case TT.SLASH:
+                return left / right
+            case TT.EQUAL_EQUAL:
+                return left == right
+            case TT.LESS_THAN:
+                return left < right
+            case TT.LESS_EQUAL:
+                return left <= right
+            case TT.GREATER_THAN:
+                return left > right
+            case TT.GREATER_EQUAL:
+                return left >= right
         raise Exception("Invalid binary")
 
+    def unary_operation(self, expr: Unary, value: Any):
+        match expr.operator.token_type:
+            case TT.MINUS:
+                return -value
+            case TT.BANG:
+                return not value
+        raise Exception("Invalid unary")
+
     def visit_expression_stmt(self, stmt: ExpressionStmt):
-        print(f"Interpreting expression statement: {stmt}")
+        if interpreter_logger.isEnabledFor(logging.DEBUG):
+            interpreter_logger.debug(
+                f"Interpreting expression statement: {debug_repr(stmt)}"
+            )
         return self.evaluate(stmt.expr)
 
     # def visit_assignment_stmt(self, stmt: AssignmentStmt):
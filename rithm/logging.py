@@ -1,4 +1,5 @@
 import logging
+from typing import Any, Callable
 from rich.logging import RichHandler
 
 
@@ -12,4 +13,15 @@ def get_logger(name: str):
     return logging.getLogger(name)
 
 
+def safe_repr(obj: Any, repr_fn: Callable[[Any], str] = repr) -> str:
+    """
+    A repr for logging, which doesn't fail on trees too deeply nested to repr
+    recursively
+    """
+    try:
+        return repr_fn(obj)
+    except RecursionError:
+        return f"<{type(obj).__name__} too deeply nested to display>"
+
+
 # log = logging.getLogger("Rithm")
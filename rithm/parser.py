@@ -1,36 +1,65 @@
 from dataclasses import Field, dataclass, field
 from functools import wraps
-from typing import Callable, Container, List, Sequence, Tuple, Optional, Union
-from rithm.expr import Assignment, Binary, Expr, Grouping, Identifier, Literal, Unary
+from typing import Callable, Container, Dict, List, Sequence, Tuple, Optional, Union
+from rithm.expr import (
+    Assignment,
+    Binary,
+    Call,
+    ColumnAccess,
+    Expr,
+    Grouping,
+    Identifier,
+    Join,
+    Literal,
+    Table,
+    Unary,
+)
+from rithm.datatypes.frame import read_table
 from rithm.logging import get_logger
+from rithm.render import debug_repr
 from rithm.stmt import ExpressionStmt, IfStmt, Stmt
 import logging
 from rithm.logging import get_logger
 
 from rithm.token import Token, TokenType as TT
 from rich import print
-from rich.pretty import pretty_repr
 
 WHITESPACE = (TT.SPACE, TT.TAB)
 
 parse_logger = get_logger(__name__)
+# The upcoming tokens logged on entering each parsing method
+LOGGED_TOKENS = 5
 
 
 class ParseError(Exception):
-    pass
+    def __init__(self, msg: str, token: Optional[Token] = None):
+        self.msg = msg
+        self.token = token
+        if token is not None:
+            msg = f"[line {token.line_no}, column {token.column}] {msg}"
+        super().__init__(msg)
+
+
+class ParseErrors(ParseError):
+    """All of the errors found in a single pass of the parser"""
+
+    def __init__(self, errors: List[ParseError]):
+        self.errors = errors
+        super().__init__(
+            f"{len(errors)} error(s) found while parsing:\n"
+            + "\n".join(str(error) for error in errors)
+        )
 
 
 def logged(fn):
     @wraps(fn)
     def log_fn(parser, *args, **kwargs):
-        # tokens = parser.tokens[parser.current:]
-        # tokens_str = ''.join([token.lexeme for token in tokens])
-        # token_types = [token.token_type.name for token in tokens]
-
-        indent = parser.depth * " "
-        parse_logger.debug(
-            f"{indent}{fn.__name__}"
-        )  # with tokens: {tokens_str!r} {token_types}")
+        if parse_logger.isEnabledFor(logging.DEBUG):
+            indent = parser.depth * " "
+            tokens = parser.tokens[parser.current : parser.current + LOGGED_TOKENS]
+            parse_logger.debug(
+                f"{indent}{fn.__name__} with tokens: {debug_repr(tokens)}"
+            )
 
         parser.depth += 1
         result = fn(parser, *args, **kwargs)
@@ -40,11 +69,36 @@ def logged(fn):
     return log_fn
 
 
+# Column accesses and calls, which bind the tightest of all operators
+POSTFIX = (TT.AT_SIGN, TT.PAREN_OPEN)
+# Pipes and joins, which are postfix operations too, so `x -> f == y` compares f(x)
+PIPE_TOKENS = (TT.ARROW_RIGHT, TT.JOIN, TT.ON)
+
+# Precedence of binary operators, for iterative parsing (higher binds tighter).
+# Pipes and joins bind tighter than all of them, like calls
+BINARY_PRECEDENCE = {
+    TT.EQUAL_EQUAL: 1,
+    TT.LESS_THAN: 2,
+    TT.LESS_EQUAL: 2,
+    TT.GREATER_THAN: 2,
+    TT.GREATER_EQUAL: 2,
+    TT.PLUS: 3,
+    TT.MINUS: 3,
+    TT.STAR: 4,
+    TT.SLASH: 4,
+}
+UNARY_PRECEDENCE = 5
+
+
 @dataclass
 class Parser:
     tokens: List[Token]
+    # Parse expressions with an explicit stack rather than recursive descent, so that
+    # arbitrarily deep nesting doesn't exhaust the Python stack
+    iterative: bool = False
     current: int = field(default=0, init=False)
     depth: int = field(default=0, init=False)
+    errors: List[ParseError] = field(default_factory=list, init=False)
 
     CLOSING_TOKENS = {
         TT.BRACKET_OPEN: TT.BRACKET_CLOSE,
@@ -52,6 +106,9 @@ class Parser:
         TT.BRACE_OPEN: TT.BRACE_CLOSE,
     }
 
+    # Tokens that start a new statement, so are safe places to resume after an error
+    SYNCHRONIZING_TOKENS = (TT.CLASS, TT.ALGO, TT.IF, TT.DO, TT.END, TT.EOF)
+
     @property
     def is_at_end(self) -> bool:
         # TODO: Should we check for EOF? Or just length of tokens?
@@ -77,6 +134,8 @@ class Parser:
     ) -> Token:
         # Return current token, then move cursor
         # (or, equivalently, move cursor and return previous token)
+        if self.is_at_end:
+            self.raise_error("Unexpected end of input", self.prev_token)
         if ignore is not None:
             parse_logger.debug(f"Ignoring: {ignore}")
             try:
@@ -84,7 +143,7 @@ class Parser:
                     parse_logger.debug(f"Ignored {self.current}: {self.current_token}")
                     self.current += 1
             except IndexError:
-                pass
+                self.raise_error("Unexpected end of input", self.prev_token)
         parse_logger.debug(f"Consuming {self.current}: {self.current_token}")
         self.current += 1
         if not self.is_at_end:
@@ -116,17 +175,42 @@ class Parser:
         return False
 
     def synchronize(self):
-        pass
+        """
+        Discard tokens until the start of the next statement, i.e. just after a
+        newline or at a block keyword, so parsing can resume after an error.
+        """
+        while not self.is_at_end:
+            if self.current > 0 and self.prev_token.token_type == TT.NEWLINE:
+                return
+            if self.current_token.token_type in self.SYNCHRONIZING_TOKENS:
+                return
+            self.current += 1
 
     def parse(self) -> List[Stmt]:
-        parse_logger.debug(f"Parsing tokens: {pretty_repr(self.tokens)}")
+        """
+        Parse all statements, recording (rather than raising) any ParseErrors in
+        `self.errors` so that a single pass reports every error in the input.
+        """
+        if parse_logger.isEnabledFor(logging.DEBUG):
+            # Only pay for rendering the (possibly huge) token list when it will be logged
+            parse_logger.debug(f"Parsing tokens: {debug_repr(self.tokens)}")
         # parse_logger.debug(self.tokens)
         stmts = []
         while not self.is_at_end:
+            # Skip blank lines
+            if self.match(TT.NEWLINE, TT.EOF):
+                self.consume_and_advance()
+                continue
+
+            start = self.current
             try:
                 stmts.append(self.parse_declaration())
-            except ParseError:
+            except ParseError as error:
+                self.errors.append(error)
                 self.synchronize()
+                if self.current == start:
+                    # Always make progress, so malformed input can't loop forever
+                    self.current += 1
         return stmts
 
     def parse_declaration(self) -> Stmt:
@@ -154,12 +238,13 @@ class Parser:
             if isinstance(parsed, Expr):
                 return ExpressionStmt(parsed)
             return parsed
-        raise ParseError("Statements must end in newline")
+        self.raise_error("Statements must end in newline", self.prev_token)
 
     @logged
     def parse_if_statement(self) -> IfStmt:
         # TODO: What should delimit the if statement?
-        return IfStmt()
+        if_token = self.consume_and_advance()
+        self.raise_error("If statements are not supported yet", if_token)
 
     # @logged
     # def parse_assigment_or_higher(self) -> Union[Expr, Stmt]:
@@ -171,7 +256,10 @@ class Parser:
 
     @logged
     def parse_assignment_or_higher(self) -> Expr:
-        expr = self.parse_equality_or_higher()
+        if self.iterative:
+            expr = self.parse_operations_iteratively()
+        else:
+            expr = self.parse_equality_or_higher()
 
         if self.match(TT.EQUAL):
             equals = self.consume_and_advance()
@@ -198,6 +286,32 @@ class Parser:
 
         return next_expr
 
+    def pipe_operation(self, left: Expr, operator: Token) -> Expr:
+        """
+        Parse the rest of `left -> f(args)`, `left join right`, or the `on key` clause
+        of a join, after its operator
+        """
+        match operator.token_type:
+            case TT.ARROW_RIGHT:
+                return self.parse_pipe_target(left)
+            case TT.JOIN:
+                right = self.parse_postfix_operations(self.parse_literal(), pipes=False)
+                return Join(left, right)
+            case TT.ON:
+                if not isinstance(left, Join) or left.on is not None:
+                    self.raise_error("Expected join before on", operator)
+                on = self.parse_postfix_operations(self.parse_literal(), pipes=False)
+                return Join(left.left, left.right, on=on)
+
+    def parse_pipe_target(self, value: Expr) -> Call:
+        """`value -> f(args)` calls `f(value, args)`, and `value -> f` calls `f(value)`"""
+        function = self.parse_literal()
+        arguments, keywords = [], {}
+        if self.match(TT.PAREN_OPEN):
+            self.consume_and_advance()
+            arguments, keywords = self.parse_arguments()
+        return Call(function, [value, *arguments], keywords)
+
     @logged
     def parse_equality_or_higher(self) -> Expr:
         return self._parse_binary(
@@ -246,16 +360,78 @@ class Parser:
             expr = self.parse_unary_or_higher()
             return self.log_and_parse(Unary(operator=operator, expr=expr))
 
-        # If not a unary, than it must be a literal
-        return self.parse_literal()
+        # If not a unary, than it must be a call, a column access or a literal
+        return self.parse_postfix_or_higher()
+
+    @logged
+    def parse_postfix_or_higher(self) -> Expr:
+        return self.parse_postfix_operations(self.parse_literal())
+
+    def parse_postfix_operations(self, expr: Expr, pipes: bool = True) -> Expr:
+        """
+        Parse any column accesses (`expr@name`), calls (`expr(args)`), and (unless
+        `pipes` is False) pipes and joins of expr. These all bind tighter than any
+        other operator, so `s -> upper == "A"` compares the result of the pipe.
+        """
+        operators = (*POSTFIX, *PIPE_TOKENS) if pipes else POSTFIX
+        while self.match(*operators):
+            operator = self.consume_and_advance()
+            if operator.token_type == TT.PAREN_OPEN:
+                expr = self.log_and_parse(Call(expr, *self.parse_arguments()))
+                continue
+            if operator.token_type in PIPE_TOKENS:
+                expr = self.log_and_parse(self.pipe_operation(expr, operator))
+                continue
+
+            name = self.consume_and_advance(ignore=None)
+            if name.token_type != TT.IDENTIFIER:
+                self.raise_error("Expected column name after @", name)
+            expr = self.log_and_parse(ColumnAccess(frame=expr, name=name))
+
+        return expr
+
+    def parse_arguments(self) -> Tuple[List[Expr], Dict[str, Expr]]:
+        """
+        Parse the arguments of a call, after its opening parenthesis. Arguments written
+        as `name = value` are keyword arguments, and must come after the others.
+        """
+        open_paren = self.prev_token
+        arguments = []
+        keywords = {}
+        if self.match(TT.PAREN_CLOSE):
+            self.consume_and_advance()
+            return arguments, keywords
+
+        while True:
+            argument = self.parse_expression()
+            if isinstance(argument, Assignment):
+                if argument.name.lexeme in keywords:
+                    self.raise_error(
+                        f"Keyword argument {argument.name.lexeme!r} is repeated",
+                        argument.name,
+                    )
+                keywords[argument.name.lexeme] = argument.value
+            elif keywords:
+                self.raise_error(
+                    "Positional argument follows keyword argument", self.prev_token
+                )
+            else:
+                arguments.append(argument)
+
+            if self.match(TT.COMMA):
+                self.consume_and_advance()
+            elif self.match(TT.PAREN_CLOSE):
+                self.consume_and_advance()
+                return arguments, keywords
+            else:
+                self.raise_error("Call has no closing parenthesis", open_paren)
 
     @logged
     def parse_literal(self) -> Expr:
         literal_token = self.consume_and_advance()
         match literal_token.token_type:
-            case TT.NEWLINE:
-                # Ignore empty lines
-                return None
+            case TT.NEWLINE | TT.EOF:
+                self.raise_error("Expected expression", literal_token)
             case TT.FALSE:
                 return self.log_and_parse(
                     Literal(value=False, token_type=literal_token.token_type)
@@ -281,17 +457,103 @@ class Parser:
                     )
 
                 self.raise_error(
-                    f"Opening delimiter {literal_token.token_type.value} has no closing delimiter"
+                    f"Opening delimiter {literal_token.token_type.value} has no closing delimiter",
+                    literal_token,
                 )
             case TT.IDENTIFIER:
                 return self.log_and_parse(Identifier(literal_token))
+            case TT.TABLE:
+                try:
+                    frame = read_table(literal_token.literal)
+                except ValueError as e:
+                    self.raise_error(f"Invalid table literal: {e}", literal_token)
+                return self.log_and_parse(Table(literal_token.literal, frame))
+
+        self.raise_error(f"Could not parse {literal_token.lexeme!r}", literal_token)
+
+    def parse_operations_iteratively(self) -> Expr:
+        """
+        Parse binary and unary operations, groupings, calls, column accesses and
+        pipes using operand and operator stacks (i.e. the shunting yard
+        algorithm), so this takes linear time and constant Python stack depth however
+        deeply they are nested.
+        Produces the same tree as the recursive `parse_equality_or_higher`.
+        """
+        operands: List[Expr] = []
+        # Binary or unary operator tokens, and the opening tokens of groupings
+        operators: List[Tuple[str, Token]] = []
+        # The opening tokens of the groupings still on the operator stack
+        groups: List[Token] = []
+
+        def reduce_top():
+            kind, token = operators.pop()
+            if kind == "unary":
+                operands.append(Unary(operator=token, expr=operands.pop()))
+            else:
+                right = operands.pop()
+                left = operands.pop()
+                operands.append(Binary(left=left, operator=token, right=right))
+
+        def precedence(kind: str, token: Token) -> int:
+            if kind == "unary":
+                return UNARY_PRECEDENCE
+            return BINARY_PRECEDENCE[token.token_type]
+
+        while True:
+            # Expecting an operand, possibly preceded by unary operators and openings
+            if self.match(TT.BANG, TT.MINUS):
+                operators.append(("unary", self.consume_and_advance()))
+                continue
+            if self.match(*self.CLOSING_TOKENS):
+                groups.append(self.consume_and_advance())
+                operators.append(("group", groups[-1]))
+                continue
+            operands.append(self.parse_postfix_operations(self.parse_literal()))
+
+            # Expecting a binary operator, or the end of a grouping or the expression
+            while True:
+                if self.match(*BINARY_PRECEDENCE):
+                    operator = self.consume_and_advance()
+                    while operators and operators[-1][0] != "group":
+                        # All binary operators are left associative
+                        if (
+                            precedence(*operators[-1])
+                            < BINARY_PRECEDENCE[operator.token_type]
+                        ):
+                            break
+                        reduce_top()
+                    operators.append(("binary", operator))
+                    break
+
+                if groups and self.match(self.CLOSING_TOKENS[groups[-1].token_type]):
+                    close = self.consume_and_advance()
+                    while operators[-1][0] != "group":
+                        reduce_top()
+                    operators.pop()
+                    open_token = groups.pop()
+                    grouping = Grouping(
+                        operands.pop(),
+                        open_token_type=open_token.token_type,
+                        close_token_type=close.token_type,
+                    )
+                    operands.append(self.parse_postfix_operations(grouping))
+                    continue
 
-        self.raise_error(f"Could not parse {literal_token}")
+                if groups:
+                    self.raise_error(
+                        f"Opening delimiter {groups[-1].token_type.value} has no closing delimiter",
+                        groups[-1],
+                    )
+                while operators:
+                    reduce_top()
+                return operands.pop()
 
-    def raise_error(self, msg: str):
-        parse_logger.error(msg)
-        raise ParseError(msg)
+    def raise_error(self, msg: str, token: Optional[Token] = None):
+        error = ParseError(msg, token)
+        parse_logger.error(error)
+        raise error
 
     def log_and_parse(self, expr: Expr) -> Expr:
-        parse_logger.debug(f"Parsed {expr}")
+        if parse_logger.isEnabledFor(logging.DEBUG):
+            parse_logger.debug(f"Parsed {debug_repr(expr)}")
         return expr
@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, MutableMapping, Tuple
+
+from rithm.compiled import CompiledScript, Signature
+from rithm.functions.memo import MemoCache
+from rithm.stmt import Stmt
+from rithm.symbol import SymbolTable
+
+
+@dataclass
+class PreparedScript:
+    """
+    A script that has been scanned and parsed once, and can be run repeatedly with
+    different parameters bound to names.
+
+    Parameters are bound by reference: frames, arrays and other values are put into
+    the run's namespace as they are, without being copied or converted, and results
+    are returned as the interpreter produced them.
+    """
+
+    compiled: CompiledScript
+    # The namespace the script was prepared in, which each run starts from
+    namespace: Dict[str, Any]
+
+    @property
+    def source(self) -> str:
+        return self.compiled.source
+
+    @property
+    def stmts(self) -> Tuple[Stmt, ...]:
+        return self.compiled.stmts
+
+    @property
+    def symbols(self) -> SymbolTable:
+        return self.compiled.symbols
+
+    @property
+    def specialized(self) -> Dict[Signature, List[Stmt]]:
+        return self.compiled.specialized
+
+    @property
+    def memo(self) -> MemoCache:
+        return self.compiled.memo
+
+    def __call__(self, **params: Any) -> Any:
+        return self.run(**params)
+
+    def bind(self, params: Dict[str, Any]) -> MutableMapping[str, Any]:
+        """A new namespace for a run, with the parameters bound (by reference)"""
+        return self.compiled.bind(self.namespace, params)
+
+    def specialize(
+        self, params: Dict[str, Any], namespace: MutableMapping[str, Any]
+    ) -> List[Stmt]:
+        """The statements specialized for the types of the parameters"""
+        return self.compiled.specialize(params, namespace)
+
+    def run(self, **params: Any) -> Any:
+        """Run the script with `params` bound, returning the value of its last statement"""
+        return self.compiled.run(self.namespace, **params)
@@ -0,0 +1,150 @@
+from dataclasses import dataclass, field
+import time
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from rithm.expr import Assignment
+from rithm.interpreter import Interpreter
+from rithm.prepared import PreparedScript
+from rithm.render import render
+from rithm.stmt import ExpressionStmt, Stmt
+
+SAMPLE_METHODS = ("head", "random")
+
+
+def sample_value(value: Any, rows: int, method: str = "head", seed: int = 0) -> Any:
+    """
+    A deterministic sample of at most `rows` rows of a frame or column. Random
+    samples keep the rows in their original order. Other values are returned as is.
+    """
+    if not isinstance(value, (pd.DataFrame, pd.Series)) or len(value) <= rows:
+        return value
+    if method == "head":
+        return value.head(rows)
+    if method == "random":
+        return value.sample(n=rows, random_state=seed).sort_index()
+    raise ValueError(f"Sample method must be one of {SAMPLE_METHODS}, not {method!r}")
+
+
+def count_rows(values: Dict[str, Any]) -> int:
+    """The number of rows of the largest frame or column in `values`"""
+    return max(
+        (len(v) for v in values.values() if isinstance(v, (pd.DataFrame, pd.Series))),
+        default=0,
+    )
+
+
+def assigned_names(stmts: List[Stmt]) -> List[str]:
+    """The names that the statements assign (including chained assignments)"""
+    names = []
+    for stmt in stmts:
+        expr = stmt.expr if isinstance(stmt, ExpressionStmt) else None
+        while isinstance(expr, Assignment):
+            names.append(expr.name.literal.name)
+            expr = expr.value
+    return names
+
+
+def step_name(stmt: Stmt, index: int) -> str:
+    if isinstance(stmt, ExpressionStmt) and isinstance(stmt.expr, Assignment):
+        return stmt.expr.name.lexeme
+    return f"#{index + 1}"
+
+
+@dataclass
+class StepTiming:
+    step: str
+    seconds: float
+    # Extrapolated linearly from the sample to the full number of rows
+    estimated_seconds: float
+
+
+@dataclass
+class Preview:
+    """
+    The result of running a script on a sample of its data, with per-step timings
+    extrapolated to the full data. `run()` runs the same prepared script in full.
+
+    The preview itself is detached, and assigns nothing. The full run assigns into
+    the namespace the script was prepared in, like evaluating the script would,
+    while its parameters are only bound for the run.
+    """
+
+    script: PreparedScript
+    params: Dict[str, Any] = field(repr=False)
+    result: Any
+    sample_rows: int
+    full_rows: int
+    timings: List[StepTiming] = field(default_factory=list)
+
+    @property
+    def scale(self) -> float:
+        return self.full_rows / self.sample_rows if self.sample_rows else 1.0
+
+    @property
+    def estimated_seconds(self) -> float:
+        return sum(timing.estimated_seconds for timing in self.timings)
+
+    def run(self) -> Any:
+        """Promote the preview to a run on the full data"""
+        bound = self.script.bind(self.params)
+        interpreter = Interpreter.bound(bound, self.script.symbols)
+        interpreter.memo = self.script.memo
+        stmts = self.script.specialize(self.params, bound)
+        result = interpreter.interpret(stmts)
+        for name in assigned_names(stmts):
+            self.script.namespace[name] = bound[name]
+        return result
+
+    def __str__(self) -> str:
+        lines = [
+            f"Preview on {self.sample_rows:,} of {self.full_rows:,} rows "
+            f"(estimated full run: {self.estimated_seconds:.3f}s)"
+        ]
+        for timing in self.timings:
+            lines.append(
+                f"  {timing.step}: {timing.seconds:.3f}s "
+                f"(estimated {timing.estimated_seconds:.3f}s)"
+            )
+        lines.append(render(self.result))
+        return "\n".join(lines)
+
+
+def preview(
+    script: PreparedScript,
+    params: Dict[str, Any],
+    rows: int = 1000,
+    method: str = "head",
+    seed: int = 0,
+) -> Preview:
+    """
+    Run `script` with every frame and column (in `params` or the namespace it was
+    prepared in) cut down to a deterministic sample of `rows` rows, timing each step.
+    """
+    full = script.bind(params)
+    sampled = {
+        name: sample_value(value, rows, method=method, seed=seed)
+        for name, value in full.items()
+    }
+
+    interpreter = Interpreter.bound(sampled, script.symbols)
+    result_preview = Preview(
+        script=script,
+        params=params,
+        result=None,
+        sample_rows=count_rows(sampled),
+        full_rows=count_rows(full),
+    )
+    for index, stmt in enumerate(script.specialize(params, sampled)):
+        start = time.perf_counter()
+        result_preview.result = interpreter.interpret([stmt])
+        seconds = time.perf_counter() - start
+        result_preview.timings.append(
+            StepTiming(
+                step=step_name(stmt, index),
+                seconds=seconds,
+                estimated_seconds=seconds * result_preview.scale,
+            )
+        )
+    return result_preview
@@ -0,0 +1,140 @@
+from collections import Counter
+import shutil
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from rich.pretty import pretty_repr
+
+from rithm.datatypes.versions import Frame
+from rithm.logging import safe_repr
+
+# Rows of a frame, column or array shown at once (half from the head, half from
+# the tail of a longer one), and columns of a frame
+MAX_ROWS = 20
+MAX_COLUMNS = 20
+# The items of each list, dict, etc., characters of each string, and levels of
+# nesting shown by a debug dump
+MAX_ITEMS = 50
+MAX_STRING = 200
+MAX_DEPTH = 10
+
+
+def _width(width: Optional[int]) -> int:
+    return shutil.get_terminal_size().columns if width is None else width
+
+
+def debug_repr(value: Any, width: Optional[int] = None, items: int = MAX_ITEMS) -> str:
+    """
+    A pretty repr for debug logging, of at most `items` items of each container, so
+    dumping a million tokens costs no more than dumping a screenful
+    """
+    return safe_repr(
+        value,
+        lambda value: pretty_repr(
+            value,
+            max_width=_width(width),
+            max_length=items,
+            max_string=MAX_STRING,
+            max_depth=MAX_DEPTH,
+        ),
+    )
+
+
+def _dtypes(dtypes: pd.Series) -> str:
+    counts = Counter(str(dtype) for dtype in dtypes)
+    return ", ".join(
+        dtype if count == 1 else f"{count} {dtype}" for dtype, count in counts.items()
+    )
+
+
+def render(value: Any, rows: int = MAX_ROWS, width: Optional[int] = None) -> str:
+    """
+    Format a result for display. Only the rows (and columns) that are shown are
+    formatted: the head and tail of a long frame, column or array, after a summary
+    of its shape and types. So rendering costs the same however large the result.
+    """
+    width = _width(width)
+    if value is None:
+        return ""
+    if isinstance(value, Frame):
+        value = value.to_pandas()
+
+    if isinstance(value, pd.DataFrame):
+        body = value.to_string(
+            max_rows=rows,
+            min_rows=rows,
+            max_cols=MAX_COLUMNS,
+            line_width=width,
+            show_dimensions=False,
+        )
+        if len(value) <= rows and value.shape[1] <= MAX_COLUMNS:
+            return body
+        summary = (
+            f"Frame of {len(value):,} rows x {value.shape[1]:,} columns "
+            f"({_dtypes(value.dtypes)})"
+        )
+        return f"{summary}\n{body}"
+
+    if isinstance(value, pd.Series):
+        body = value.to_string(
+            max_rows=rows, min_rows=rows, name=True, dtype=True, length=False
+        )
+        if len(value) <= rows:
+            return body
+        return f"Column of {len(value):,} rows\n{body}"
+
+    if isinstance(value, np.ndarray):
+        body = np.array2string(
+            value, threshold=rows, edgeitems=rows // 2, max_line_width=width
+        )
+        if value.size <= rows:
+            return body
+        return f"Array of shape {value.shape} ({value.dtype})\n{body}"
+
+    if isinstance(value, str):
+        limit = rows * width
+        if len(value) <= limit:
+            return value
+        return f"{value[:limit]}... ({len(value) - limit:,} more characters)"
+
+    if isinstance(value, (list, tuple, dict, set, frozenset)):
+        return debug_repr(value, width, items=rows)
+    return str(value)
+
+
+def _page(value: Any, start: int, stop: int) -> Any:
+    if isinstance(value, Frame):
+        value = value.to_pandas()
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.iloc[start:stop]
+    return value[start:stop]
+
+
+class ResultPager:
+    """
+    Pages through the rows of a long result (a frame, column, array, list or tuple)
+    after `render` has shown its head, formatting only one page at a time
+    """
+
+    PAGEABLE = (pd.DataFrame, pd.Series, Frame, np.ndarray, list, tuple)
+
+    def __init__(self, value: Any, rows: int = MAX_ROWS):
+        self.value = value
+        self.rows = rows
+        pageable = isinstance(value, self.PAGEABLE) and getattr(value, "ndim", 1) > 0
+        self.length = len(value) if pageable else 0
+        # Start after the head that `render` shows
+        self.offset = rows // 2 if self.length > rows else self.length
+
+    @property
+    def has_more(self) -> bool:
+        return self.offset < self.length
+
+    def next_page(self, width: Optional[int] = None) -> str:
+        if not self.has_more:
+            return "No more rows"
+        start, stop = self.offset, min(self.offset + self.rows, self.length)
+        self.offset = stop
+        page = render(_page(self.value, start, stop), rows=self.rows, width=width)
+        return f"Rows {start + 1:,} to {stop:,} of {self.length:,}\n{page}"
@@ -2,18 +2,29 @@ from abc import ABCMeta
 import logging
 import sys
 from types import SimpleNamespace
-from typing import Any, Dict, List, TYPE_CHECKING
-from rithm.parser import Parser
+from typing import Any, Dict, Iterable, List, Optional, TYPE_CHECKING
+from rithm.compiled import CompiledScript, compile_script
+from rithm.datatypes.compaction import Compactor
+from rithm.datatypes.store import MIN_SPILL_BYTES, ValueStore
+from rithm.datatypes.versions import FrameHistory
+from rithm.datatypes.zones import ZONE_ROWS, ZoneMapCache
+from rithm.export import export_script
+from rithm.parser import Parser, ParseErrors
+from rithm.prepared import PreparedScript
+from rithm.preview import Preview, preview
 from rithm.interpreter import Interpreter
+from rithm.inference import TypeInferrer
 from rithm.scanner import Scanner
 
 # from rich import print, pretty
-from rich.pretty import Pretty, pretty_repr
+from rich.pretty import Pretty
 from rithm.logging import get_logger
+from rithm.render import debug_repr
 
 if TYPE_CHECKING:
     from rithm.token import Token
     from rithm.stmt import Stmt
+    from rithm.symbol import SymbolTable
 
 
 rithm_logger = get_logger(__name__)
@@ -56,9 +67,12 @@ class Rithm:
         file: str = None,
         debug: bool = False,
         result: bool = False,
+        preview: Optional[int] = None,
     ):
         if input is None and file is None:
             return self.__instance
+        elif input is not None and preview is not None:
+            return self.__instance.preview(input, rows=preview)
         elif input is not None:
             return self.__instance.run_input(input, debug=debug, result=result)
         elif file is not None:
@@ -71,6 +85,8 @@ class RithmInstance:
     def __init__(self, **namespace):
         self.interpreter = Interpreter(**namespace)
         self.had_error = False
+        # Whether to parse with an explicit stack, for deeply nested expressions
+        self.iterative_parsing = False
         # self.interpreter.namespace.update(namespace)
 
     def __eq__(self, other) -> bool:
@@ -82,36 +98,158 @@ class RithmInstance:
     def namespace(self) -> Dict:
         return self.interpreter.namespace
 
+    @property
+    def symbols(self) -> "SymbolTable":
+        return self.interpreter.symbols
+
     # def exec(self, command: str):
     #     pass
 
+    def enable_compaction(self, pinned: Iterable[str] = ()) -> Compactor:
+        """
+        Compact every frame after it is assigned, leaving the `pinned` columns alone.
+        Returns the Compactor, whose `reports` record the bytes saved at each step.
+        """
+        self.interpreter.compactor = Compactor(pinned=set(pinned))
+        return self.interpreter.compactor
+
+    def disable_compaction(self):
+        self.interpreter.compactor = None
+
+    def enable_history(self) -> FrameHistory:
+        """
+        Keep a version of every frame assigned to a name, e.g. to inspect a frame as
+        it was before later steps. Versions share the columns they have in common.
+        """
+        self.interpreter.history = FrameHistory()
+        return self.interpreter.history
+
+    def disable_history(self):
+        self.interpreter.history = None
+
+    def enable_zone_maps(self, zone_rows: int = ZONE_ROWS) -> ZoneMapCache:
+        """
+        Keep the min, max, missing and distinct counts of every `zone_rows` rows of
+        numeric columns, so comparing a column with a constant (e.g. to `filter` it)
+        skips the zones that can't match. A column's zone map is built the first time
+        it's compared, and rebuilt if its values are replaced.
+        """
+        self.interpreter.zone_maps = ZoneMapCache(zone_rows)
+        if isinstance(self.interpreter.namespace, ValueStore):
+            self.interpreter.namespace.zone_maps = self.interpreter.zone_maps
+        return self.interpreter.zone_maps
+
+    def disable_zone_maps(self):
+        self.interpreter.zone_maps = None
+        if isinstance(self.interpreter.namespace, ValueStore):
+            self.interpreter.namespace.zone_maps = None
+
+    def enable_spilling(
+        self,
+        budget: int,
+        directory: Optional[str] = None,
+        min_spill_bytes: int = MIN_SPILL_BYTES,
+    ) -> ValueStore:
+        """
+        Keep the frames, columns and arrays in the namespace within `budget` bytes, by
+        spilling the least recently used to files in `directory` (a new temporary
+        directory by default). Returns the ValueStore, whose `metrics` count the
+        values and bytes spilled and restored.
+        """
+        store = ValueStore(
+            budget,
+            directory=directory,
+            min_spill_bytes=min_spill_bytes,
+            zone_maps=self.interpreter.zone_maps,
+        )
+        store.update(self.interpreter.namespace)
+        self.interpreter.namespace = store
+        return store
+
+    def disable_spilling(self):
+        """Load every spilled value back into memory, and remove the spill files"""
+        store = self.interpreter.namespace
+        self.interpreter.namespace = dict(store)
+        if isinstance(store, ValueStore):
+            store.close()
+
     def scan(self, source: str) -> List["Token"]:
-        scanner = Scanner(source)
+        scanner = Scanner(source, symbols=self.symbols)
         return scanner.scan_tokens()
 
     def parse(self, tokens: List["Token"]) -> List["Stmt"]:
-        parser = Parser(tokens)
-        return parser.parse()
+        parser = Parser(tokens, iterative=self.iterative_parsing)
+        stmts = parser.parse()
+        if parser.errors:
+            raise ParseErrors(parser.errors)
+        return stmts
+
+    def infer(self, stmts: List["Stmt"]) -> List["Stmt"]:
+        inferrer = TypeInferrer(self.namespace)
+        return inferrer.infer(stmts)
 
     def interpret(self, stmts: List["Stmt"]):
         return self.interpreter.interpret(stmts)
 
     def evaluate(self, input: str):
         tokens = self.scan(input)
-        stmts = self.parse(tokens)
+        stmts = self.infer(self.parse(tokens))
         return self.interpreter.interpret(stmts)
 
+    def prepare(self, input: str) -> PreparedScript:
+        """
+        Scan and parse `input` once, into a script that can be run many times with
+        different parameters, e.g. `prepare("df@fare * rate")(df=df, rate=1.2)`.
+        Each run reads this namespace through an overlay that takes the run's
+        assignments, so runs don't see each other's assignments.
+        """
+        return PreparedScript(self.compile(input), namespace=self.namespace)
+
+    def compile(self, input: str) -> CompiledScript:
+        """
+        Scan and parse `input` into an immutable script, which any number of threads
+        (or sessions sharing this one's symbols) can run at once, each with its own
+        namespace, e.g. `compile("df@fare * rate").run({"rate": 1.2}, df=df)`
+        """
+        return compile_script(
+            input, symbols=self.symbols, iterative=self.iterative_parsing
+        )
+
+    def export(self, input: str) -> str:
+        """
+        The source of a Python module of straight-line pandas code equivalent to the
+        script `input`, with a function per step. See `rithm.export`.
+        """
+        return export_script(self.compile(input))
+
+    def preview(
+        self,
+        input: str,
+        rows: int = 1000,
+        method: str = "head",
+        seed: int = 0,
+        **params: Any,
+    ) -> Preview:
+        """
+        Run `input` on a deterministic sample (the head, or a seeded random sample)
+        of `rows` rows of every frame, reporting per-step timings extrapolated to the
+        full data. Call `run()` on the result to run the same script in full.
+        """
+        return preview(self.prepare(input), params, rows=rows, method=method, seed=seed)
+
     def run_input(self, input: str, debug: bool = False, result: bool = False):
         try:
             tokens = self.scan(input)
+            # Dumps are truncated, so they cost the same however long the input
+            debug = debug and rithm_logger.isEnabledFor(logging.DEBUG)
             if debug:
                 rithm_logger.debug(f"TOKENS for {input!r}:")
-                rithm_logger.debug(pretty_repr(tokens))
-            stmts = self.parse(tokens)
+                rithm_logger.debug(debug_repr(tokens))
+            stmts = self.infer(self.parse(tokens))
 
             if debug:
                 rithm_logger.debug(f"STATEMENTS for {input!r}")
-                rithm_logger.debug(pretty_repr(stmts))
+                rithm_logger.debug(debug_repr(stmts))
 
             res = self.interpret(stmts)
             if result:
@@ -1,6 +1,7 @@
 from typing import Any, List, Optional
 import re
 from rithm.parser import ParseError
+from rithm.symbol import SymbolTable
 from rithm.token import Token, TokenType as TT
 
 # from __future__ import annotations
@@ -21,8 +22,9 @@ class UnmatchedQuoteException(UnmatchedTokenException):
 
 
 class Scanner:
-    def __init__(self, source: str):
+    def __init__(self, source: str, symbols: Optional[SymbolTable] = None):
         self.source = source
+        self.symbols = symbols if symbols is not None else SymbolTable()
         self.current = 0
         self.start = 0
         self.line = 1
@@ -139,7 +141,7 @@ class Scanner:
                     self.add_token(TT.GREATER_THAN)
             case "<":
                 if self.match("="):
-                    char += self.advance_and_get_char
+                    char += self.advance_and_get_char()
                     self.add_token(TT.LESS_EQUAL)
                 elif self.match("-"):
                     char += self.advance_and_get_char()
@@ -201,12 +203,12 @@ class Scanner:
             return re.match(expected, self.peek())
         return self.peek() == expected
 
-    def add_token(self, token_type: TT, literal: Any = None):
+    def add_token(self, token_type: TT, literal: Any = None, lexeme: str = None):
         """Add token at current location"""
         self.tokens.append(
             Token(
                 token_type=token_type,
-                lexeme=self.current_lexeme,
+                lexeme=self.current_lexeme if lexeme is None else lexeme,
                 literal=literal,
                 line_no=self.line,
                 column=self.column - len(self.current_lexeme),
@@ -223,7 +225,8 @@ class Scanner:
         except IndexError:
             self.raise_exception(UnmatchedQuoteException("No closing quote found"))
 
-        self.add_token(TT.STRING, literal=self.current_lexeme)
+        # The literal value doesn't include the quotes
+        self.add_token(TT.STRING, literal=self.current_lexeme[1:-1])
 
     def add_number(self):
         is_decimal = False
@@ -263,6 +266,22 @@ class Scanner:
         match self.current_lexeme:
             case "class":
                 self.add_token(TT.CLASS)
+            case "algo":
+                self.add_token(TT.ALGO)
+            case "if":
+                self.add_token(TT.IF)
+            case "as":
+                self.add_token(TT.AS)
+            case "do":
+                self.add_token(TT.DO)
+            case "end":
+                self.add_token(TT.END)
+            case "table":
+                self.add_table()
+            case "join":
+                self.add_token(TT.JOIN)
+            case "on":
+                self.add_token(TT.ON)
             case "and":
                 self.add_token(TT.AND)
             case "or":
@@ -272,7 +291,49 @@ class Scanner:
             case "False":
                 self.add_token(TT.FALSE)
             case _:
-                self.add_token(TT.IDENTIFIER)
+                # Intern the name, so repeated identifiers (and column names, which
+                # are identifiers following an @) share one Symbol and one string
+                symbol = self.symbols.intern(self.current_lexeme)
+                self.add_token(TT.IDENTIFIER, literal=symbol, lexeme=symbol.name)
+
+    def add_table(self):
+        """
+        Scan a whole table literal as a single token, whose literal is the block of
+        delimited rows between the `table` line and the closing `end` line, so the
+        parser can read the cells straight into columns rather than token by token.
+        """
+        line_end = self.source.find("\n", self.current)
+        if line_end == -1 or self.source[self.current : line_end].strip():
+            self.raise_exception(
+                ScanningException("Table rows must start on the line after `table`")
+            )
+
+        body_start = line_end + 1
+        line_start = body_start
+        while line_start < len(self.source):
+            line_end = self.source.find("\n", line_start)
+            if line_end == -1:
+                line_end = len(self.source)
+            if self.source[line_start:line_end].strip() == "end":
+                break
+            line_start = line_end + 1
+        else:
+            self.raise_exception(
+                ScanningException("Table literal has no closing `end`")
+            )
+
+        self.current = self.source.index("end", line_start) + len("end")
+        self.tokens.append(
+            Token(
+                token_type=TT.TABLE,
+                lexeme=self.current_lexeme,
+                literal=self.source[body_start:line_start],
+                line_no=self.line,
+                column=self.column - len("table"),
+            )
+        )
+        self.line += self.current_lexeme.count("\n")
+        self.column = self.current - line_start + 1
 
     # def add_colname(self):
     #     try:
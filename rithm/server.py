@@ -0,0 +1,105 @@
+import json
+import os
+import socketserver
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from rithm.client import DEFAULT_SOCKET_PATH, is_server_running
+from rithm.logging import get_logger
+from rithm.render import render
+from rithm.rithm import Rithm
+
+server_logger = get_logger(__name__)
+
+
+@dataclass
+class Session:
+    """
+    A Rithm, which stays warm between requests. By default each connection has a
+    session of its own. A named session is shared by every client that names it,
+    whose requests are evaluated one at a time, in the order they arrive.
+    """
+
+    rithm: Rithm = field(default_factory=Rithm)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def evaluate(self, input: str, debug: bool = False) -> Any:
+        with self.lock:
+            return self.rithm(input=input, debug=debug, result=True)
+
+
+class RithmRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handles newline-delimited JSON requests of the form
+    `{"session": <name or null>, "input": <source>, "debug": <bool>}`, replying to
+    each with either `{"result": <str or null>}` or
+    `{"error": <message>, "type": <exception name>}`. Requests without a session
+    name are evaluated in the connection's own session.
+    """
+
+    def handle(self):
+        private: Optional[Session] = None
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                name = request.get("session")
+                if name is not None:
+                    session = self.server.session(name)
+                else:
+                    if private is None:
+                        private = Session()
+                    session = private
+                result = session.evaluate(
+                    request["input"], debug=request.get("debug", False)
+                )
+                response = {"result": None if result is None else render(result)}
+            except Exception as e:
+                response = {"error": str(e), "type": type(e).__name__}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class RithmServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    A long-lived local process that keeps rithm (and the libraries it imports) and
+    Rithm sessions (and everything in their namespaces, like loaded frames) warm,
+    and evaluates requests over a Unix socket. Each client gets an isolated session
+    by default; clients share a session only by naming it.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH):
+        if os.path.exists(socket_path):
+            if is_server_running(socket_path):
+                raise OSError(f"A rithm server is already running at {socket_path}")
+            # Left behind by a server that didn't shut down cleanly
+            os.unlink(socket_path)
+
+        self.socket_path = socket_path
+        self.sessions: Dict[str, Session] = {}
+        self.sessions_lock = threading.Lock()
+        super().__init__(socket_path, RithmRequestHandler)
+
+    def session(self, name: str) -> Session:
+        """The session called `name`, shared by every client that names it"""
+        with self.sessions_lock:
+            if name not in self.sessions:
+                server_logger.info(f"Starting session {name!r}")
+                self.sessions[name] = Session()
+            return self.sessions[name]
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def serve(socket_path: str = DEFAULT_SOCKET_PATH):
+    with RithmServer(socket_path) as server:
+        server_logger.info(f"Rithm server listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
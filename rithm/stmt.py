@@ -5,38 +5,39 @@ from rithm.visitor import Visitor
 
 
 class Stmt:
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        cls.visit_method_name = f"visit_{cls.__name__.replace('Stmt', '_stmt').lower()}"
+
     def accept(self, visitor: Visitor):
-        method_name = (
-            f"visit_{self.__class__.__name__.replace('Stmt', '_stmt').lower()}"
-        )
-        method = getattr(visitor, method_name)
-        return method(self)
+        return getattr(visitor, self.visit_method_name)(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class BlockStmt(Stmt):
     statements: List[Stmt] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class AlgoStmt(Stmt):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class IfStmt(Stmt):
     test: Expr
     if_true: Stmt
     if_false: Stmt
 
 
-@dataclass
+@dataclass(slots=True)
 class ArrowStmt(Stmt):
     left: Expr
     right: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class ExpressionStmt(Stmt):
     expr: Expr
 
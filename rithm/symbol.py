@@ -0,0 +1,62 @@
+import sys
+import threading
+from typing import Dict, Iterator, List
+
+
+class Symbol:
+    """
+    A unique, interned name (of a variable, function, column, etc.)
+
+    There is only ever one Symbol per name in a SymbolTable, so symbols are compared
+    and hashed by identity, and `name` is an interned string, so dict lookups by name
+    also short-circuit on identity.
+    """
+
+    __slots__ = ("name", "id")
+
+    def __init__(self, name: str, id: int):
+        self.name = name
+        self.id = id
+
+    def __repr__(self) -> str:
+        return f"Symbol({self.name!r})"
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class SymbolTable:
+    """
+    Interns identifier and column name lexemes into unique Symbols
+
+    A table can be shared by scanners and interpreters in many threads. Looking up a
+    name that is already interned takes no lock; only interning a new name does, so
+    that two threads can't create different Symbols (or ids) for it.
+    """
+
+    def __init__(self):
+        self.symbols: Dict[str, Symbol] = {}
+        self.by_id: List[Symbol] = []
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __iter__(self) -> Iterator[Symbol]:
+        return iter(self.by_id)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.symbols
+
+    def intern(self, name: str) -> Symbol:
+        symbol = self.symbols.get(name)
+        if symbol is not None:
+            return symbol
+        with self.lock:
+            symbol = self.symbols.get(name)
+            if symbol is None:
+                symbol = Symbol(sys.intern(name), len(self.by_id))
+                self.by_id.append(symbol)
+                # Published last, so a symbol found without the lock is complete
+                self.symbols[symbol.name] = symbol
+            return symbol
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import pytest
+from rithm.functions.aggregate import AggregationSpec, aggregate, aggregate_chunks
+from rithm.rithm import Rithm
+
+trips = pd.DataFrame(
+    {
+        "key": ["b", "a", "c", "a", "b", None, "a"],
+        "fare": [1.0, 2.0, np.nan, 4.0, 5.0, 6.0, 7.0],
+        "tip": [0, 1, 2, 3, 4, 5, 6],
+    }
+)
+
+
+def expected(frame: pd.DataFrame) -> pd.DataFrame:
+    return (
+        frame.groupby("key")
+        .agg(
+            fare=("fare", "sum"),
+            mean_fare=("fare", "mean"),
+            n=("fare", "count"),
+            low=("tip", "min"),
+            high=("tip", "max"),
+        )
+        .reset_index()
+    )
+
+
+def aggregate_trips(frame: pd.DataFrame) -> pd.DataFrame:
+    return aggregate(
+        frame,
+        "key",
+        fare="sum",
+        mean_fare="mean:fare",
+        n="count:fare",
+        low="min:tip",
+        high="max:tip",
+    )
+
+
+@pytest.mark.parametrize("presorted", [False, True], ids=["hash", "sorted"])
+def test_aggregate(presorted):
+    frame = trips.sort_values("key") if presorted else trips
+    pd.testing.assert_frame_equal(
+        aggregate_trips(frame), expected(frame), check_dtype=False
+    )
+
+
+def test_aggregate_chunks():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(
+        {
+            "key": rng.integers(0, 50, 1000),
+            "fare": rng.random(1000),
+            "tip": rng.integers(0, 10, 1000),
+        }
+    )
+    chunks = [frame.iloc[start : start + 128] for start in range(0, 1000, 128)]
+    result = aggregate_chunks(
+        chunks,
+        "key",
+        fare="sum",
+        mean_fare="mean:fare",
+        n="count:fare",
+        low="min:tip",
+        high="max:tip",
+    )
+    pd.testing.assert_frame_equal(result, expected(frame), check_dtype=False)
+
+
+def test_unknown_aggregation():
+    with pytest.raises(ValueError, match="Unknown aggregation 'median'"):
+        AggregationSpec.parse("fare", "median")
+
+
+def test_aggregate_in_pipes():
+    rtm = Rithm(trips=trips)
+    result = rtm().evaluate('trips -> aggregate("key", fare = "sum", n = "count:tip")')
+    assert result["key"].tolist() == ["a", "b", "c"]
+    assert result["fare"].tolist() == [13.0, 6.0, 0.0]
+    assert result["n"].tolist() == [3, 2, 1]
+
+
+@pytest.mark.parametrize("presorted", [False, True], ids=["hash", "sorted"])
+def test_aggregate_keeps_types(presorted):
+    big = 2**53 + 1
+    frame = pd.DataFrame(
+        {
+            "key": ["b", "a", "b", "a"],
+            "n": np.array([big, 1, big, 2], dtype=np.int64),
+            "name": ["x", "z", None, "y"],
+        }
+    )
+    frame = frame.sort_values("key") if presorted else frame
+    result = aggregate(
+        frame, "key", total="sum:n", mean_n="mean:n", low="min:name", high="max:name"
+    )
+    # Integer sums are exact beyond 2**53, and only means are floats
+    assert result["total"].dtype == np.int64
+    assert result["total"].tolist() == [3, 2 * big]
+    assert result["mean_n"].tolist() == [1.5, float(big)]
+    # Strings have minimums and maximums, ignoring missing values
+    assert result["low"].tolist() == ["y", "x"]
+    assert result["high"].tolist() == ["z", "x"]
+
+
+def test_aggregate_merges_integer_sums_exactly():
+    big = 2**53 + 1
+    chunks = [pd.DataFrame({"key": [1, 2], "n": [big, 1]})] * 3
+    result = aggregate_chunks(chunks, "key", n="sum", c="count:n")
+    assert result["n"].tolist() == [3 * big, 3]
+    assert result["c"].tolist() == [3, 3]
+
+
+def test_aggregate_no_chunks():
+    result = aggregate_chunks([], "key", fare="sum", n="count:fare")
+    assert list(result.columns) == ["key", "fare", "n"]
+    assert len(result) == 0
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+from rithm.rithm import Rithm
+
+df = pd.DataFrame(
+    {
+        "small_int": np.arange(100, dtype=np.int64),
+        "exact_float": np.arange(100, dtype=np.float64) / 2,
+        "precise_float": np.arange(100, dtype=np.float64) / 3,
+        "port": ["Southampton", "Cherbourg"] * 50,
+        "pinned_port": ["Southampton", "Cherbourg"] * 50,
+    }
+)
+
+
+def test_compaction():
+    rtm = Rithm(df=df)
+    compactor = rtm().enable_compaction(pinned=["pinned_port"])
+    rtm("clean = df")
+
+    assert rtm.clean.dtypes.map(str).to_dict() == {
+        "small_int": "int64",
+        "exact_float": "float64",
+        "precise_float": "float64",
+        "port": "category",
+        "pinned_port": str(df["pinned_port"].dtype),
+    }
+    pd.testing.assert_frame_equal(
+        rtm.clean, df, check_dtype=False, check_categorical=False
+    )
+
+    [report] = compactor.reports
+    assert report.step == "clean"
+    assert [column.column for column in report.columns] == ["port"]
+    assert report.bytes_saved == sum(column.bytes_saved for column in report.columns)
+    assert report.bytes_saved > 0
+
+    rtm().disable_compaction()
+    rtm("raw = df")
+    assert rtm.raw is df
+
+
+def test_arithmetic_on_compacted_frames():
+    rtm = Rithm(df=df)
+    rtm().enable_compaction()
+    rtm("clean = df")
+    assert rtm().evaluate("clean@small_int * 100").tolist()[-3:] == [9700, 9800, 9900]
+    assert rtm().evaluate("clean@precise_float * 3").equals(df["precise_float"] * 3)
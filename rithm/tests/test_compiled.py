@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from rithm.compiled import compile_script
+from rithm.rithm import Rithm
+from rithm.symbol import SymbolTable
+
+THREADS = 8
+RUNS = 40
+
+
+@pytest.fixture
+def fast_switching():
+    # Switch threads often, so runs interleave mid statement
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_threads_share_a_compiled_script(fast_switching):
+    script = Rithm()().compile(
+        "scaled = df@fare * rate\nsums = rolling_sum(scaled, 2, min_periods=1)\nsums"
+    )
+
+    def run(thread):
+        results = []
+        for i in range(RUNS):
+            fares = np.arange(thread * 100 + i, thread * 100 + i + 50, dtype=float)
+            result = script.run(
+                {"rate": 2.0}, df=pd.DataFrame({"fare": fares}), rate=thread + 1.0
+            )
+            expected = pd.Series(fares * (thread + 1)).rolling(2, min_periods=1).sum()
+            results.append(np.allclose(result.to_numpy(), expected.to_numpy()))
+        return results
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        results = [ok for oks in pool.map(run, range(THREADS)) for ok in oks]
+
+    assert results == [True] * THREADS * RUNS
+    # Every run had the same parameter types, so inference ran (at most) per thread
+    assert len(script.specialized) == 1
+    # The compiled script itself is never changed by a run
+    assert script.stmts == compile_script(script.source, script.symbols).stmts
+
+
+def test_interning_across_threads(fast_switching):
+    symbols = SymbolTable()
+    names = [f"name{i}" for i in range(500)]
+
+    def intern_all(thread):
+        order = names if thread % 2 else names[::-1]
+        return [symbols.intern(name) for name in order]
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        interned = list(pool.map(intern_all, range(THREADS)))
+
+    # One Symbol per name, whichever thread interned it first
+    assert len(symbols) == len(names)
+    for thread, thread_symbols in enumerate(interned):
+        order = names if thread % 2 else names[::-1]
+        assert [symbol.name for symbol in thread_symbols] == order
+        assert all(symbols.intern(s.name) is s for s in thread_symbols)
+    assert [symbol.id for symbol in symbols] == list(range(len(names)))
+
+
+def test_compiled_scripts_share_symbols():
+    symbols = SymbolTable()
+    first = compile_script("df@fare", symbols=symbols)
+    second = compile_script("df@fare * 2", symbols=symbols)
+    assert first.symbols is second.symbols
+    assert len(symbols) == 2
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+from rithm.datatypes.versions import Frame
+from rithm.export import export_module, export_script
+from rithm.rithm import Rithm
+
+TRIPS = pd.DataFrame(
+    {
+        "zone": ["a", "b", "a", "c", "b", "a"],
+        "fare": [5.0, 6.5, 7.0, np.nan, 3.0, 9.5],
+        "distance": [1, 3, 2, 4, 1, 5],
+    }
+)
+ZONES = pd.DataFrame({"zone": ["a", "b", "c"], "borough": ["Queens", "Bronx", "Kings"]})
+
+SCRIPTS = [
+    "1 + 2 * 3 - 4 / 8",
+    "(1 - 2) - (3 - 4) == -2 * -(1 + 1) < 5",
+    "!(1 < 2) == (3 - (4 - 5) > 2)",
+    '"a" + "b" == "ab"',
+    "fare = trips@fare * rate\nfare - fare / 2 >= 3",
+    "rolling_mean(trips@fare, 2, by=trips@zone, min_periods=1)",
+    "lag(upper(trips@zone), 1)",
+    "trips@fare -> rolling_sum(2, min_periods = 1)",
+    'aggregate(trips, "zone", fare = "sum", n = "count:fare")',
+    'renamed = rename(trips, fare = "price")\nrenamed join zones on "zone"',
+    'with_column(trips, "double", trips@fare * 2)@double',
+    "trips join zones",
+    "upper = 1\nupper + 1",
+    "df = table\n    name, fare\n    a, 1.5\n    b, ?\nend\ndf@fare + 1",
+    " + ".join(["trips@distance"] * 500),
+    'r = rename(trips, fare = "price")\nfilter((r), r@price > 5)',
+    "x = 1\nx + (x = 2)",
+    "x = 1\ny = x + (x = 2) * x\ny + x",
+]
+
+
+def assert_equivalent(source: str, **params):
+    """The exported module gives the same result as interpreting the script"""
+    instance = Rithm(**params)()
+    expected = instance.prepare(source)()
+    assert expected is not None
+    actual = export_module(instance.compile(source), "exported").run(**params)
+
+    if isinstance(expected, Frame):
+        expected, actual = expected.to_pandas(), actual.to_pandas()
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(actual, expected)
+    elif isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(actual, expected)
+    else:
+        assert actual == expected
+
+
+@pytest.mark.parametrize("source", SCRIPTS)
+def test_export_matches_interpreter(source):
+    assert_equivalent(source, trips=TRIPS, zones=ZONES, rate=1.5)
+
+
+def test_run_until_step(tmp_path):
+    source = "fare = trips@fare * 2\nfare = fare + 1\nfare * 10\nfare"
+    module = export_module(source, "steps", path=tmp_path / "steps.py")
+    assert (tmp_path / "steps.py").read_text() == export_script(source)
+
+    assert [name for name, _ in module.STEPS] == ["fare", "fare", "#3", "#4"]
+    assert module.run_until(1, trips=TRIPS).equals(TRIPS["fare"] * 2)
+    assert module.run_until("fare", trips=TRIPS).equals(TRIPS["fare"] * 2)
+    assert module.run_until("fare#2", trips=TRIPS).equals(TRIPS["fare"] * 2 + 1)
+    assert module.run_until("#3", trips=TRIPS).equals((TRIPS["fare"] * 2 + 1) * 10)
+    assert module.run(trips=TRIPS).equals(TRIPS["fare"] * 2 + 1)
+    with pytest.raises(KeyError):
+        module.run_until("fare#3", trips=TRIPS)
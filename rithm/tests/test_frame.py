@@ -0,0 +1,19 @@
+import pandas as pd
+import pytest
+from rithm.datatypes.frame import column
+
+
+def test_column():
+    df = pd.DataFrame({"a": [1, 2], "b": [3, 4]})
+    assert column(df, "b").tolist() == [3, 4]
+
+    # Always the frame's current column, even after it's replaced in place
+    df["b"] = [5, 6]
+    assert column(df, "b").tolist() == [5, 6]
+
+    # The first of duplicated columns
+    duplicated = pd.DataFrame([[1, 2]], columns=["a", "a"])
+    assert column(duplicated, "a").tolist() == [1]
+
+    with pytest.raises(KeyError, match="no column 'c'"):
+        column(df, "c")
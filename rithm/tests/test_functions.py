@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+from rithm.functions import strings
+from rithm.rithm import Rithm
+
+names = pd.Series(
+    ["Braund, Mr. Owen", "Heikkinen, Miss. Laina", "Nobody", None], name="name"
+)
+
+
+@pytest.fixture(params=["arrow", "pandas"])
+def kernels(request, monkeypatch):
+    if request.param == "arrow":
+        pytest.importorskip("pyarrow")
+        # Use small chunks, so the chunks are processed in parallel
+        monkeypatch.setattr(strings, "CHUNK_SIZE", 2)
+    else:
+        monkeypatch.setattr(strings, "pc", None)
+    return strings
+
+
+def test_split_to_columns(kernels):
+    parts = kernels.split(names, ", ")
+    assert parts.index.equals(names.index)
+
+    columns = kernels.to_columns(parts, "last_name", "first_name")
+    assert list(columns.columns) == ["last_name", "first_name"]
+    assert columns["last_name"].tolist()[:3] == ["Braund", "Heikkinen", "Nobody"]
+    assert columns["first_name"].tolist()[:2] == ["Mr. Owen", "Miss. Laina"]
+    assert columns.iloc[2:].isna().values.tolist() == [[False, True], [True, True]]
+
+
+def test_to_camel_case(kernels):
+    columns = pd.Index(["passenger_class", "num siblings-spouses", "Fare"])
+    assert kernels.to_camel_case(columns).tolist() == [
+        "passengerClass",
+        "numSiblingsSpouses",
+        "fare",
+    ]
+    assert kernels.upper(pd.Series([" a "])).tolist() == [" A "]
+    assert kernels.strip(kernels.lower(pd.Series([" A "]))).tolist() == ["a"]
+
+
+def test_string_functions_in_pipes():
+    rtm = Rithm(titanic=pd.DataFrame({"name": names}))
+    columns = rtm().evaluate(
+        'titanic@name -> split(", ") -> to_columns("last_name", "first_name")'
+    )
+    assert columns["last_name"].tolist()[:2] == ["Braund", "Heikkinen"]
+
+    # Pipes bind tighter than comparisons
+    matches = rtm().evaluate('titanic@name -> upper == "BRAUND, MR. OWEN"')
+    assert matches.tolist()[:2] == [True, False]
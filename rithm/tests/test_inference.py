@@ -0,0 +1,37 @@
+import pandas as pd
+from rithm.expr import Binary, SpecializedBinary
+from rithm.inference import RithmType, TypeInferrer
+from rithm.rithm import Rithm
+
+
+def infer(source: str, **namespace):
+    rtm = Rithm(**namespace)
+    inferrer = TypeInferrer(rtm().namespace)
+    stmts = inferrer.infer(rtm().parse(rtm().scan(source)))
+    return stmts, inferrer
+
+
+def test_infer_scalar_types():
+    stmts, inferrer = infer('x = 1 + 2\ny = x * 2.5\nz = (x + 1) / 2\ns = "a" + "b"')
+
+    assert all(isinstance(stmt.expr.value, SpecializedBinary) for stmt in stmts)
+    assert inferrer.types == {
+        "x": RithmType.INTEGER,
+        "y": RithmType.FLOAT,
+        "z": RithmType.FLOAT,
+        "s": RithmType.STRING,
+    }
+
+
+def test_infer_falls_back_to_generic_binary():
+    stmts, inferrer = infer("a = df + 1\nb = unknown + 1", df=pd.DataFrame({"x": [1]}))
+
+    assert type(stmts[0].expr.value) is Binary
+    assert type(stmts[1].expr.value) is Binary
+    assert inferrer.types == {"a": RithmType.FRAME, "b": RithmType.UNKNOWN}
+
+
+def test_specialized_evaluation():
+    rtm = Rithm(n=10)
+    assert rtm().evaluate("(n - 4) * 2 / 3 > 3") is True
+    assert rtm().evaluate("-(n + 0.5)") == -10.5
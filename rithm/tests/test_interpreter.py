@@ -1,3 +1,5 @@
+import pytest
+import pandas as pd
 from rithm.rithm import Rithm
 
 rtm = Rithm()
@@ -15,3 +17,106 @@ def test_basic_interpret():
     rtm("x = 3 + 4")
     assert rtm.x == 7
     assert rtm["x"] == 7
+
+
+def test_identifiers():
+    rtm_with_namespace = Rithm(a=2)
+    rtm_with_namespace("b = a + 3")
+    assert rtm_with_namespace.b == 5
+    assert rtm_with_namespace().evaluate("a + b") == 7
+
+    with pytest.raises(NameError):
+        rtm_with_namespace().evaluate("c + 1")
+
+
+def test_column_access():
+    rtm_with_frame = Rithm(df=pd.DataFrame({"a": [1, 2], "b": [3, 4]}))
+    assert rtm_with_frame().evaluate("df@b + 1").tolist() == [4, 5]
+    assert rtm_with_frame().evaluate("df @a * df@b").tolist() == [3, 8]
+
+    with pytest.raises(KeyError):
+        rtm_with_frame().evaluate("df@c")
+
+
+def test_table_literal():
+    rtm_with_table = Rithm()
+    rtm_with_table(
+        """
+df = table
+    name, age, fare
+    "Braund, Mr. Owen", 22, 7.25
+    "Heikkinen, Miss. Laina", ?, 7.925
+end
+"""
+    )
+    df = rtm_with_table.df
+    assert list(df.columns) == ["name", "age", "fare"]
+    assert df["name"].tolist() == ["Braund, Mr. Owen", "Heikkinen, Miss. Laina"]
+    assert df["age"].isna().tolist() == [False, True]
+    assert str(df["fare"].dtype) == "float64"
+
+    # Each evaluation gives a new frame
+    assert rtm_with_table().evaluate("df@fare + 1").tolist() == [8.25, 8.925]
+
+
+def test_prepared_script():
+    rtm_with_rate = Rithm(rate=2)
+    script = rtm_with_rate().prepare("scaled = df@fare * rate\nscaled")
+
+    frames = [pd.DataFrame({"fare": [1.0, 2.0]}), pd.DataFrame({"fare": [3.0]})]
+    assert [script(df=df).tolist() for df in frames] == [[2.0, 4.0], [6.0]]
+    assert script(df=frames[0], rate=0.5).tolist() == [0.5, 1.0]
+
+    # Runs don't leak into the namespace
+    assert "scaled" not in rtm_with_rate().namespace
+
+    # Statements are specialized once per signature of parameter types
+    assert len(script.specialized) == 2
+
+    # Parameters are bound, and results returned, by reference
+    assert rtm_with_rate().prepare("df")(df=frames[0]) is frames[0]
+
+
+def test_preview():
+    titanic = pd.DataFrame({"fare": [float(i) for i in range(10000)]})
+    rtm_with_titanic = Rithm(titanic=titanic)
+
+    preview = rtm_with_titanic("fares = titanic@fare * 2\nfares + 1", preview=100)
+    assert preview.result.tolist() == [i * 2 + 1.0 for i in range(100)]
+    assert (preview.sample_rows, preview.full_rows, preview.scale) == (100, 10000, 100)
+    assert [timing.step for timing in preview.timings] == ["fares", "#2"]
+    assert preview.timings[0].estimated_seconds == preview.timings[0].seconds * 100
+    assert "Preview on 100 of 10,000 rows" in str(preview)
+
+    # Previews don't assign into the namespace
+    assert "fares" not in rtm_with_titanic().namespace
+    # But the full run does, as evaluating the script would
+    assert len(preview.run()) == 10000
+    assert rtm_with_titanic.fares.tolist() == [i * 2.0 for i in range(10000)]
+
+    # Parameters are only bound for the run
+    with_rate = rtm_with_titanic().preview("total = rate * 2", rows=5, rate=3)
+    assert with_rate.run() == 6
+    assert rtm_with_titanic.total == 6
+    assert "rate" not in rtm_with_titanic().namespace
+
+    random_preview = rtm_with_titanic().preview("titanic", rows=5, method="random")
+    assert random_preview.result.index.is_monotonic_increasing
+    assert random_preview.result.equals(
+        rtm_with_titanic().preview("titanic", rows=5, method="random").result
+    )
+
+
+def test_join():
+    trips = pd.DataFrame({"zone": [2, 1, 2, 3], "fare": [5.0, 6.0, 7.0, 8.0]})
+    zones = pd.DataFrame({"zone": [1, 2], "borough": ["Bronx", "Queens"]})
+    rtm_with_zones = Rithm(trips=trips, zones=zones)
+    instance = rtm_with_zones()
+
+    joined = instance.evaluate('trips join zones on "zone"')
+    assert joined["borough"].tolist() == ["Queens", "Bronx", "Queens"]
+    assert joined["fare"].tolist() == [5.0, 6.0, 7.0]
+
+    # Joining the same lookup frame again reuses its index
+    instance.evaluate("trips join zones")
+    assert instance.interpreter.join_indexes.builds == 1
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+from rithm.datatypes.join import JoinIndexCache, choose_strategy, join
+
+rng = np.random.default_rng(0)
+left = pd.DataFrame({"key": rng.integers(0, 30, 200), "a": rng.random(200)})
+# Duplicated keys, missing keys, and keys that aren't in the left frame
+right = pd.DataFrame({"key": rng.integers(10, 40, 50), "b": rng.integers(0, 9, 50)})
+
+
+@pytest.mark.parametrize("how", ["inner", "left"])
+@pytest.mark.parametrize(
+    "strategy, presorted", [("hash", False), ("hash", True), ("merge", True)]
+)
+def test_join_matches_merge(how, strategy, presorted):
+    # Sort-merge joins need sorted right keys
+    lookup = right.sort_values("key", ignore_index=True) if presorted else right
+    result = JoinIndexCache().join(left, lookup, on="key", how=how, strategy=strategy)
+    expected = left.merge(lookup, on="key", how=how, sort=False)
+    pd.testing.assert_frame_equal(
+        result.sort_values(["key", "a", "b"], ignore_index=True),
+        expected.sort_values(["key", "a", "b"], ignore_index=True),
+    )
+
+
+@pytest.mark.parametrize("how", ["inner", "left"])
+@pytest.mark.parametrize("strategy", ["hash", "merge"])
+@pytest.mark.parametrize("empty", ["left", "right"])
+def test_join_empty_frames(how, strategy, empty):
+    lookup = right.sort_values("key", ignore_index=True)
+    left_frame = left.iloc[:0] if empty == "left" else left
+    lookup = lookup.iloc[:0] if empty == "right" else lookup
+    result = JoinIndexCache().join(
+        left_frame, lookup, on="key", how=how, strategy=strategy
+    )
+    expected = left_frame.merge(lookup, on="key", how=how, sort=False)
+    pd.testing.assert_frame_equal(
+        result.reset_index(drop=True), expected, check_dtype=False
+    )
+
+
+def test_join_empty_lookup():
+    keys = pd.DataFrame({"k": [1, 2, 3]})
+    assert len(join(keys, pd.DataFrame({"k": pd.Series([], dtype=int)}), on="k")) == 0
+
+
+def test_choose_strategy():
+    cache = JoinIndexCache()
+    sorted_right = cache.index(right.sort_values("key"), "key")
+    assert choose_strategy(pd.Index([3, 2, 1]), sorted_right) == "merge"
+    assert (
+        choose_strategy(left["key"].sort_values().pipe(pd.Index), sorted_right)
+        == "merge"
+    )
+    assert choose_strategy(pd.Index(left["key"]), sorted_right) == "hash"
+    assert choose_strategy(pd.Index([1]), cache.index(right, "key")) == "hash"
+
+
+def test_join_column():
+    lookup = right.rename(columns={"b": "a"})
+    assert list(join(left, lookup, on="key").columns) == ["key", "a", "a_right"]
+    with pytest.raises(ValueError, match="give the column to join on"):
+        join(left, left)
+    with pytest.raises(KeyError):
+        join(left, right, on="b")
+
+
+def test_join_index_follows_key_changes():
+    cache = JoinIndexCache()
+    lookup = pd.DataFrame({"key": [1, 2, 3], "b": ["x", "y", "z"]})
+    probe = pd.DataFrame({"key": [1, 2, 3, 4]})
+
+    def joined():
+        result = cache.join(probe, lookup, on="key")
+        return dict(zip(result["key"], result["b"]))
+
+    assert joined() == {1: "x", 2: "y", 3: "z"}
+    assert joined() == {1: "x", 2: "y", 3: "z"}
+    assert cache.builds == 1
+
+    # Keys written in place
+    lookup.loc[0, "key"] = 4
+    assert joined() == {4: "x", 2: "y", 3: "z"}
+    # The key column replaced
+    lookup["key"] = [3, 2, 1]
+    assert joined() == {3: "x", 2: "y", 1: "z"}
+    # The rows reordered in place
+    lookup.sort_values("key", inplace=True)
+    assert joined() == {1: "z", 2: "y", 3: "x"}
+    assert cache.builds == 4
+
+    # Changes to other columns keep the index
+    lookup["b"] = ["p", "q", "r"]
+    assert joined() == {1: "p", 2: "q", 3: "r"}
+    assert cache.builds == 4
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+from rithm.functions.memo import MemoCache, fingerprint, pure
+from rithm.rithm import Rithm
+
+calls = []
+
+
+@pure
+def double(values):
+    calls.append(values)
+    return values * 2
+
+
+def impure(values):
+    calls.append(values)
+    return values * 2
+
+
+def test_fingerprints_are_by_content():
+    column = pd.Series(["a", "b", None], name="x")
+    assert fingerprint(column) == fingerprint(column.copy())
+    assert fingerprint(column) != fingerprint(column.rename("y"))
+    assert fingerprint(column) != fingerprint(pd.Series(["a", "c", None], name="x"))
+    assert fingerprint(np.arange(3)) != fingerprint(np.arange(3.0))
+    assert fingerprint(pd.DataFrame({"a": [1]})) == fingerprint(
+        pd.DataFrame({"a": [1]})
+    )
+    assert fingerprint(object()) is None
+    assert fingerprint(pd.Series([[1], [2]])) is None
+    # Values of different types with the same hashes
+    assert fingerprint(pd.Series([1, "a"])) != fingerprint(pd.Series(["1", "a"]))
+    assert fingerprint(pd.Series([1, "a"])) != fingerprint(pd.Series([1.0, "a"]))
+
+
+def test_only_pure_calls_are_cached():
+    memo = MemoCache()
+    calls.clear()
+    values = np.arange(10)
+    for _ in range(3):
+        memo.call(double, [values.copy()], {})
+        memo.call(impure, [values.copy()], {})
+    memo.call(double, [values + 1], {})
+
+    assert len(calls) == 3 + 1 + 1
+    assert (memo.hits, memo.misses) == (2, 2)
+    assert memo.hit_rate == 0.5
+
+
+def test_cache_is_bounded():
+    memo = MemoCache(max_bytes=3 * 80, max_entries=10)
+    for start in range(5):
+        memo.call(double, [np.arange(start, start + 10)], {})
+    assert len(memo) == 3
+    assert memo.nbytes == 3 * 80
+    memo.call(double, [np.arange(4, 14)], {})
+    assert memo.hits == 1
+
+
+def test_pure_builtins_are_memoized():
+    instance = Rithm(names=pd.Series(["Mr Owen", "Miss Laina"]))()
+    first = instance.evaluate("names -> lower")
+    assert instance.evaluate("names -> lower").equals(first)
+    assert instance.interpreter.memo.hits == 1
+
+
+def test_cached_results_cant_be_changed_by_callers():
+    memo = MemoCache()
+    values = np.arange(3)
+    with pytest.raises(ValueError):
+        memo.call(double, [values], {})[0] = 7
+    assert memo.call(double, [values], {}).tolist() == [0, 2, 4]
+
+    column = pd.Series(values)
+    for _ in range(2):
+        result = memo.call(double, [column], {})
+        assert result.tolist() == [0, 2, 4]
+        result.iloc[0] = 7
+        assert result.tolist() == [7, 2, 4]
+    assert memo.hits == 2
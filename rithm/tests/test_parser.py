@@ -1,5 +1,11 @@
+import logging
+
+import pytest
+from rithm.expr import Binary, Call, ColumnAccess, Join, Literal
+from rithm.parser import ParseErrors, Parser
 from rithm.rithm import Rithm
 from rithm.stmt import ExpressionStmt
+from rithm.token import TokenType as TT
 from rich import print
 
 rtm = Rithm()
@@ -19,3 +25,111 @@ def test_parser():
     assert len(stmts) == 2
     assert isinstance(stmts[0], ExpressionStmt)
     assert isinstance(stmts[1], ExpressionStmt)
+
+
+def test_parser_reports_all_errors():
+    source = "1 +\n2\n) 3\nfoo = (4\n5"
+    parser = Parser(rtm().scan(source))
+    stmts = parser.parse()
+
+    assert len(stmts) == 2
+    assert [error.token.line_no for error in parser.errors] == [1, 3, 4]
+    assert "[line 3, column 1]" in str(parser.errors[1])
+
+    with pytest.raises(ParseErrors) as exc_info:
+        rtm().parse(rtm().scan(source))
+    assert len(exc_info.value.errors) == 3
+
+
+def test_parser_synchronizes_on_block_keywords():
+    parser = Parser(rtm().scan("1 + (2 end\n3"))
+    stmts = parser.parse()
+    assert len(stmts) == 1
+    assert [error.token.token_type for error in parser.errors] == [
+        TT.PAREN_OPEN,
+        TT.END,
+    ]
+
+
+def test_nodes_are_slotted():
+    tokens = rtm().scan("x = (1 + 2) * 3")
+    [stmt] = rtm().parse(tokens)
+
+    nodes = [stmt, stmt.expr, stmt.expr.value, stmt.expr.value.left, tokens[0]]
+    assert not any(hasattr(node, "__dict__") for node in nodes)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "x = -1 + 2 * (3 - df@a) / 4 == 5 < !6",
+        "(((1)))@b + [2] * {3 + 4}",
+        "1 - 2 - 3 * 4 * -(5 + 6)",
+        'df@name -> split(", ", 1 + 2) -> to_columns("a", f(g()))@a == 1',
+        'trips join zones on "zone" -> f(n = 1) join rates',
+        "1 + -x -> f(2) < y -> g == (z -> h)",
+    ],
+)
+def test_iterative_parser_matches_recursive(source):
+    tokens = rtm().scan(source)
+    assert Parser(tokens, iterative=True).parse() == Parser(tokens).parse()
+
+
+def test_iterative_parser_handles_deep_nesting():
+    depth = 1000
+    source = "(" * depth + "1" + " + 1)" * depth
+    tokens = rtm().scan(source)
+
+    with pytest.raises(RecursionError):
+        Parser(tokens).parse()
+
+    parser = Parser(tokens, iterative=True)
+    [stmt] = parser.parse()
+    assert not parser.errors
+
+    rtm_instance = Rithm()()
+    rtm_instance.iterative_parsing = True
+    assert rtm_instance.evaluate(source) == depth + 1
+    assert rtm_instance.evaluate(" + ".join(["1"] * 5000)) == 5000
+
+
+def test_iterative_parser_reports_unclosed_groupings():
+    parser = Parser(rtm().scan("(1 + [2)\n3"), iterative=True)
+    stmts = parser.parse()
+    assert len(stmts) == 1
+    assert [error.token.token_type for error in parser.errors] == [TT.BRACKET_OPEN]
+
+
+def test_pipes_bind_tighter_than_comparisons():
+    (stmt,) = Parser(rtm().scan('s -> upper == "A B"')).parse()
+    assert isinstance(stmt.expr, Binary) and stmt.expr.operator.lexeme == "=="
+    assert isinstance(stmt.expr.left, Call)
+    assert stmt.expr.left.callee.token.lexeme == "upper"
+
+    # Column accesses after a pipe's call apply to its result
+    source = 'df@name -> to_columns("a", f(g()))@a == 1'
+    (stmt,) = Parser(rtm().scan(source)).parse()
+    access = stmt.expr.left
+    assert isinstance(access, ColumnAccess) and access.name.lexeme == "a"
+    assert access.frame.callee.token.lexeme == "to_columns"
+    assert len(access.frame.arguments) == 3
+
+
+def test_parse_join():
+    (stmt,) = Parser(rtm().scan('trips join zones on "zone" -> f')).parse()
+    join = stmt.expr.arguments[0]
+    assert isinstance(join, Join)
+    assert join.on == Literal("zone", TT.STRING)
+
+    parser = Parser(rtm().scan('trips on "zone"'))
+    parser.parse()
+    assert [error.msg for error in parser.errors] == ["Expected join before on"]
+
+
+def test_debug_dumps_are_truncated(caplog):
+    caplog.set_level(logging.DEBUG, logger="rithm.parser")
+    tokens = rtm().scan(" + ".join(["1"] * 200))
+    Parser(tokens).parse()
+    dumps = [record.getMessage() for record in caplog.records]
+    assert dumps[0].startswith("Parsing tokens:")
+    assert max(dump.count("Token(") for dump in dumps) == 50
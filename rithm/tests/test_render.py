@@ -0,0 +1,58 @@
+import time
+
+import numpy as np
+import pandas as pd
+from rithm.datatypes.versions import Frame
+from rithm.render import MAX_ROWS, ResultPager, debug_repr, render
+from rithm.rithm import Rithm
+
+ROWS = 2_000_000
+
+
+def test_render_shows_head_and_tail():
+    frame = pd.DataFrame({"fare": np.arange(ROWS) * 0.5, "zone": "a"})
+    start = time.perf_counter()
+    lines = render(frame, width=80).splitlines()
+    seconds = time.perf_counter() - start
+
+    assert lines[0].startswith(f"Frame of {ROWS:,} rows x 2 columns (float64, ")
+    # The header, head, separator and tail
+    assert len(lines) == 1 + 1 + MAX_ROWS + 1
+    assert lines[-1].split() == [str(ROWS - 1), str((ROWS - 1) * 0.5), "a"]
+    # Formatting a million rows would take seconds
+    assert seconds < 0.5
+
+    assert render(Frame.from_pandas(frame), width=80) == render(frame, width=80)
+    assert render(frame.head(3)) == frame.head(3).to_string()
+    assert render(frame["fare"]).splitlines()[0] == f"Column of {ROWS:,} rows"
+    assert (
+        render(np.arange(ROWS)).splitlines()[0] == f"Array of shape ({ROWS},) (int64)"
+    )
+    assert render(None) == ""
+    assert render(7) == "7"
+
+
+def test_render_truncates_containers_and_strings():
+    rendered = render(list(range(ROWS)))
+    assert len(rendered.splitlines()) == MAX_ROWS + 3
+    assert rendered.endswith(f"... +{ROWS - MAX_ROWS}\n]")
+    text = render("x" * ROWS, width=80)
+    assert text.endswith(f"({ROWS - MAX_ROWS * 80:,} more characters)")
+
+
+def test_pager():
+    pager = ResultPager(pd.Series(np.arange(45)))
+    pages = []
+    while pager.has_more:
+        pages.append(pager.next_page().splitlines()[0])
+    assert pages == ["Rows 11 to 30 of 45", "Rows 31 to 45 of 45"]
+    assert pager.next_page() == "No more rows"
+    assert not ResultPager(pd.Series(np.arange(5))).has_more
+    assert not ResultPager(np.float64(1.0)).has_more
+
+
+def test_debug_dumps_are_truncated():
+    tokens = Rithm()().scan(" + ".join(["1"] * 100_000))
+    dump = debug_repr(tokens)
+    assert dump.count("Token(") == 50
+    assert dump.endswith(f"... +{len(tokens) - 50}\n]")
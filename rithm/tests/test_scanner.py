@@ -31,6 +31,12 @@ def test_basic_scan():
         TT.FLOAT,
     ]
 
+    assert token_types(rtm().scan("foo <= 10")) == [
+        TT.IDENTIFIER,
+        TT.LESS_EQUAL,
+        TT.INTEGER,
+    ]
+
     with pytest.raises(ScanningException):
         rtm().scan('"foo')
 
@@ -47,3 +53,32 @@ def test_scan_arrows():
 
     arrow_without_spaces = rtm().scan("x->foo")
     assert token_types(arrow_without_spaces) == token_types(arrow_with_spaces)
+
+
+def test_scan_interns_identifiers():
+    rtm_instance = rtm()
+    tokens = [
+        token
+        for token in rtm_instance.scan("foo = df@foo + foo")
+        if token.token_type == TT.IDENTIFIER
+    ]
+    foo_tokens = [token for token in tokens if token.lexeme == "foo"]
+
+    assert len(foo_tokens) == 3
+    assert all(token.literal is foo_tokens[0].literal for token in foo_tokens)
+    assert all(token.lexeme is foo_tokens[0].lexeme for token in foo_tokens)
+    assert rtm_instance.scan("foo")[0].literal is foo_tokens[0].literal
+    assert "df" in rtm_instance.symbols
+
+
+def test_scan_table_literal():
+    tokens = rtm().scan('df = table\n  name, age\n  "Smith, Jo", 22\nend\nx')
+    assert token_types(tokens) == [TT.IDENTIFIER, TT.EQUAL, TT.TABLE, TT.IDENTIFIER]
+
+    table = tokens[4]
+    assert table.literal == '  name, age\n  "Smith, Jo", 22\n'
+    assert (table.line_no, table.column) == (1, 6)
+    assert (tokens[-2].line_no, tokens[-2].column) == (5, 1)
+
+    with pytest.raises(ScanningException):
+        rtm().scan("table\n  a, b\n  1, 2\n")
@@ -0,0 +1,85 @@
+from concurrent.futures import ThreadPoolExecutor
+import subprocess
+import sys
+import threading
+
+import pytest
+from rithm.client import RithmClient, RithmServerError, is_server_running
+from rithm.server import RithmServer
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    socket_path = str(tmp_path / "rithm.sock")
+    server = RithmServer(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    server.server_close()
+
+
+def test_sessions_stay_warm(socket_path):
+    assert is_server_running(socket_path)
+
+    with RithmClient(socket_path, session="a") as client:
+        assert client.evaluate("x = 3 + 4") == "7"
+
+    # A new connection (e.g. the next CLI invocation) sees the same session
+    with RithmClient(socket_path, session="a") as client:
+        assert client.evaluate("x + 1") == "8"
+
+    # Other sessions are isolated
+    with RithmClient(socket_path) as client:
+        with pytest.raises(RithmServerError, match="NameError"):
+            client.evaluate("x + 1")
+    with RithmClient(socket_path, session="b") as client:
+        with pytest.raises(RithmServerError, match="NameError"):
+            client.evaluate("x + 1")
+        # The connection is still usable after an error
+        assert client.evaluate("1 + 1") == "2"
+        assert client.evaluate("2 + 2", debug=True) == "4"
+
+
+def test_clients_get_their_own_sessions(socket_path):
+    with RithmClient(socket_path) as first, RithmClient(socket_path) as second:
+        assert first.evaluate("x = 1") == "1"
+        assert second.evaluate("x = 2") == "2"
+        assert first.evaluate("x") == "1"
+        assert second.evaluate("x") == "2"
+
+    # A connection's own session ends with it
+    with RithmClient(socket_path) as client:
+        with pytest.raises(RithmServerError, match="NameError"):
+            client.evaluate("x")
+
+
+def test_clients_share_named_sessions(socket_path):
+    with RithmClient(socket_path, session="shared") as client:
+        client.evaluate("n = 0")
+
+    def increment(_):
+        with RithmClient(socket_path, session="shared") as client:
+            for _ in range(25):
+                client.evaluate("n = n + 1")
+
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(increment, range(4)))
+
+    # Every client's requests ran against the same namespace, one at a time
+    with RithmClient(socket_path, session="shared") as client:
+        assert client.evaluate("n") == "100"
+
+
+def test_client_doesnt_import_pandas():
+    code = "import sys, rithm.__main__; print('pandas' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert output.stdout.strip() == "False"
+
+
+def test_connect_without_server(tmp_path):
+    socket_path = str(tmp_path / "missing.sock")
+    assert not is_server_running(socket_path)
+    assert RithmClient.connect(socket_path) is None
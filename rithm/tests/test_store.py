@@ -0,0 +1,137 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from rithm.datatypes import store as store_module
+from rithm.datatypes.store import ValueStore, value_nbytes
+from rithm.rithm import Rithm
+
+frame = pd.DataFrame(
+    {"fare": np.arange(1000.0), "name": [f"passenger {i}" for i in range(1000)]},
+    index=pd.RangeIndex(1000, 2000),
+)
+column = pd.Series(np.arange(1000), name="age")
+array = np.arange(1000)
+
+
+@pytest.fixture(params=["arrow", "pickle"])
+def store(request, monkeypatch, tmp_path):
+    if request.param == "arrow":
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(store_module, "pa", None)
+    # Room for only one of the values at a time
+    return ValueStore(value_nbytes(column), directory=str(tmp_path), min_spill_bytes=1)
+
+
+def test_spills_least_recently_used(store):
+    store["frame"] = frame
+    store["column"] = column
+    store["array"] = array
+    store["small"] = 1
+    assert set(store.spilled) == {"frame", "column"}
+    assert store.metrics.spills == 2
+    assert store.memory_bytes <= store.budget
+
+    pd.testing.assert_frame_equal(store["frame"], frame)
+    pd.testing.assert_series_equal(store["column"], column)
+    np.testing.assert_array_equal(store["array"], array)
+    assert store["small"] == 1
+    assert store.metrics.restores == 3
+    assert store.metrics.bytes_restored == sum(
+        map(value_nbytes, [frame, column, array])
+    )
+    assert sorted(store) == ["array", "column", "frame", "small"]
+
+
+def test_replacing_a_spilled_value(store):
+    store["frame"] = frame
+    store["column"] = column
+    store["frame"] = 2
+    del store["column"]
+    assert dict(store) == {"frame": 2}
+    assert store.metrics.restores == 0
+
+
+def test_spilling_namespace():
+    instance = Rithm(frame=frame)()
+    store = instance.enable_spilling(value_nbytes(frame), min_spill_bytes=1)
+    instance.evaluate("double = frame@fare * 2")
+    assert store.spilled.keys() == {"frame"}
+    assert instance.evaluate("frame@fare").tolist()[:2] == [0.0, 1.0]
+    assert store.metrics.restores == 1
+    assert store.spilled.keys() == {"double"}
+
+    instance.disable_spilling()
+    assert isinstance(instance.namespace, dict)
+
+
+def test_scripts_only_load_the_values_they_use():
+    instance = Rithm(**{f"f{i}": frame.copy() for i in range(5)})()
+    store = instance.enable_spilling(value_nbytes(frame), min_spill_bytes=1)
+    spills = store.metrics.spills
+    script = instance.prepare("f0@fare * 2")
+    for _ in range(3):
+        assert script().tolist()[:2] == [0.0, 2.0]
+    assert store.metrics.restores == 1
+    assert store.metrics.spills == spills + 1
+
+
+def test_unspillable_values_stay_in_memory(store, tmp_path):
+    duplicated = pd.DataFrame(np.zeros((200, 2)), columns=["a", "a"])
+    store["duplicated"] = duplicated
+    store["column"] = column
+    if store_module.pa is not None:
+        # Arrow can't write duplicated column names, so the frame is kept
+        assert "duplicated" in store.values
+    assert store["duplicated"].equals(duplicated)
+    assert list(tmp_path.glob("*.partial")) == []
+
+
+def test_failed_writes_keep_the_value(store, monkeypatch, tmp_path):
+    def fail(*args, **kwargs):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(store_module.np, "save", fail)
+    store["array"] = array
+    store["column"] = column
+    # The write failed, so the array is still in memory, and nothing was left behind
+    assert store["array"] is array
+    assert store.metrics.spills == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_restored_values(store):
+    store["array"] = array.copy()
+    store["frame"] = frame
+    store["column"] = column
+    restored = store["array"]
+    # Arrays are mapped copy-on-write, so they're writable
+    restored[0] = -1
+    assert restored[0] == -1
+
+    restored_frame = store["frame"]
+    pd.testing.assert_frame_equal(restored_frame, frame)
+    restored_frame.loc[1000, "fare"] = -1.0
+    restored_frame.loc[1001, "name"] = "someone else"
+    assert restored_frame["fare"].tolist()[:2] == [-1.0, 1.0]
+    assert restored_frame["name"].tolist()[:2] == ["passenger 0", "someone else"]
+    restored_column = store["column"]
+    restored_column.iloc[0] = -1
+    assert restored_column.tolist()[:2] == [-1, 1]
+
+
+def test_closing_removes_the_spill_directory():
+    store = ValueStore(1, min_spill_bytes=1)
+    store["array"] = array
+    store["other"] = array + 1
+    assert os.listdir(store.directory)
+    store.close()
+    assert not os.path.exists(store.directory)
+
+    instance = Rithm(frame=frame, other=frame.copy())()
+    store = instance.enable_spilling(1, min_spill_bytes=1)
+    assert store.spilled
+    instance.disable_spilling()
+    assert not os.path.exists(store.directory)
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+from rithm.datatypes.versions import Frame, FrameHistory, shared_nbytes
+from rithm.rithm import Rithm
+
+titanic = pd.DataFrame(
+    {
+        "Pclass": np.arange(1000) % 3,
+        "Fare": np.arange(1000) * 0.5 + 5,
+        "Name": pd.array([f"passenger {i}" for i in range(1000)], dtype="string"),
+    }
+)
+
+
+def test_versions_share_unchanged_columns():
+    frame = Frame.from_pandas(titanic)
+    assert np.shares_memory(frame.columns["Fare"], titanic["Fare"].to_numpy())
+
+    renamed = frame.rename({"Pclass": "passenger_class"})
+    doubled = renamed.with_column("Fare", renamed.column("Fare") * 2)
+    assert renamed.columns["passenger_class"] is frame.columns["Pclass"]
+    assert doubled.columns["Name"] is frame.columns["Name"]
+    assert doubled.column("Fare").tolist()[:2] == [10.0, 11.0]
+    # Writing a column in one version leaves the others as they were
+    assert frame.column("Fare").tolist()[:2] == [5.0, 5.5]
+
+    fare_bytes = titanic["Fare"].to_numpy().nbytes
+    assert shared_nbytes([frame, renamed, doubled]) == frame.nbytes + fare_bytes
+    pd.testing.assert_frame_equal(
+        doubled.drop("Fare").to_pandas(),
+        titanic.drop(columns="Fare").rename(columns={"Pclass": "passenger_class"}),
+    )
+
+
+def test_columns_are_read_only():
+    frame = Frame.from_pandas(titanic)
+    with pytest.raises(ValueError):
+        frame.columns["Fare"][0] = 1.0
+    with pytest.raises(ValueError, match="has 2 rows"):
+        frame.with_column("Fare", [1.0, 2.0])
+
+
+def test_versions_stay_unchanged_when_the_source_is_written():
+    source = titanic.copy()
+    history = FrameHistory()
+    recorded = history.record("titanic", source)
+    fares = pd.DataFrame({"Fare": np.zeros(1000)})
+    with_fares = recorded.with_column("Fare", fares["Fare"])
+
+    # Nothing is copied until the DataFrames are written to
+    assert np.shares_memory(recorded.columns["Pclass"], source["Pclass"].to_numpy())
+    source.loc[0, "Fare"] = -1.0
+    source.loc[:, "Pclass"] = 7
+    source.sort_values("Fare", inplace=True)
+    fares.loc[0, "Fare"] = -1.0
+
+    assert history["titanic"].column("Fare").tolist()[:2] == [5.0, 5.5]
+    assert history["titanic"].column("Pclass").tolist()[:3] == [0, 1, 2]
+    assert with_fares.column("Fare").tolist()[:2] == [0.0, 0.0]
+
+
+def test_versions_stay_unchanged_when_arrays_are_written():
+    frame = Frame.from_pandas(titanic)
+    values = np.arange(1000.0)
+    with_values = frame.with_column("Fare", values)
+    values[0] = 99.0
+    assert with_values.column("Fare").tolist()[:2] == [0.0, 1.0]
+
+
+def test_extension_columns_cant_be_written():
+    frame = Frame.from_pandas(
+        titanic.assign(
+            Age=pd.array(np.arange(1000), dtype="Int64"),
+            Port=pd.Categorical(["S", "C"] * 500),
+        )
+    )
+    renamed = frame.rename({"Pclass": "passenger_class"})
+    ages = frame.column("Age")
+    ages.iloc[0] = 42
+    names = frame.column("Name")
+    names.iloc[0] = "someone else"
+    written = frame.to_pandas()
+    written.loc[0, "Age"] = 7
+    written.loc[0, "Port"] = "C"
+    assert (ages[0], names[0], written.loc[0, "Port"]) == (42, "someone else", "C")
+    for version in (frame, renamed):
+        assert version.column("Age").tolist()[:2] == [0, 1]
+        assert version.column("Name").iloc[0] == "passenger 0"
+        assert version.column("Port").tolist()[:2] == ["S", "C"]
+
+
+def test_history_costs_the_changed_columns():
+    instance = Rithm(titanic=titanic)()
+    history = instance.enable_history()
+    instance.evaluate('cleaned = titanic -> rename(Pclass = "passenger_class")')
+    for step in range(10):
+        instance.evaluate('cleaned = cleaned -> with_column("Fare", cleaned@Fare + 1)')
+
+    assert len(history) == 11
+    assert history[0].column("Fare").tolist()[:1] == [5.0]
+    assert history["cleaned"].column("Fare").tolist()[:1] == [15.0]
+    fare_bytes = titanic["Fare"].to_numpy().nbytes
+    assert history.nbytes == history[0].nbytes + 10 * fare_bytes
+    assert instance.evaluate("cleaned@passenger_class").tolist()[:3] == [0, 1, 2]
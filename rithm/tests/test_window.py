@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+from rithm.functions import window
+from rithm.functions.window import StreamingWindow, lag, lead
+from rithm.rithm import Rithm
+
+rng = np.random.default_rng(0)
+fares = pd.Series(rng.random(300), name="fare")
+fares[rng.integers(0, 300, 20)] = np.nan
+zones = pd.Series(rng.integers(0, 4, 300), name="zone")
+
+
+@pytest.mark.parametrize("function", ["sum", "mean", "rank"])
+@pytest.mark.parametrize("min_periods", [None, 1])
+def test_rolling_matches_pandas(function, min_periods, monkeypatch):
+    # Use small blocks, so windows span two blocks of running sums
+    monkeypatch.setattr(window, "SUM_BLOCK_SIZE", 8)
+    rolling = window.ROLLING_FUNCTIONS[function]
+
+    expected = getattr(fares.rolling(5, min_periods=min_periods), function)()
+    pd.testing.assert_series_equal(rolling(fares, 5, min_periods=min_periods), expected)
+
+    expected = getattr(
+        fares.groupby(zones).rolling(5, min_periods=min_periods), function
+    )()
+    pd.testing.assert_series_equal(
+        rolling(fares, 5, by=zones, min_periods=min_periods),
+        expected.reset_index(level=0, drop=True).sort_index(),
+    )
+
+
+def test_lag_and_lead():
+    pd.testing.assert_series_equal(
+        lag(fares, 2, by=zones), fares.groupby(zones).shift(2)
+    )
+    pd.testing.assert_series_equal(
+        lead(fares, by=zones), fares.groupby(zones).shift(-1)
+    )
+    assert lag(pd.Series(["a", "b", "c"])).tolist()[1:] == ["a", "b"]
+
+
+@pytest.mark.parametrize("function, size", [("sum", 4), ("rank", 3), ("lag", 2)])
+def test_streaming_window_carries_over_chunks(function, size):
+    streaming = StreamingWindow(function, size)
+    chunks = range(0, len(fares), 37)
+    result = pd.concat(
+        [
+            streaming.update(fares[start : start + 37], zones[start : start + 37])
+            for start in chunks
+        ]
+    )
+    if function == "lag":
+        expected = lag(fares, size, by=zones)
+    else:
+        expected = window.ROLLING_FUNCTIONS[function](fares, size, by=zones)
+    pd.testing.assert_series_equal(result, expected)
+
+    with pytest.raises(ValueError):
+        StreamingWindow("lead", 1)
+
+
+def test_window_functions_in_pipes():
+    rtm = Rithm(
+        trips=pd.DataFrame({"fare": [1.0, 2.0, 3.0, 4.0], "zone": [1, 2, 1, 2]})
+    )
+    result = rtm().evaluate("trips@fare -> rolling_sum(2, by = trips@zone)")
+    assert result.tolist()[2:] == [4.0, 6.0]
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import pytest
+from rithm.datatypes.versions import Frame
+from rithm.datatypes.zones import ZoneMap, ZoneMapCache
+from rithm.rithm import Rithm
+
+ROWS = 100_000
+ZONE_ROWS = 1000
+
+
+def trips() -> pd.DataFrame:
+    # Time ordered, so each zone covers a narrow range of times
+    rng = np.random.default_rng(0)
+    fares = rng.random(ROWS) * 50
+    fares[rng.random(ROWS) < 0.01] = np.nan
+    return pd.DataFrame(
+        {
+            "time": np.arange(ROWS) * 2,
+            "fare": fares,
+            "zone": rng.integers(0, 20, ROWS),
+        }
+    )
+
+
+def test_zone_statistics():
+    values = np.r_[np.arange(1000.0), [np.nan] * 1000, np.arange(500) % 10]
+    zone_map = ZoneMap.for_column(pd.Series(values), zone_rows=1000)
+    assert zone_map.mins.tolist()[::2] == [0, 0]
+    assert zone_map.maxs.tolist()[::2] == [999, 9]
+    assert np.isnan(zone_map.mins[1])
+    assert zone_map.nulls.tolist() == [0, 1000, 0]
+    assert zone_map.distinct[2] == 10
+    # Estimated from a sample of hashes
+    assert 900 <= zone_map.distinct[0] <= 1100
+
+    assert ZoneMap.for_column(pd.Series(["a", "b"])) is None
+    restored = ZoneMap.from_dict(zone_map.to_dict())
+    np.testing.assert_array_equal(restored.maxs, zone_map.maxs)
+
+
+def test_zones_skipped():
+    zone_map = ZoneMap(np.arange(ROWS), zone_rows=ZONE_ROWS)
+    some, every = zone_map.zones_matching(">=", ROWS - 1500)
+    assert some.sum() == 2
+    assert every.sum() == 1
+    some, every = zone_map.zones_matching("==", 5)
+    assert (some.sum(), every.sum()) == (1, 0)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "t@time > 150000",
+        "t@time <= 1999",
+        "t@time == 5000",
+        "t@time >= cutoff",
+        "50000 < t@time",
+        "t@fare >= 49.5",
+        "t@fare < 0.5",
+        "t@fare == 1",
+        "(t@time > 10000) * (t@fare > 25)",
+    ],
+)
+def test_comparisons_match_pandas(source):
+    frame = trips()
+    expected = Rithm(t=frame, cutoff=190000)().evaluate(source)
+
+    instance = Rithm(t=frame, cutoff=190000)()
+    zone_maps = instance.enable_zone_maps(ZONE_ROWS)
+    assert instance.evaluate(source).equals(expected)
+    assert zone_maps.builds > 0
+
+
+def test_filter_with_zone_maps():
+    instance = Rithm(raw=trips())()
+    zone_maps = instance.enable_zone_maps(ZONE_ROWS)
+    instance.evaluate('t = raw -> with_column("late", raw@time > 180000)')
+    # Zone maps are only built for the columns that are compared
+    assert zone_maps.builds == 1
+    for _ in range(2):
+        late = instance.evaluate("t -> filter(t@time > 180000)")
+        assert late["late"].all() and len(late) == ROWS - 90001
+    assert zone_maps.builds == 2
+
+
+def test_zone_maps_follow_column_changes():
+    frame = pd.DataFrame({"time": np.arange(10_000)})
+    instance = Rithm(t=frame)()
+    zone_maps = instance.enable_zone_maps(ZONE_ROWS)
+    assert instance.evaluate("t@time > 9000").sum() == 999
+
+    frame["time"] = frame["time"].to_numpy()[::-1]
+    assert instance.evaluate("t@time > 9000").sum() == 999
+    assert instance.evaluate("t@time > 9000").iloc[0]
+    frame.loc[:, "time"] = 0
+    assert instance.evaluate("t@time > 9000").sum() == 0
+    frame.loc[5, "time"] = 9999
+    assert instance.evaluate("t@time > 9000").sum() == 1
+    assert zone_maps.builds == 4
+    instance.evaluate("t@time > 9000")
+    assert zone_maps.builds == 4
+
+
+def test_versions_share_zone_maps():
+    cache = ZoneMapCache(ZONE_ROWS)
+    frame = Frame.from_pandas(trips())
+    cache.build(frame)
+    renamed = frame.rename({"fare": "price"}).with_column("time", np.arange(ROWS))
+    assert renamed.zones["price"] is frame.zones["fare"]
+    assert "time" not in renamed.zones
+
+
+def test_zone_maps_spilled_with_frame(tmp_path):
+    pytest.importorskip("pyarrow")
+    instance = Rithm(raw=trips())()
+    zone_maps = instance.enable_zone_maps(ZONE_ROWS)
+    store = instance.enable_spilling(1, directory=str(tmp_path), min_spill_bytes=1)
+    instance.evaluate("t = raw@time * 1")
+    instance.evaluate("f = raw -> filter(raw@fare > 1)")
+    instance.evaluate("f@time > 0")
+    instance.evaluate("other = raw@fare * 2")
+    assert "f" in store.spilled
+    builds = zone_maps.builds
+
+    # Loaded back, the frame's zone maps are used rather than rebuilt
+    expected = store["f"]["time"] > 100000
+    assert instance.evaluate("f@time > 100000").equals(expected)
+    assert zone_maps.builds == builds
@@ -60,6 +60,11 @@ class TokenType(Enum):
     FALSE = "False"
     CLASS = "class"
     ALGO = "algo"
+    DO = "do"
+    END = "end"
+    TABLE = "table"
+    JOIN = "join"
+    ON = "on"
     AND = "and"
     OR = "or"
 
@@ -67,7 +72,7 @@ class TokenType(Enum):
     EOF = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     token_type: TokenType
     lexeme: str